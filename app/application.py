@@ -1,17 +1,30 @@
+import time
+T0 = time.perf_counter()
+
 import sys
 from PyQt6.QtWidgets import QApplication
+from app.startup_report import StartupReport
 from views.main_window_view import MainWindowView
+from styles.themes import DARK, preload_stylesheets
 
 if __name__ == "__main__":
+    # TP2_STARTUP_REPORT=1 (ou un fichier .json) : temps jusqu'au premier affichage
+    report = StartupReport.from_environment(T0)
+    if report:
+        report.mark("imports")
+
     app = QApplication(sys.argv)
 
 
     # Les thèmes ont en parti été fait par Claude, le changement de thème a été assisté par Claude.
     # Charger le thème par défaut (dark)
-    # Le toggle sera géré par MainWindowView
-    with open("../styles/dark_theme.qss", "r", encoding="utf-8") as f:
-        app.setStyleSheet(f.read())
+    # Le toggle sera géré par MainWindowView ; les deux feuilles de style sont lues une fois ici
+    preload_stylesheets()
+    app.setStyleSheet(DARK.stylesheet)
 
     mainWindow = MainWindowView(app)  # Passer l'app pour pouvoir changer le thème
+    if report:
+        report.mark("main_window")
+        report.watch_first_paint(mainWindow)
     mainWindow.show()
     sys.exit(app.exec())
@@ -0,0 +1,149 @@
+# Mode ligne de commande, sans Qt ni matplotlib : calcule les sommes et intégrales d'une librairie
+# de fonctions pour une grille de bornes, de n et de méthodes, et écrit les résultats au fil de l'eau.
+#
+#   python -m app.cli functions.json --bounds 0:1 --bounds=-2:2 --n 10 100 1000 --methods Gauche Simpson --format csv
+import argparse
+import csv
+import json
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+from models.expression_compiler import compile_function
+from models.library_store import load_library
+from models.quadrature import METHODS, integrate, gauss_kronrod
+from models.symbolic import integrate_exact
+
+FIELDS = ["function", "a", "b", "n", "method", "somme", "erreur_somme", "evaluations",
+          "integrale", "methode_integrale", "erreur_integrale", "erreur"]
+
+
+def read_functions(path: str):
+    # même fichier que FunctionListModel, ancien format (liste de textes) ou format 2 (entrées avec métadonnées)
+    metadata, _ = load_library(path)
+    return [entry.function_str for entry in metadata]
+
+
+def parse_bounds(text: str):
+    a, b = text.split(":")
+    return float(a), float(b)
+
+
+def exact_integral(function_str: str, f, a: float, b: float, mode: str):
+    # "auto" : sympy puis Gauss-Kronrod si sympy échoue ; "symbolic" / "numeric" : un seul chemin
+    if mode in ("auto", "symbolic"):
+        try:
+            return integrate_exact(function_str, a, b), "symbolique", 0.0
+        except Exception:
+            if mode == "symbolic":
+                return None, None, None
+    if mode in ("auto", "numeric"):
+        result = gauss_kronrod(f, a, b)
+        if result.converged:
+            return result.value, "numérique", result.error
+    return None, None, None
+
+
+def compute_task(task):
+    # une tâche = une fonction et un intervalle : l'intégrale exacte est calculée une seule fois
+    # pour toute la grille de n et de méthodes
+    function_str, (a, b), ns, methods, exact_mode = task
+    base = {"function": function_str, "a": a, "b": b}
+    try:
+        f = compile_function(function_str)
+    except Exception as e:
+        return [dict(base, erreur=f"fonction invalide : {e}")]
+
+    if exact_mode == "none":
+        integrale, methode_integrale, erreur_integrale = None, None, None
+    else:
+        integrale, methode_integrale, erreur_integrale = exact_integral(function_str, f, a, b, exact_mode)
+
+    rows = []
+    for n, method in product(ns, methods):
+        row = dict(base, n=n, method=method, integrale=integrale,
+                   methode_integrale=methode_integrale, erreur_integrale=erreur_integrale)
+        try:
+            result = integrate(method, f, a, b, n)
+            row.update(somme=result.value, erreur_somme=result.error, evaluations=result.evaluations)
+        except Exception as e:
+            row["erreur"] = str(e)
+        rows.append(row)
+    return rows
+
+
+def strict_json_row(row: dict):
+    # NaN et Infinity ne sont pas du JSON : null, et les colonnes concernées sont signalées dans "erreur"
+    non_finite = {key: value for key, value in row.items() if isinstance(value, float) and not math.isfinite(value)}
+    if not non_finite:
+        return row
+    row = dict(row, **{key: None for key in non_finite})
+    note = "valeur non finie : " + ", ".join(f"{key}={value}" for key, value in non_finite.items())
+    row["erreur"] = f"{row['erreur']} ; {note}" if row.get("erreur") else note
+    return row
+
+
+class Writer:
+    def __init__(self, stream, fmt: str):
+        self.__stream = stream
+        self.__fmt = fmt
+        self.__csv = None
+        if fmt == "csv":
+            self.__csv = csv.DictWriter(stream, fieldnames=FIELDS, extrasaction="ignore")
+            self.__csv.writeheader()
+
+    def write(self, row: dict):
+        if self.__csv is not None:
+            self.__csv.writerow(row)
+        else:
+            self.__stream.write(json.dumps(strict_json_row(row), ensure_ascii=False, allow_nan=False) + "\n")
+        self.__stream.flush()
+
+
+def write_all(writer: Writer, results):
+    for rows in results:
+        for row in rows:
+            writer.write(row)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Sommes de Riemann et intégrales sans interface graphique")
+    parser.add_argument("functions", help="fichier JSON de la librairie (functions.json)")
+    parser.add_argument("--bounds", action="append", type=parse_bounds, metavar="A:B",
+                        help="intervalle d'intégration, répétable (--bounds=-1:1 pour une borne négative)")
+    parser.add_argument("--n", nargs="+", type=int, default=[100], help="nombres de rectangles")
+    parser.add_argument("--methods", nargs="+", default=["Gauche"], choices=list(METHODS),
+                        help="méthodes de quadrature")
+    parser.add_argument("--exact", choices=["auto", "symbolic", "numeric", "none"], default="auto",
+                        help="calcul de l'intégrale de référence")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="jsonl")
+    parser.add_argument("--workers", type=int, default=None, help="taille du pool de processus")
+    parser.add_argument("--output", default="-", help="fichier de sortie (- pour stdout)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    functions = read_functions(args.functions)
+    bounds_list = args.bounds or [(0.0, 1.0)]
+    tasks = [(function_str, bounds, args.n, args.methods, args.exact)
+             for function_str, bounds in product(functions, bounds_list)]
+
+    stream = sys.stdout if args.output == "-" else open(args.output, 'w', encoding='utf-8', newline='')
+    try:
+        writer = Writer(stream, args.format)
+        if args.workers == 1:
+            write_all(writer, map(compute_task, tasks))
+        else:
+            # map garde l'ordre des tâches et rend chaque résultat dès qu'il est prêt
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                write_all(writer, pool.map(compute_task, tasks))
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
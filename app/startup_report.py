@@ -0,0 +1,68 @@
+# Mesure du démarrage : temps écoulé depuis le lancement jusqu'aux étapes clés et au premier paint
+# de la fenêtre principale. Activé par la variable d'environnement TP2_STARTUP_REPORT :
+#   TP2_STARTUP_REPORT=1             -> tableau sur stderr
+#   TP2_STARTUP_REPORT=startup.json  -> fichier JSON (comparable d'une version à l'autre)
+# TP2_STARTUP_BUDGET_MS=800 affiche un avertissement si le premier paint arrive plus tard.
+import json
+import os
+import sys
+import time
+
+from PyQt6.QtCore import QEvent, QObject, QTimer
+
+
+class StartupReport(QObject):
+    def __init__(self, t0: float, target: str = None, budget_ms: float = None):
+        super().__init__()
+        self.__t0 = t0
+        self.__target = target
+        self.__budget_ms = budget_ms
+        self.__marks = []
+        self.__widget = None
+        self.__modules_at_paint = None
+
+    @classmethod
+    def from_environment(cls, t0: float):
+        target = os.environ.get("TP2_STARTUP_REPORT")
+        if not target:
+            return None
+        budget = os.environ.get("TP2_STARTUP_BUDGET_MS")
+        return cls(t0, target, float(budget) if budget else None)
+
+    def mark(self, name: str):
+        self.__marks.append((name, (time.perf_counter() - self.__t0) * 1000))
+
+    def watch_first_paint(self, widget):
+        self.__widget = widget
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self.__widget and event.type() == QEvent.Type.Paint:
+            self.__widget.removeEventFilter(self)
+            self.mark("first_paint")
+            # modules lourds déjà chargés au moment du premier affichage
+            self.__modules_at_paint = sorted(m for m in ("sympy", "matplotlib.pyplot", "PyQt6.uic")
+                                             if m in sys.modules)
+            QTimer.singleShot(0, self.write)
+        return False
+
+    def as_dict(self) -> dict:
+        return {
+            "marks_ms": {name: round(ms, 1) for name, ms in self.__marks},
+            "modules_at_first_paint": self.__modules_at_paint,
+        }
+
+    def write(self):
+        report = self.as_dict()
+        if self.__target == "1":
+            for name, ms in self.__marks:
+                print(f"[démarrage] {name:<20} {ms:8.1f} ms", file=sys.stderr)
+            print(f"[démarrage] modules chargés au premier paint : {self.__modules_at_paint}", file=sys.stderr)
+        else:
+            with open(self.__target, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+
+        first_paint = report["marks_ms"].get("first_paint")
+        if self.__budget_ms is not None and first_paint is not None and first_paint > self.__budget_ms:
+            print(f"[démarrage] premier paint en {first_paint:.0f} ms, budget {self.__budget_ms:.0f} ms",
+                  file=sys.stderr)
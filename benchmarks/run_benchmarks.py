@@ -0,0 +1,408 @@
+# Banc d'essai des chemins critiques : sommes de Riemann, intégrale exacte, dessin du graphique,
+# rendu LaTeX, liste de 5000 fonctions, librairie de 10 000 fonctions et démarrage à froid.
+# Tourne sans écran (Qt offscreen).
+#
+#   python -m benchmarks.run_benchmarks --output bench.json
+#   python -m benchmarks.run_benchmarks --save-baseline            # enregistre benchmarks/baseline.json
+#   python -m benchmarks.run_benchmarks --fail-on-regression       # code de sortie 1 si plus lent
+#
+# À lancer depuis la racine du dépôt. Les temps sont en millisecondes ; chaque mesure est
+# comparée à la même clé de la référence (ratio = actuel / référence, sur la médiane).
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT, "app")
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# (fonction, a, b) : cas courants puis cas où sympy peine ou échoue (repli numérique)
+INTEGRAL_CORPUS = [
+    ("x**2", 0.0, 1.0),
+    ("3*x**3 - 2*x + 1", -2.0, 2.0),
+    ("np.sin(x)", 0.0, 3.141592653589793),
+    ("np.exp(x)", 0.0, 1.0),
+    ("1/(1+x**2)", -1.0, 1.0),
+    ("x*np.log(x)", 1.0, 2.0),
+    ("np.exp(-x**2)", -3.0, 3.0),
+    ("np.sqrt(1-x**2)", -1.0, 1.0),
+    ("x**2*np.sin(x)**3", 0.0, 2.0),
+    ("1/(1+x**4)", 0.0, 1.0),
+    ("np.exp(np.sin(x))", 0.0, 2.0),
+    ("np.abs(np.sin(10*x))", 0.0, 1.0),
+]
+
+RIEMANN_METHODS = ("Gauche", "Milieu", "Simpson")
+
+
+def measure(fn, repeat: int = 5, setup=None) -> dict:
+    # setup est appelé avant chaque répétition, hors chronomètre (vider un cache pour une mesure à froid)
+    times = []
+    for _ in range(max(1, repeat)):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": statistics.median(times), "min_ms": min(times), "max_ms": max(times),
+            "repeat": len(times)}
+
+
+_app = None
+
+
+def ensure_qapplication():
+    # la référence est gardée ici : un appelant qui ignore le retour détruirait l'application aussitôt
+    global _app
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    if QApplication.instance() is None:
+        _app = QApplication([])
+    return QApplication.instance()
+
+
+def cold_latex_cache():
+    # ni mémoire ni disque : chaque formule est réellement rendue
+    from styles.latex_renderer import renderer
+    renderer.disk_cache_dir = None
+    renderer.clear()
+
+
+def bench_riemann(args, results):
+    # les workers de sympy du modèle reposent sur des QTimer
+    ensure_qapplication()
+    from models.main_window_model import MainWindowModel
+    from models.expression_compiler import compile_function
+
+    model = MainWindowModel()
+    model.function_str = "np.sin(x) + x**2"
+    model.function = compile_function(model.function_str)
+    model.borne_inf, model.borne_sup = 0.0, 2.0
+
+    for exponent in range(1, args.max_exponent + 1):
+        n = 10 ** exponent
+        # les très grands n prennent plusieurs secondes : une seule répétition
+        repeat = args.repeat if n <= 10 ** 6 else 1
+        for method in RIEMANN_METHODS:
+            model.nb_rectangles = n
+            model.orientation = method
+            key = f"riemann/{method}/n=1e{exponent}"
+            try:
+                results[key] = measure(model.calculer_somme_riemann, repeat)
+            except MemoryError:
+                results[key] = {"error": "MemoryError"}
+    model.shutdown()
+
+
+def bench_integrale(args, results):
+    ensure_qapplication()
+    from models.main_window_model import MainWindowModel
+    from models.expression_compiler import compile_function
+    from models.antiderivative_cache import antiderivatives
+
+    def cold():
+        from sympy.core.cache import clear_cache
+        antiderivatives.clear()
+        clear_cache()
+
+    model = MainWindowModel()
+    for function_str, a, b in INTEGRAL_CORPUS:
+        model.function_str = function_str
+        model.function = compile_function(function_str)
+        model.borne_inf, model.borne_sup = a, b
+
+        entry = measure(model.calculer_integrale, args.repeat_slow, setup=cold)
+        entry["methode"] = model.integrale_methode
+        results[f"integrale/cold/{function_str}"] = entry
+        # deuxième appel : la primitive est en cache, seules F(b) - F(a) sont évaluées
+        results[f"integrale/warm/{function_str}"] = measure(model.calculer_integrale, args.repeat)
+    model.shutdown()
+
+
+def bench_canvas(args, results):
+    ensure_qapplication()
+    from canvas.matplotlib_canvas import PlotCanvas
+    from models.main_window_model import MainWindowModel
+    from models.expression_compiler import compile_function
+
+    model = MainWindowModel()
+    canvas = PlotCanvas(model)
+    canvas.resize(800, 600)
+
+    def set_function(function_str):
+        with model.batch_update():
+            model.function_str = function_str
+            model.function = compile_function(function_str)
+            model.borne_inf, model.borne_sup = -3.0, 3.0
+            model.rectangles_active = True
+
+    def render():
+        canvas.dessiner()
+        canvas.draw()
+
+    set_function("np.sin(3*x) + x**2")
+    for n in (10, 100, 1000, 100000):
+        model.nb_rectangles = n
+        render()
+        # même fonction, n change : la courbe est réutilisée
+        results[f"canvas/dessiner/n={n}"] = measure(render, args.repeat)
+
+    functions = ["np.sin(3*x) + x**2", "np.tan(x)", "np.exp(-x**2)"]
+    state = {"i": 0}
+
+    def next_function():
+        state["i"] += 1
+        set_function(functions[state["i"] % len(functions)])
+
+    model.nb_rectangles = 100
+    # changement de fonction : courbe rééchantillonnée à chaque dessin
+    results["canvas/dessiner/new_function"] = measure(render, args.repeat, setup=next_function)
+
+
+def bench_latex_delegate(args, results):
+    ensure_qapplication()
+    from PyQt6.QtCore import QRect
+    from PyQt6.QtGui import QPainter, QPixmap, QStandardItem, QStandardItemModel
+    from PyQt6.QtWidgets import QStyleOptionViewItem
+    from styles.latex_delegate import LatexDelegate
+
+    item_model = QStandardItemModel()
+    for function_str, _, _ in INTEGRAL_CORPUS:
+        item_model.appendRow(QStandardItem(function_str))
+    delegate = LatexDelegate()
+    target = QPixmap(400, 60)
+    option = QStyleOptionViewItem()
+    option.rect = QRect(0, 0, 400, 60)
+
+    def paint_all():
+        painter = QPainter(target)
+        for row in range(item_model.rowCount()):
+            delegate.paint(painter, option, item_model.index(row, 0))
+        painter.end()
+
+    count = item_model.rowCount()
+    entry = measure(paint_all, args.repeat_slow, setup=cold_latex_cache)
+    entry["items"] = count
+    results["latex_delegate/paint/cold"] = entry
+    entry = measure(paint_all, args.repeat)
+    entry["items"] = count
+    results["latex_delegate/paint/warm"] = entry
+
+
+def bench_function_list(args, results):
+    # librairie de 5000 fonctions : peindre les lignes visibles, puis ajouter une fonction
+    # (ne doit rendre aucune formule de plus que celles déjà à l'écran)
+    app = ensure_qapplication()
+    from models.function_list_model import FunctionListModel
+    from views.function_list_view import FunctionListView
+
+    functions = [f"{k}*x**2 + np.sin({k % 17 + 1}*x)" for k in range(1, 5001)]
+    with tempfile.TemporaryDirectory() as tmp:
+        json_file = os.path.join(tmp, "functions.json")
+        with open(json_file, "w", encoding="utf-8") as f:
+            json.dump({"functions": functions}, f)
+
+        model = FunctionListModel(json_file)
+        view = FunctionListView(model)
+        view.resize(300, 600)
+        view.show()
+        app.processEvents()
+
+        def paint():
+            view.listView.viewport().grab()
+
+        entry = measure(paint, 1, setup=cold_latex_cache)
+        entry["items"] = len(functions)
+        results["function_list/paint/cold"] = entry
+        entry = measure(paint, args.repeat)
+        entry["items"] = len(functions)
+        results["function_list/paint/warm"] = entry
+
+        state = {"k": 0}
+
+        def add_function():
+            state["k"] += 1
+            model.add_function(f"x**3 + {state['k']}")
+            app.processEvents()
+
+        entry = measure(add_function, args.repeat)
+        entry["items"] = len(functions)
+        results["function_list/add_function"] = entry
+
+
+def bench_library_load(args, results):
+    # librairie de 10 000 fonctions : ancien format (texte seul) puis avec les données dérivées sauvegardées
+    ensure_qapplication()
+    from models.function_list_model import FunctionListModel
+
+    functions = [f"{k}*x**2 + np.sin({k % 17 + 1}*x)" for k in range(1, 10001)]
+    with tempfile.TemporaryDirectory() as tmp:
+        json_file = os.path.join(tmp, "functions.json")
+        with open(json_file, "w", encoding="utf-8") as f:
+            json.dump({"functions": functions}, f)
+        model = FunctionListModel(json_file)
+        entry = measure(model.load_from_json, args.repeat_slow)
+        entry["items"] = len(functions)
+        results["library/load/plain"] = entry
+
+        for function_str in functions:
+            model.update_metadata(function_str, valid=True, latex=f"${function_str}$")
+        entry = measure(model.save_to_json, args.repeat_slow)
+        entry["items"] = len(functions)
+        results["library/save"] = entry
+        entry = measure(model.load_from_json, args.repeat_slow)
+        entry["items"] = len(functions)
+        results["library/load/metadata"] = entry
+
+
+def bench_startup(args, results):
+    # processus neuf à chaque fois ; le rapport de démarrage (app/startup_report.py) donne les étapes
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen",
+               PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    runs = []
+    for _ in range(args.repeat_slow):
+        with tempfile.TemporaryDirectory() as tmp:
+            report_file = os.path.join(tmp, "startup.json")
+            env["TP2_STARTUP_REPORT"] = report_file
+            # l'application lit ../ui et écrit functions.json dans son dossier courant : on lui donne
+            # une copie jetable plutôt que le dépôt mesuré
+            work_dir = os.path.join(tmp, "app")
+            os.makedirs(work_dir)
+            shutil.copytree(os.path.join(ROOT, "ui"), os.path.join(tmp, "ui"),
+                            ignore=shutil.ignore_patterns("__pycache__"))
+            start = time.perf_counter()
+            process = subprocess.Popen([sys.executable, os.path.join(APP_DIR, "application.py")], cwd=work_dir,
+                                       env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                while not os.path.exists(report_file):
+                    if process.poll() is not None:
+                        raise RuntimeError(f"l'application s'est arrêtée (code {process.returncode})")
+                    if time.perf_counter() - start > args.startup_timeout:
+                        raise RuntimeError("premier affichage non atteint")
+                    time.sleep(0.01)
+                wall_ms = (time.perf_counter() - start) * 1000
+                time.sleep(0.05)
+                with open(report_file, encoding="utf-8") as f:
+                    runs.append((wall_ms, json.load(f)["marks_ms"]))
+            finally:
+                process.kill()
+                process.wait()
+
+    results["startup/process_to_first_paint"] = {
+        "median_ms": statistics.median(wall for wall, _ in runs),
+        "min_ms": min(wall for wall, _ in runs),
+        "max_ms": max(wall for wall, _ in runs),
+        "repeat": len(runs),
+    }
+    for mark in runs[0][1]:
+        values = [marks[mark] for _, marks in runs if mark in marks]
+        results[f"startup/{mark}"] = {"median_ms": statistics.median(values), "min_ms": min(values),
+                                      "max_ms": max(values), "repeat": len(values)}
+
+
+BENCHMARKS = {
+    "riemann": bench_riemann,
+    "integrale": bench_integrale,
+    "canvas": bench_canvas,
+    "latex_delegate": bench_latex_delegate,
+    "function_list": bench_function_list,
+    "library": bench_library_load,
+    "startup": bench_startup,
+}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> dict:
+    comparison = {}
+    for key, entry in results.items():
+        reference = baseline.get(key)
+        if not reference or "median_ms" not in entry or "median_ms" not in reference:
+            continue
+        ratio = entry["median_ms"] / reference["median_ms"] if reference["median_ms"] > 0 else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "improvement"
+        else:
+            status = "unchanged"
+        comparison[key] = {"baseline_ms": reference["median_ms"], "ratio": round(ratio, 3), "status": status}
+    return comparison
+
+
+def environment() -> dict:
+    import numpy
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Banc d'essai des chemins critiques")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="groupes à exécuter")
+    parser.add_argument("--repeat", type=int, default=5, help="répétitions des mesures rapides")
+    parser.add_argument("--repeat-slow", type=int, default=3, help="répétitions des mesures à froid")
+    parser.add_argument("--max-exponent", type=int, default=8, help="n maximal = 10**max_exponent")
+    parser.add_argument("--startup-timeout", type=float, default=60.0, help="secondes")
+    parser.add_argument("--output", default="-", help="fichier JSON des résultats (- pour stdout)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="référence pour la comparaison")
+    parser.add_argument("--save-baseline", action="store_true", help="écrit les résultats comme référence")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="écart relatif toléré avant de signaler une régression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    output = args.output if args.output == "-" else os.path.abspath(args.output)
+    baseline = os.path.abspath(args.baseline)
+    sys.path.insert(0, ROOT)
+    # les vues chargent leurs .ui en chemin relatif depuis app/, comme l'application
+    os.chdir(APP_DIR)
+
+    results, skipped = {}, {}
+    for name in args.only or BENCHMARKS:
+        print(f"[bench] {name}", file=sys.stderr)
+        try:
+            BENCHMARKS[name](args, results)
+        except Exception as e:
+            # dépendance absente (PyQt6...) ou échec : le groupe est signalé dans le rapport, pas masqué
+            skipped[name] = f"{type(e).__name__}: {e}"
+
+    report = {"environment": environment(), "results": results, "skipped": skipped}
+    if os.path.exists(baseline) and not args.save_baseline:
+        with open(baseline, encoding="utf-8") as f:
+            report["comparison"] = compare(results, json.load(f)["results"], args.threshold)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if output == "-":
+        print(text)
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text)
+    if args.save_baseline:
+        with open(baseline, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    for name, reason in skipped.items():
+        print(f"[bench] {name} ignoré : {reason}", file=sys.stderr)
+    regressions = {k: v for k, v in report.get("comparison", {}).items() if v["status"] == "regression"}
+    for key, entry in regressions.items():
+        print(f"[bench] régression {key} : x{entry['ratio']} ({entry['baseline_ms']:.2f} ms avant)",
+              file=sys.stderr)
+    return 1 if args.fail_on_regression and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+# Échantillonnage adaptatif de la courbe : peu de points là où f est plate, beaucoup là où elle varie,
+# et coupure de la ligne aux pôles / discontinuités (tan(x), 1/x, ...)
+import numpy as np
+
+
+def evaluate(f, x, dtype=np.float64):
+    # valeurs non finies (pôles, hors domaine) remplacées par nan pour que matplotlib coupe la ligne ;
+    # dtype=np.float32 évalue f en simple précision (aperçu), les abscisses restent en float64
+    with np.errstate(all="ignore"):
+        y = np.asarray(f(np.asarray(x).astype(dtype, copy=False)), dtype=float)
+    if y.shape != np.shape(x):
+        y = np.broadcast_to(y, np.shape(x)).astype(float)
+    y[~np.isfinite(y)] = np.nan
+    return y
+
+
+def finite_range(y):
+    # (min, max) des valeurs finies pour cadrer le graphique, ou None
+    y = np.asarray(y, dtype=float)
+    finite = y[np.isfinite(y)]
+    if finite.size == 0:
+        return None
+    low, high = float(finite.min()), float(finite.max())
+
+    # près d'un pôle (tan(x), 1/x) les extrêmes écraseraient le reste de la courbe
+    p_low, p_high = np.percentile(finite, [2, 98])
+    if p_high > p_low and high - low > 20 * (p_high - p_low):
+        margin = (p_high - p_low) / 2
+        return float(p_low - margin), float(p_high + margin)
+    return low, high
+
+
+def data_bounds(a: float, b: float, y_ranges, include_zero: bool = False):
+    # boîte englobante [[a, bas], [b, haut]] pour ax.dataLim (relim() ignore les collections) ;
+    # include_zero quand les rectangles, qui partent de 0, sont affichés
+    lows, highs = [], []
+    for y_range in y_ranges:
+        if y_range is not None:
+            lows.append(y_range[0])
+            highs.append(y_range[1])
+    if include_zero:
+        lows.append(0.0)
+        highs.append(0.0)
+    return np.array([[a, min(lows, default=0.0)], [b, max(highs, default=1.0)]])
+
+
+def robust_span(y):
+    # étendue verticale sans les valeurs extrêmes, sert d'échelle "pixel"
+    finite = y[np.isfinite(y)]
+    if finite.size == 0:
+        return 1.0
+    low, high = np.percentile(finite, [2, 98])
+    span = high - low
+    if span <= 0:
+        span = finite.max() - finite.min()
+    return span if span > 0 else 1.0
+
+
+def sample_curve(f, a: float, b: float, budget: int = 2000, tolerance: float = 1e-3, dtype=np.float64):
+    # budget : nombre max d'évaluations de f
+    # tolerance : écart toléré entre f(milieu) et la corde, en fraction de la hauteur du graphique
+    initial = max(17, budget // 8)
+    min_width = (b - a) * 1e-9
+
+    x = np.linspace(a, b, initial)
+    y = evaluate(f, x, dtype)
+    xm = (x[:-1] + x[1:]) / 2
+    ym = evaluate(f, xm, dtype)
+    evaluations = x.size + xm.size
+
+    while True:
+        scale = robust_span(y)
+        err = _chord_error(y, ym) / scale
+        err[(x[1:] - x[:-1]) < min_width] = 0.0
+
+        idx = np.flatnonzero(err > tolerance)
+        room = (budget - evaluations) // 2
+        if idx.size == 0 or room <= 0:
+            break
+        if idx.size > room:
+            # on raffine en priorité les intervalles les plus mal approchés
+            idx = np.sort(idx[np.argsort(err[idx])[::-1][:room]])
+
+        # le milieu devient un point de la courbe, et chaque moitié reçoit son propre milieu
+        q_left = (x[idx] + xm[idx]) / 2
+        q_right = (xm[idx] + x[idx + 1]) / 2
+        yq = evaluate(f, np.concatenate([q_left, q_right]), dtype)
+        evaluations += yq.size
+        yq_left, yq_right = yq[:idx.size], yq[idx.size:]
+
+        x = np.insert(x, idx + 1, xm[idx])
+        y = np.insert(y, idx + 1, ym[idx])
+
+        shifted = idx + np.arange(idx.size)
+        xm = np.insert(xm, idx + 1, q_right)
+        ym = np.insert(ym, idx + 1, yq_right)
+        xm[shifted] = q_left
+        ym[shifted] = yq_left
+
+    return _break_jumps(x, y, ym, tolerance)
+
+
+def _chord_error(y, ym):
+    err = np.abs(ym - (y[:-1] + y[1:]) / 2)
+    # un nan d'un côté seulement : bord du domaine ou pôle à localiser, on raffine
+    partial = np.isnan(y[:-1]) ^ np.isnan(y[1:]) | (np.isnan(ym) & ~np.isnan(y[:-1]))
+    err[partial] = np.inf
+    err[np.isnan(err)] = 0.0
+    return err
+
+
+def _break_jumps(x, y, ym, tolerance):
+    # un saut plus grand que la hauteur du graphique, sur un intervalle qui n'a pas pu être
+    # résolu, est une discontinuité : on insère un nan pour ne pas tracer de fausse verticale
+    scale = robust_span(y)
+    with np.errstate(invalid="ignore"):
+        jump = np.abs(np.diff(y)) > scale
+        unresolved = _chord_error(y, ym) / scale > tolerance
+    cut = np.flatnonzero(jump & unresolved)
+    if cut.size == 0:
+        return x, y
+    x = np.insert(x, cut + 1, (x[cut] + x[cut + 1]) / 2)
+    y = np.insert(y, cut + 1, np.nan)
+    return x, y
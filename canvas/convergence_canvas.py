@@ -0,0 +1,53 @@
+import numpy as np
+from matplotlib.figure import Figure
+from models.main_window_model import MainWindowModel
+from canvas.themed_canvas import ThemedCanvas
+
+
+class ConvergenceCanvas(ThemedCanvas):
+    # graphique log-log de l'erreur en fonction de n pour la dernière étude de convergence
+    def __init__(self, model: MainWindowModel):
+        self.__fig = Figure(figsize=(4, 3))
+        self.__ax = self.__fig.add_subplot()
+        super().__init__(self.__fig)
+
+        self.__model = model
+        self.__model.convergenceChanged.connect(self.dessiner)
+
+        self.__bg_color = '#2b2b2b'
+        self.__text_color = '#e0e0e0'
+
+        self.__line, = self.__ax.loglog([], [], marker='o', color='orange')
+        self.__ax.set_xlabel("n")
+        self.__ax.set_ylabel("|erreur|")
+        self.__fig.tight_layout()
+        self.set_theme_colors(self.__bg_color, self.__text_color)
+
+    def set_theme_colors(self, bg_color, text_color):
+        self.__bg_color = bg_color
+        self.__text_color = text_color
+
+        self.__fig.patch.set_facecolor(bg_color)
+        self.__ax.set_facecolor(bg_color)
+        for spine in self.__ax.spines.values():
+            spine.set_color(text_color)
+        self.__ax.tick_params(colors=text_color, which='both')
+        self.__ax.xaxis.label.set_color(text_color)
+        self.__ax.yaxis.label.set_color(text_color)
+        self.__ax.title.set_color(text_color)
+        self.redraw_theme()
+
+    def dessiner(self):
+        result = self.__model.convergence
+        if result is None:
+            self.__line.set_data([], [])
+            self.__ax.set_title("")
+            self.draw_idle()
+            return
+
+        usable = np.isfinite(result.errors) & (result.errors > 0)
+        self.__line.set_data(result.ns[usable], result.errors[usable])
+        self.__ax.set_title(f"{result.method}")
+        self.__ax.relim()
+        self.__ax.autoscale_view()
+        self.draw_idle()
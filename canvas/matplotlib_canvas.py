@@ -1,12 +1,24 @@
 import numpy as np
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QMessageBox
-from matplotlib import pyplot as plt
 import matplotlib
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from matplotlib.collections import PolyCollection
 from models.main_window_model import MainWindowModel
+from canvas.adaptive_sampling import sample_curve, finite_range, data_bounds
+from canvas.riemann_geometry import riemann_heights, riemann_polygons
+from models.perf_stats import perf
+from models.precision import numpy_dtype
+from canvas.themed_canvas import ThemedCanvas
+from canvas.plot_export import PlotSnapshot, RECTANGLE_STYLE
 
 
-class PlotCanvas(FigureCanvas):
+class PlotCanvas(ThemedCanvas):
+    # au plus un redessin par frame (~60 Hz)
+    FRAME_INTERVAL_MS = 16
+    # nombre max d'évaluations de f pour tracer la courbe
+    CURVE_BUDGET = 2000
+
     def __init__(self, model: MainWindowModel):
         # Configurer les paramètres de matplotlib pour dark mode par défaut
         matplotlib.rcParams['figure.facecolor'] = '#2b2b2b'
@@ -20,15 +32,35 @@ class PlotCanvas(FigureCanvas):
         matplotlib.rcParams['legend.facecolor'] = '#2b2b2b'
         matplotlib.rcParams['legend.edgecolor'] = '#e0e0e0'
 
-        self.__fig, self.__ax = plt.subplots()
+        self.__fig = Figure()
+        self.__ax = self.__fig.add_subplot()
 
         super().__init__(self.__fig)
         self.__model = model
-        self.__model.modelChanged.connect(self.dessiner)
+
+        # les changements du modèle sont regroupés : un seul dessin par frame
+        self.__redraw_timer = QTimer(self)
+        self.__redraw_timer.setSingleShot(True)
+        self.__redraw_timer.setInterval(self.FRAME_INTERVAL_MS)
+        self.__redraw_timer.timeout.connect(self.dessiner)
+        self.__model.modelChanged.connect(self.schedule_redraw)
 
         self.__bg_color = '#2b2b2b'
         self.__text_color = '#e0e0e0'
 
+        # artistes persistants : on ne change que leurs données, jamais de ax.clear()
+        self.__curve, = self.__ax.plot([], [], label="f(x)")
+        self.__rectangles = PolyCollection([], **RECTANGLE_STYLE)
+        self.__ax.add_collection(self.__rectangles)
+        self.__legend = None
+        self.__legend_key = None
+
+        # clé des données de la courbe : inutile de réévaluer f si seuls n ou l'orientation changent
+        self.__curve_key = None
+        self.__curve_y_range = None
+        self.__rect_y_range = None
+        self.__curve_budget = self.CURVE_BUDGET
+
     @property
     def fig(self):
         return self.__fig
@@ -37,6 +69,16 @@ class PlotCanvas(FigureCanvas):
     def ax(self):
         return self.__ax
 
+    @property
+    def curve_budget(self):
+        return self.__curve_budget
+
+    @curve_budget.setter
+    def curve_budget(self, val):
+        self.__curve_budget = max(64, int(val))
+        self.__curve_key = None
+        self.schedule_redraw()
+
     def set_theme_colors(self, bg_color, text_color):
         self.__bg_color = bg_color
         self.__text_color = text_color
@@ -61,50 +103,107 @@ class PlotCanvas(FigureCanvas):
         self.__ax.xaxis.label.set_color(text_color)
         self.__ax.yaxis.label.set_color(text_color)
         self.__ax.title.set_color(text_color)
-
-        if self.__model.function:
-            self.dessiner()
-        else:
-            self.draw()
-
+        self.__apply_legend_colors()
+
+        # les données ne changent pas avec le thème : pas besoin de redessiner la courbe
+        self.redraw_theme()
+
+    def snapshot(self) -> PlotSnapshot:
+        # copie détachée de ce qui est affiché, pour un export rendu hors du thread de l'interface
+        curve = None
+        if self.__curve.get_visible():
+            curve = (np.array(self.__curve.get_xdata(), dtype=float), np.array(self.__curve.get_ydata(), dtype=float))
+        polygons = []
+        if self.__rectangles.get_visible():
+            polygons = [path.vertices.copy() for path in self.__rectangles.get_paths()]
+        return PlotSnapshot(curve=curve, polygons=polygons, curve_label=self.__curve.get_label(),
+                            rectangles_label=self.__rectangles.get_label(),
+                            xlim=self.__ax.get_xlim(), ylim=self.__ax.get_ylim(),
+                            bg_color=self.__bg_color, text_color=self.__text_color,
+                            size=tuple(self.__fig.get_size_inches()))
+
+    def schedule_redraw(self):
+        # si un dessin est déjà prévu pour cette frame, il prendra aussi ce changement
+        if not self.__redraw_timer.isActive():
+            self.__redraw_timer.start()
+
+    @perf.timed("PlotCanvas.dessiner")
     def dessiner(self):
+        self.__redraw_timer.stop()
         try:
-            self.__ax.clear()
             f = self.__model.function
-            if f:
-                a, b = self.__model.borne_inf, self.__model.borne_sup
-                x = np.linspace(a, b, 1000)
-                y = f(x)
-                self.__ax.plot(x, y, label="f(x)")
-
-                # rectangles (seulement si actifs ET nb_rectangles > 0)
-                if self.__model.rectangles_active and self.__model.nb_rectangles > 0:
-                    n = self.__model.nb_rectangles
-                    dx = (b - a) / n
-                    if self.__model.orientation == "Droite":
-                        x_rect = np.linspace(a + dx, b, n)
-                    else:
-                        x_rect = np.linspace(a, b - dx, n)
-
-                    y_rect = f(x_rect)
-
-                    # Pour "Gauche", on doit dessiner le rectangle en partant de x_rect - dx
-                    if self.__model.orientation == "Gauche":
-                        self.__ax.bar(
-                            x_rect - dx, y_rect, width=dx,
-                            alpha=0.3, align='edge',
-                            edgecolor='black', color='orange',
-                            label=f"Somme de Riemann ({self.__model.orientation})"
-                        )
-                    else:
-                        self.__ax.bar(
-                            x_rect, y_rect, width=dx,
-                            alpha=0.3, align='edge',
-                            edgecolor='black', color='orange',
-                            label=f"Somme de Riemann ({self.__model.orientation})"
-                        )
-
-            self.__ax.legend()
-            self.draw()
+            if not f:
+                self.__curve.set_visible(False)
+                self.__rectangles.set_visible(False)
+                self.__curve_key = None
+                self.__update_legend()
+                self.draw_idle()
+                return
+
+            a, b = self.__model.borne_inf, self.__model.borne_sup
+            self.__update_curve(f, a, b)
+            self.__update_rectangles(f, a, b)
+            self.__update_limits(a, b)
+            self.__update_legend()
+            self.draw_idle()
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur dans le dessin : {e}")
+
+    def __update_curve(self, f, a, b):
+        # en mpmath la courbe reste en float64 : la précision arbitraire ne se voit pas à l'écran
+        dtype = numpy_dtype(self.__model.precision)
+        key = (f, a, b, dtype)
+        if key == self.__curve_key:
+            return
+
+        x, y = sample_curve(f, a, b, self.__curve_budget, dtype=dtype)
+        self.__curve.set_data(x, y)
+        self.__curve.set_visible(True)
+        self.__curve_y_range = finite_range(y)
+        self.__curve_key = key
+
+    def __update_rectangles(self, f, a, b):
+        # rectangles (seulement si actifs ET nb_rectangles > 0)
+        if not (self.__model.rectangles_active and self.__model.nb_rectangles > 0):
+            self.__rectangles.set_visible(False)
+            self.__rect_y_range = None
+            return
+
+        left, dx, y_rect, y_right = riemann_heights(f, a, b, self.__model.nb_rectangles, self.__model.orientation,
+                                                    numpy_dtype(self.__model.precision))
+
+        # plus de rectangles que de pixels : une enveloppe par colonne de pixels suffit
+        self.__rectangles.set_verts(riemann_polygons(a, left, dx, y_rect, y_right, int(self.__ax.bbox.width)))
+
+        self.__rectangles.set_label(f"Somme de Riemann ({self.__model.orientation})")
+        self.__rectangles.set_visible(True)
+        self.__rect_y_range = finite_range(y_rect)
+
+    def __update_limits(self, a, b):
+        # relim() ignore les collections : on calcule la boîte englobante nous-mêmes
+        self.__ax.dataLim.set_points(data_bounds(a, b, (self.__curve_y_range, self.__rect_y_range),
+                                                 self.__rectangles.get_visible()))
+        self.__ax.autoscale_view()
+
+    def __update_legend(self):
+        handles = [artist for artist in (self.__curve, self.__rectangles) if artist.get_visible()]
+        key = tuple(artist.get_label() for artist in handles)
+        if key == self.__legend_key:
+            return
+
+        if self.__legend is not None:
+            self.__legend.remove()
+            self.__legend = None
+        if handles:
+            self.__legend = self.__ax.legend(handles=handles)
+            self.__apply_legend_colors()
+        self.__legend_key = key
+
+    def __apply_legend_colors(self):
+        if self.__legend is None:
+            return
+        frame = self.__legend.get_frame()
+        frame.set_facecolor(self.__bg_color)
+        frame.set_edgecolor(self.__text_color)
+        for text in self.__legend.get_texts():
+            text.set_color(self.__text_color)
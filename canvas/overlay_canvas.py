@@ -0,0 +1,73 @@
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+from matplotlib.figure import Figure
+from canvas.themed_canvas import ThemedCanvas
+
+
+class OverlayCanvas(ThemedCanvas):
+    # toutes les fonctions de la librairie superposées, dessinées en une seule LineCollection
+    MAX_LEGEND = 10
+
+    def __init__(self):
+        self.__fig = Figure(figsize=(4, 3))
+        self.__ax = self.__fig.add_subplot()
+        super().__init__(self.__fig)
+
+        self.__lines = LineCollection([], linewidths=1.2)
+        self.__ax.add_collection(self.__lines)
+        self.__legend = None
+
+        self.__bg_color = '#2b2b2b'
+        self.__text_color = '#e0e0e0'
+        self.set_theme_colors(self.__bg_color, self.__text_color)
+
+    def set_theme_colors(self, bg_color, text_color):
+        self.__bg_color = bg_color
+        self.__text_color = text_color
+
+        self.__fig.patch.set_facecolor(bg_color)
+        self.__ax.set_facecolor(bg_color)
+        for spine in self.__ax.spines.values():
+            spine.set_color(text_color)
+        self.__ax.tick_params(colors=text_color, which='both')
+        self.__apply_legend_colors()
+        self.redraw_theme()
+
+    def dessiner(self, x, y_rows, labels):
+        # y_rows : tableau (m, len(x)) issu de FunctionListModel.evaluate_all
+        x = np.asarray(x, dtype=float)
+        segments = np.empty(y_rows.shape + (2,))
+        segments[..., 0] = x
+        segments[..., 1] = y_rows
+
+        colors = [f"C{i % 10}" for i in range(len(labels))]
+        self.__lines.set_segments(segments)
+        self.__lines.set_colors(colors)
+
+        finite = y_rows[np.isfinite(y_rows)]
+        if finite.size:
+            low, high = np.percentile(finite, [1, 99])
+            margin = (high - low) * 0.05 or 1.0
+            self.__ax.set_ylim(low - margin, high + margin)
+        self.__ax.set_xlim(x[0], x[-1])
+
+        if self.__legend is not None:
+            self.__legend.remove()
+            self.__legend = None
+        if 0 < len(labels) <= self.MAX_LEGEND:
+            handles = [Line2D([], [], color=c) for c in colors]
+            self.__legend = self.__ax.legend(handles, labels, fontsize='small')
+            self.__apply_legend_colors()
+
+        self.draw_idle()
+
+    def __apply_legend_colors(self):
+        if self.__legend is None:
+            return
+        frame = self.__legend.get_frame()
+        frame.set_facecolor(self.__bg_color)
+        frame.set_edgecolor(self.__text_color)
+        for text in self.__legend.get_texts():
+            text.set_color(self.__text_color)
+
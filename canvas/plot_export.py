@@ -0,0 +1,124 @@
+# Export des graphiques hors du thread de l'interface : une PlotSnapshot est une copie détachée de ce
+# qu'affiche PlotCanvas (données, limites, couleurs), picklable, rendue dans une Figure neuve.
+# Pas de Qt ni de pyplot ici : utilisable dans un processus séparé (voir models/export_pool.py).
+import os
+import re
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+
+from canvas.adaptive_sampling import sample_curve, finite_range, data_bounds
+from canvas.riemann_geometry import riemann_heights, riemann_polygons
+
+EXPORT_FORMATS = ("png", "svg", "pdf")
+# mêmes réglages que les rectangles de PlotCanvas
+RECTANGLE_STYLE = {"alpha": 0.3, "facecolor": "orange", "edgecolor": "black"}
+# largeur en colonnes au-delà de laquelle les rectangles sont regroupés en une enveloppe
+EXPORT_COLUMNS = 2000
+
+
+class PlotSnapshot:
+    def __init__(self, curve=None, polygons=(), curve_label="f(x)", rectangles_label=None,
+                 xlim=None, ylim=None, bounds=None, bg_color='#2b2b2b', text_color='#e0e0e0',
+                 size=(6.4, 4.8), title=None):
+        # curve : (x, y) ou None ; polygons : sommets des rectangles (liste de tableaux (k, 2))
+        # xlim/ylim : limites exactes de l'écran, sinon bounds : boîte englobante des données
+        self.curve = curve
+        self.polygons = polygons
+        self.curve_label = curve_label
+        self.rectangles_label = rectangles_label
+        self.xlim = xlim
+        self.ylim = ylim
+        self.bounds = bounds
+        self.bg_color = bg_color
+        self.text_color = text_color
+        self.size = size
+        self.title = title
+
+
+def function_snapshot(function_str: str, a: float, b: float, n: int, orientation: str,
+                      bg_color: str, text_color: str, budget: int = 2000) -> PlotSnapshot:
+    # même graphique que PlotCanvas, calculé sans fenêtre (export de toute la librairie)
+    from models.expression_compiler import compile_function
+    f = compile_function(function_str)
+    x, y = sample_curve(f, a, b, budget)
+
+    polygons, rectangles_label, rect_range = (), None, None
+    if n > 0:
+        with np.errstate(all="ignore"):
+            left, dx, y_rect, y_right = riemann_heights(f, a, b, n, orientation)
+        y_rect = np.broadcast_to(np.asarray(y_rect, dtype=float), left.shape)
+        if y_right is not None:
+            y_right = np.broadcast_to(np.asarray(y_right, dtype=float), left.shape)
+        polygons = list(riemann_polygons(a, left, dx, y_rect, y_right, EXPORT_COLUMNS))
+        rectangles_label = f"Somme de Riemann ({orientation})"
+        rect_range = finite_range(y_rect)
+
+    return PlotSnapshot(curve=(x, y), polygons=polygons, rectangles_label=rectangles_label,
+                        bounds=data_bounds(a, b, (finite_range(y), rect_range), n > 0),
+                        bg_color=bg_color, text_color=text_color, title=function_str)
+
+
+def render_snapshot(snapshot: PlotSnapshot, path: str, dpi: float = 300) -> str:
+    # le fichier est écrit à côté puis renommé : un export annulé ne laisse pas d'image tronquée
+    fig = Figure(figsize=snapshot.size)
+    FigureCanvasAgg(fig)
+    try:
+        bg, text = snapshot.bg_color, snapshot.text_color
+        fig.patch.set_facecolor(bg)
+        ax = fig.add_subplot()
+        ax.set_facecolor(bg)
+        for spine in ax.spines.values():
+            spine.set_color(text)
+        ax.tick_params(colors=text, which='both')
+
+        handles = []
+        if snapshot.curve is not None:
+            line, = ax.plot(*snapshot.curve, label=snapshot.curve_label)
+            handles.append(line)
+        if len(snapshot.polygons):
+            rectangles = PolyCollection(snapshot.polygons, label=snapshot.rectangles_label, **RECTANGLE_STYLE)
+            ax.add_collection(rectangles)
+            handles.append(rectangles)
+
+        if snapshot.xlim is not None:
+            ax.set_xlim(snapshot.xlim)
+            ax.set_ylim(snapshot.ylim)
+        elif snapshot.bounds is not None:
+            ax.dataLim.set_points(np.asarray(snapshot.bounds))
+            ax.autoscale_view()
+        if snapshot.title:
+            ax.set_title(snapshot.title, color=text)
+
+        if handles:
+            legend = ax.legend(handles=handles)
+            legend.get_frame().set_facecolor(bg)
+            legend.get_frame().set_edgecolor(text)
+            for legend_text in legend.get_texts():
+                legend_text.set_color(text)
+
+        file_format = os.path.splitext(path)[1].lstrip(".").lower() or "png"
+        part_path = partial_path(path)
+        fig.savefig(part_path, format=file_format, dpi=dpi, bbox_inches='tight', facecolor=bg)
+        os.replace(part_path, path)
+        return path
+    finally:
+        fig.clear()
+
+
+def partial_path(path: str) -> str:
+    return path + ".part"
+
+
+def export_filename(directory: str, index: int, function_str: str, file_format: str) -> str:
+    # 0001_np_sin_x.png : l'index garde l'ordre de la librairie et évite les collisions
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", function_str).strip("_")[:40] or "f"
+    return os.path.join(directory, f"{index + 1:04d}_{slug}.{file_format}")
+
+
+def export_function(function_str: str, path: str, a: float, b: float, n: int, orientation: str,
+                    bg_color: str, text_color: str, dpi: float) -> str:
+    # tâche d'un worker de l'export de la librairie
+    return render_snapshot(function_snapshot(function_str, a, b, n, orientation, bg_color, text_color), path, dpi)
@@ -0,0 +1,67 @@
+# Géométrie des rectangles de Riemann : un polygone par rectangle tant qu'ils sont visibles,
+# une seule enveloppe en escalier (une colonne par pixel) quand ils deviennent plus fins qu'un pixel
+import numpy as np
+
+
+def riemann_heights(f, a: float, b: float, n: int, orientation: str, dtype=np.float64):
+    # bord gauche de chaque rectangle et hauteurs ; le point d'évaluation dépend de la méthode
+    # (Simpson et Romberg partent des trapèzes, Gauss-Legendre est montré comme le point milieu)
+    # retourne (left, dx, hauteurs, hauteurs à droite ou None)
+    dx = (b - a) / n
+    left = a + dx * np.arange(n)
+    y_right = None
+    if orientation in ("Trapèzes", "Simpson", "Romberg"):
+        y_edges = f((a + dx * np.arange(n + 1)).astype(dtype, copy=False))
+        y_rect, y_right = y_edges[:-1], y_edges[1:]
+    elif orientation in ("Milieu", "Gauss-Legendre"):
+        y_rect = f((left + dx / 2).astype(dtype, copy=False))
+    elif orientation == "Droite":
+        y_rect = f((left + dx).astype(dtype, copy=False))
+    else:
+        y_rect = f(left.astype(dtype, copy=False))
+    return left, dx, y_rect, y_right
+
+
+def riemann_polygons(a: float, left, dx: float, heights, heights_right, columns: int):
+    # plus de rectangles que de colonnes de pixels : une enveloppe par colonne suffit
+    if columns > 0 and left.size > columns:
+        return [aggregated_polygon(a, dx, heights, columns)]
+    return rectangle_verts(left, dx, heights, heights_right)
+
+
+def rectangle_verts(left, dx: float, heights, heights_right=None):
+    # tableau (n, 4, 2) directement utilisable par PolyCollection.set_verts
+    # avec heights_right on obtient des trapèzes (hauteur à gauche, hauteur à droite)
+    heights = _finite(heights)
+    heights_right = heights if heights_right is None else _finite(heights_right)
+    right = left + dx
+    zeros = np.zeros_like(heights)
+    return np.stack([
+        np.column_stack([left, zeros]),
+        np.column_stack([left, heights]),
+        np.column_stack([right, heights_right]),
+        np.column_stack([right, zeros]),
+    ], axis=1)
+
+
+def _finite(values):
+    return np.nan_to_num(np.asarray(values, dtype=float), nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def aggregated_polygon(a: float, dx: float, heights, columns: int):
+    # regroupe les n rectangles en `columns` colonnes et trace, pour chacune, la zone couverte
+    # entre min(0, hauteur min) et max(0, hauteur max) : un seul polygone de 4*columns sommets
+    heights = _finite(heights)
+    n = heights.size
+    columns = max(1, min(int(columns), n))
+
+    starts = (np.arange(columns) * n) // columns
+    top = np.maximum(np.maximum.reduceat(heights, starts), 0.0)
+    bottom = np.minimum(np.minimum.reduceat(heights, starts), 0.0)
+
+    edges = a + dx * np.append(starts, n)
+    xs = np.column_stack([edges[:-1], edges[1:]]).ravel()
+
+    upper = np.column_stack([xs, np.repeat(top, 2)])
+    lower = np.column_stack([xs[::-1], np.repeat(bottom, 2)[::-1]])
+    return np.concatenate([upper, lower])
@@ -0,0 +1,22 @@
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+
+
+class ThemedCanvas(FigureCanvas):
+    # changement de thème : seules les couleurs des artistes changent, les données restent en place.
+    # Un graphique caché (onglet inactif, dock fermé) n'est redessiné qu'à son prochain affichage.
+
+    def __init__(self, figure):
+        super().__init__(figure)
+        self.__redraw_on_show = False
+
+    def redraw_theme(self):
+        if self.isVisible():
+            self.draw_idle()
+        else:
+            self.__redraw_on_show = True
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.__redraw_on_show:
+            self.__redraw_on_show = False
+            self.draw_idle()
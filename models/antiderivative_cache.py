@@ -0,0 +1,174 @@
+# Cache des primitives : une fois F connue, une intégrale définie ne coûte que F(b) - F(a)
+# sympy n'est importé qu'au premier calcul : charger la librairie au démarrage ne le tire pas
+from collections import OrderedDict
+
+import numpy as np
+
+from models.expression_compiler import normalize
+
+
+def find_singularities(*exprs):
+    # liste triée des singularités réelles, ou None si sympy ne sait pas les énumérer
+    import sympy as sp
+    X = sp.Symbol("x")
+    points = set()
+    for expr in exprs:
+        try:
+            found = sp.singularities(expr, X)
+        except Exception:
+            return None
+        if found is sp.S.EmptySet:
+            continue
+        if not isinstance(found, sp.FiniteSet):
+            return None
+        for p in found:
+            if p.is_real is None:
+                return None
+            if p.is_real:
+                points.add(float(p))
+    return sorted(points)
+
+
+def compute_antiderivative(function_str: str):
+    # retourne (primitive en texte, singularités) ou None si sympy ne trouve pas de forme fermée
+    import sympy as sp
+    X = sp.Symbol("x")
+    f_sympy = sp.sympify(function_str)
+    primitive = sp.integrate(f_sympy, X)
+    if primitive.has(sp.Integral):
+        return None
+    return str(primitive), find_singularities(f_sympy, primitive)
+
+
+def evaluate_primitive(primitive, singularities, a: float, b: float):
+    # F(b) - F(a), ou None si [a, b] contient une singularité ou si le résultat n'est pas fini
+    if singularities is None or any(a <= p <= b for p in singularities):
+        return None
+    try:
+        with np.errstate(all="ignore"):
+            value = float(primitive(b)) - float(primitive(a))
+    except Exception:
+        return None
+    if not np.isfinite(value):
+        return None
+    return value
+
+
+def evaluate_primitive_mp(primitive, singularities, a: float, b: float, dps: int):
+    # même chose en précision arbitraire (primitive lambdifiée pour mpmath) : mpf ou None
+    if singularities is None or any(a <= p <= b for p in singularities):
+        return None
+    import mpmath
+    try:
+        with mpmath.workdps(dps):
+            value = mpmath.mpmathify(primitive(mpmath.mpf(b))) - mpmath.mpmathify(primitive(mpmath.mpf(a)))
+    except Exception:
+        return None
+    if not isinstance(value, mpmath.mpf) or not mpmath.isfinite(value):
+        return None
+    return value
+
+
+class AntiderivativeEntry:
+    def __init__(self, primitive_str: str, singularities):
+        self.primitive_str = primitive_str
+        self.singularities = singularities
+        self.__primitive = None
+        self.__mp_primitive = None
+
+    @property
+    def primitive(self):
+        # lambdify seulement au premier usage : charger la librairie reste rapide
+        if self.__primitive is None:
+            import sympy as sp
+            self.__primitive = sp.lambdify(sp.Symbol("x"), sp.sympify(self.primitive_str), modules="numpy")
+        return self.__primitive
+
+    @property
+    def mp_primitive(self):
+        if self.__mp_primitive is None:
+            import sympy as sp
+            self.__mp_primitive = sp.lambdify(sp.Symbol("x"), sp.sympify(self.primitive_str), modules="mpmath")
+        return self.__mp_primitive
+
+    def to_dict(self) -> dict:
+        return {"primitive": self.primitive_str, "singularities": self.singularities}
+
+
+class AntiderivativeCache:
+    # LRU par expression normalisée, sérialisable dans le fichier de la librairie
+
+    def __init__(self, max_size: int = 256):
+        self.__entries = OrderedDict()
+        self.__max_size = max_size
+
+    def get(self, function_str: str):
+        key = self.__key(function_str)
+        entry = self.__entries.get(key)
+        if entry is not None:
+            self.__entries.move_to_end(key)
+        return entry
+
+    def put(self, function_str: str, primitive_str: str, singularities):
+        key = self.__key(function_str)
+        if key is None:
+            return
+        self.__entries[key] = AntiderivativeEntry(primitive_str, singularities)
+        self.__entries.move_to_end(key)
+        if len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def definite(self, function_str: str, a: float, b: float, dps: int = None):
+        # float, ou mpf avec dps chiffres
+        entry = self.get(function_str)
+        if entry is None:
+            return None
+        try:
+            primitive = entry.mp_primitive if dps else entry.primitive
+        except Exception:
+            self.evict(function_str)
+            return None
+        if dps:
+            return evaluate_primitive_mp(primitive, entry.singularities, a, b, dps)
+        return evaluate_primitive(primitive, entry.singularities, a, b)
+
+    def evict(self, function_str: str):
+        key = self.__key(function_str)
+        self.__entries.pop(key, None)
+
+    def clear(self):
+        self.__entries.clear()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def to_dict(self, functions=None) -> dict:
+        # seulement les fonctions demandées (celles de la librairie) si fournies
+        keys = None
+        if functions is not None:
+            keys = {self.__key(f) for f in functions}
+        return {key: entry.to_dict() for key, entry in self.__entries.items()
+                if keys is None or key in keys}
+
+    def load_dict(self, data: dict):
+        # les clés viennent de to_dict, elles sont déjà normalisées ; seules les max_size dernières
+        # resteraient dans le cache
+        for key, entry in list(data.items())[-self.__max_size:]:
+            try:
+                self.__entries[key] = AntiderivativeEntry(entry["primitive"], entry.get("singularities"))
+                self.__entries.move_to_end(key)
+            except Exception:
+                pass
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    @staticmethod
+    def __key(function_str: str):
+        try:
+            return normalize(function_str)
+        except SyntaxError:
+            return None
+
+
+# instance partagée : MainWindowModel s'en sert, FunctionListModel la sauvegarde avec la librairie
+antiderivatives = AntiderivativeCache()
@@ -0,0 +1,106 @@
+# Évaluation de toute la librairie de fonctions sur une grille commune : un tableau (m, n) au lieu
+# de m passages par le ComboBox. Les sommes et intégrales se font ensuite par opérations sur les lignes.
+import numpy as np
+
+from models.expression_compiler import compile_function, compiler
+
+BATCH_METHODS = ("Gauche", "Droite", "Milieu", "Trapèzes")
+
+
+class BatchResult:
+    def __init__(self, functions, valid, sums=None, sum_errors=None, integrals=None, integral_errors=None):
+        self.functions = functions
+        self.valid = valid
+        self.sums = sums
+        self.sum_errors = sum_errors
+        self.integrals = integrals
+        self.integral_errors = integral_errors
+
+
+class LibraryEvaluator:
+    # fonctions invalides : ligne de nan, et valid[i] = False
+    def __init__(self, functions):
+        self.__functions = list(functions)
+        self.__valid = np.zeros(len(self.__functions), dtype=bool)
+        for i, function_str in enumerate(self.__functions):
+            try:
+                compile_function(function_str)
+                self.__valid[i] = True
+            except Exception:
+                pass
+
+        valid_functions = [f for f, ok in zip(self.__functions, self.__valid) if ok]
+        self.__batch = compiler.compile_many(valid_functions) if valid_functions else None
+
+    @property
+    def functions(self):
+        return self.__functions.copy()
+
+    @property
+    def valid(self):
+        return self.__valid.copy()
+
+    def evaluate(self, x):
+        x = np.asarray(x, dtype=float)
+        out = np.full((len(self.__functions),) + x.shape, np.nan)
+        if self.__batch is None:
+            return out
+
+        with np.errstate(all="ignore"):
+            try:
+                out[self.__valid] = self.__batch(x)
+            except Exception:
+                # une expression qui échoue sur cette grille (ex. forme incompatible) : ligne par ligne
+                for i in np.flatnonzero(self.__valid):
+                    try:
+                        out[i] = compile_function(self.__functions[i])(x)
+                    except Exception:
+                        pass
+        out[~np.isfinite(out)] = np.nan
+        return out
+
+    def riemann(self, a: float, b: float, n: int, method: str = "Gauche") -> BatchResult:
+        # mêmes règles que models.quadrature, appliquées à toutes les lignes d'un coup
+        n = max(1, int(n))
+        dx = (b - a) / n
+        edges = self.evaluate(a + dx * np.arange(n + 1))
+        trapeze = (np.sum(edges, axis=1) - (edges[:, 0] + edges[:, -1]) / 2) * dx
+        delta = edges[:, -1] - edges[:, 0]
+
+        if method == "Gauche":
+            sums = np.sum(edges[:, :-1], axis=1) * dx
+            errors = np.abs(dx * delta / 2)
+        elif method == "Droite":
+            sums = np.sum(edges[:, 1:], axis=1) * dx
+            errors = np.abs(dx * delta / 2)
+        elif method == "Milieu":
+            sums = np.sum(self.evaluate(a + dx * (np.arange(n) + 0.5)), axis=1) * dx
+            errors = np.abs(trapeze - sums) / 3
+        elif method == "Trapèzes":
+            sums = trapeze
+            if n % 2 == 0:
+                coarse = edges[:, ::2]
+                coarse_sum = (np.sum(coarse, axis=1) - (coarse[:, 0] + coarse[:, -1]) / 2) * 2 * dx
+                errors = np.abs(trapeze - coarse_sum) / 3
+            else:
+                errors = np.full(sums.shape, np.nan)
+        else:
+            raise ValueError(f"Méthode non disponible en lot : {method}")
+
+        return BatchResult(self.functions, self.valid, sums=sums, sum_errors=errors)
+
+    def integrate(self, a: float, b: float, panels: int = 64, order: int = 10) -> BatchResult:
+        # Gauss-Legendre composite sur des nœuds communs ; erreur estimée contre la moitié des panneaux
+        nodes, weights = np.polynomial.legendre.leggauss(order)
+
+        def composite(count):
+            edges = np.linspace(a, b, count + 1)
+            half = (edges[1:] - edges[:-1]) / 2
+            centers = (edges[1:] + edges[:-1]) / 2
+            x = (centers[:, None] + half[:, None] * nodes[None, :]).ravel()
+            y = self.evaluate(x).reshape(len(self.__functions), count, order)
+            return np.sum(y @ weights * half, axis=1)
+
+        fine = composite(panels)
+        coarse = composite(max(1, panels // 2))
+        return BatchResult(self.functions, self.valid, integrals=fine, integral_errors=np.abs(fine - coarse))
@@ -0,0 +1,92 @@
+# Étude de convergence : sommes pour n0, 2*n0, 4*n0, ... en une seule passe.
+# Tout part de l'échelle des trapèzes : doubler n n'évalue que les milieux de la grille précédente,
+# et les autres méthodes s'en déduisent sans nouvelle évaluation :
+#   Gauche = T_n - dx/2 (f(b) - f(a)),  Droite = T_n + dx/2 (f(b) - f(a)),  Milieu = 2 T_2n - T_n
+import numpy as np
+
+from models.quadrature import gauss_kronrod
+
+NESTED_METHODS = ("Gauche", "Droite", "Milieu", "Trapèzes")
+
+
+class ConvergenceResult:
+    def __init__(self, method, ns, sums, errors, order, reference, evaluations):
+        self.method = method
+        self.ns = ns
+        self.sums = sums
+        self.errors = errors
+        self.order = order
+        self.reference = reference
+        self.evaluations = evaluations
+
+
+def _eval(f, x):
+    with np.errstate(all="ignore"):
+        return np.asarray(f(x), dtype=float)
+
+
+def trapezoid_ladder(f, a: float, b: float, n0: int, levels: int):
+    # T_{n0}, T_{2 n0}, ..., T_{2^levels n0} ; chaque niveau réutilise tous les points du précédent
+    ends = _eval(f, np.array([a, b]))
+    dx = (b - a) / n0
+    interior = _eval(f, a + dx * np.arange(1, n0)) if n0 > 1 else np.zeros(0)
+    running = np.sum(interior) + (ends[0] + ends[1]) / 2
+    evaluations = 2 + interior.size
+
+    n = n0
+    sums = [running * dx]
+    for _ in range(levels):
+        midpoints = _eval(f, a + dx * (np.arange(n) + 0.5))
+        evaluations += midpoints.size
+        running += np.sum(midpoints)
+        n *= 2
+        dx /= 2
+        sums.append(running * dx)
+    return np.array(sums), ends[1] - ends[0], evaluations
+
+
+def estimate_order(ns, errors, floor: float = 0.0):
+    # pente de log(erreur) en fonction de log(n), sur les points où l'erreur dépasse le bruit d'arrondi
+    ns = np.asarray(ns, dtype=float)
+    errors = np.asarray(errors, dtype=float)
+    usable = np.isfinite(errors) & (errors > floor)
+    if np.count_nonzero(usable) < 2:
+        return None
+    slope, _ = np.polyfit(np.log(ns[usable]), np.log(errors[usable]), 1)
+    return float(-slope)
+
+
+def convergence_study(f, a: float, b: float, method: str = "Gauche", n0: int = 4, levels: int = 10,
+                      reference: float = None) -> ConvergenceResult:
+    if method not in NESTED_METHODS:
+        raise ValueError(f"Étude de convergence non disponible pour {method}")
+
+    n0 = max(1, int(n0))
+    # Milieu a besoin d'un niveau de trapèzes supplémentaire
+    trap, delta_f, evaluations = trapezoid_ladder(f, a, b, n0, levels + (method == "Milieu"))
+    ns = n0 * 2 ** np.arange(levels + 1)
+    dx = (b - a) / ns
+
+    if method == "Gauche":
+        sums = trap - dx / 2 * delta_f
+    elif method == "Droite":
+        sums = trap + dx / 2 * delta_f
+    elif method == "Milieu":
+        sums = 2 * trap[1:] - trap[:-1]
+    else:
+        sums = trap
+
+    if reference is None:
+        result = gauss_kronrod(f, a, b)
+        evaluations += result.evaluations
+        reference = result.value if result.converged else None
+
+    if reference is None:
+        errors = np.full(sums.shape, np.nan)
+        floor = 0.0
+    else:
+        errors = np.abs(sums - reference)
+        floor = 1e-12 * max(1.0, abs(reference))
+
+    order = estimate_order(ns, errors, floor)
+    return ConvergenceResult(method, ns, sums, errors, order, reference, evaluations)
@@ -0,0 +1,243 @@
+# Plan d'évaluation d'une expression : l'AST est traduit en une suite d'ufuncs numpy qui écrivent
+# dans des tampons préalloués (out=). Les sous-expressions identiques ne sont calculées qu'une fois,
+# les parties qui ne dépendent pas de x sont réduites à une constante, et la grille est parcourue
+# par blocs : les temporaires ont la taille d'un bloc, seul le résultat a la taille de x.
+#
+#   np.exp(-x**2/4)*np.sin(x)   ->   r0 = x**2 ; r0 /= 4 ; r0 = -r0 ; r0 = exp(r0) ; r1 = sin(x) ; out = r0*r1
+import ast
+
+import numpy as np
+
+# opérateurs python -> ufunc équivalente (mêmes résultats que l'expression évaluée par numpy)
+_BINARY = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.Pow: np.power,
+    ast.Mod: np.remainder,
+    ast.FloorDiv: np.floor_divide,
+}
+_UNARY = {
+    ast.USub: np.negative,
+}
+
+# un bloc de 32768 float64 (256 Ko) : les tampons d'un plan tiennent dans le cache
+CHUNK_SIZE = 1 << 15
+
+_X = "x"
+
+
+class UnsupportedExpression(Exception):
+    # l'expression sort de ce que le plan sait traduire : le compilateur garde la lambda
+    pass
+
+
+class EvaluationPlan:
+    def __init__(self, source: str, namespace: dict, chunk_size: int = CHUNK_SIZE):
+        self.__source = source
+        self.__namespace = namespace
+        self.__chunk_size = chunk_size
+        # nœuds déjà traduits : ast.dump(nœud) -> opérande (élimination des sous-expressions communes)
+        self.__seen = {}
+        # instructions (ufunc, opérandes) dans l'ordre d'exécution ; une opérande est _X,
+        # une constante ("const", valeur) ou l'indice d'une instruction précédente
+        self.__instructions = []
+
+        root = self.__translate(ast.parse(source, mode="eval").body)
+        self.__root = root
+        self.__program, self.__registers = self.__allocate(root)
+        self.__kernel = self.__generate(self.__program, self.__registers)
+
+    @property
+    def source(self):
+        return self.__source
+
+    @property
+    def chunk_size(self):
+        return self.__chunk_size
+
+    @property
+    def instruction_count(self):
+        return len(self.__program)
+
+    @property
+    def register_count(self):
+        return self.__registers
+
+    def __call__(self, x, out=None):
+        # float32 reste en float32 (aperçu rapide), tout le reste est calculé en float64
+        x = np.asarray(x)
+        dtype = np.float32 if x.dtype == np.float32 else np.float64
+        x = x.astype(dtype, copy=False)
+        scalar = x.ndim == 0
+        flat = np.ascontiguousarray(x).reshape(-1)
+
+        if out is None:
+            result = np.empty(flat.shape, dtype=dtype)
+        else:
+            if out.shape != x.shape or out.dtype != dtype:
+                raise ValueError(f"out doit être un tableau {np.dtype(dtype).name} de la forme de x")
+            result = out.reshape(-1)
+
+        self.__run(flat, result)
+
+        if out is not None and not np.shares_memory(result, out):
+            out[...] = result.reshape(out.shape)
+            return out
+        if scalar:
+            return result[0]
+        return result.reshape(x.shape)
+
+    def __run(self, flat, result):
+        root = self.__root
+        if root is _X:
+            result[...] = flat
+            return
+        if isinstance(root, tuple):
+            result.fill(root[1])
+            return
+
+        size = flat.size
+        if size == 0:
+            return
+        step = min(self.__chunk_size, size)
+        buffers = [np.empty(step, dtype=result.dtype) for _ in range(self.__registers)]
+        kernel = self.__kernel
+        full = size - size % step
+        for start in range(0, full, step):
+            kernel(flat[start:start + step], result[start:start + step], *buffers)
+        if full < size:
+            rest = size - full
+            kernel(flat[full:], result[full:], *[buffer[:rest] for buffer in buffers])
+
+    # traduction AST -> instructions
+
+    def __translate(self, node):
+        key = ast.dump(node)
+        operand = self.__seen.get(key)
+        if operand is not None:
+            return operand
+
+        operand = self.__translate_node(node)
+        self.__seen[key] = operand
+        return operand
+
+    def __translate_node(self, node):
+        if isinstance(node, ast.Name) and node.id == _X:
+            return _X
+
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise UnsupportedExpression(ast.unparse(node))
+            return ("const", node.value)
+
+        if isinstance(node, (ast.Name, ast.Attribute)):
+            value = self.__resolve(node)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return ("const", value)
+            raise UnsupportedExpression(ast.unparse(node))
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            return self.__emit(_BINARY[type(node.op)], [node.left, node.right])
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
+            return self.__translate(node.operand)
+
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+            return self.__emit(_UNARY[type(node.op)], [node.operand])
+
+        if isinstance(node, ast.Call) and not node.keywords:
+            ufunc = self.__resolve(node.func)
+            if isinstance(ufunc, np.ufunc) and ufunc.nout == 1 and ufunc.nin == len(node.args):
+                return self.__emit(ufunc, node.args)
+
+        raise UnsupportedExpression(ast.unparse(node))
+
+    def __resolve(self, node):
+        # nom ou attribut du namespace (np.sin, np.pi, sin, pi) ; rien d'autre n'est évalué
+        if isinstance(node, ast.Name):
+            if node.id not in self.__namespace or node.id.startswith("__"):
+                raise UnsupportedExpression(node.id)
+            return self.__namespace[node.id]
+        if isinstance(node, ast.Attribute) and not node.attr.startswith("_"):
+            return getattr(self.__resolve(node.value), node.attr, None)
+        raise UnsupportedExpression(ast.unparse(node))
+
+    def __emit(self, ufunc, arg_nodes):
+        operands = [self.__translate(arg) for arg in arg_nodes]
+        if all(isinstance(operand, tuple) for operand in operands):
+            # sous-expression sans x : calculée une fois ici, comme python l'aurait fait à chaque appel
+            try:
+                with np.errstate(all="ignore"):
+                    value = float(ufunc(*[operand[1] for operand in operands]))
+            except (TypeError, ValueError, OverflowError):
+                raise UnsupportedExpression(ufunc.__name__)
+            return ("const", value)
+        self.__instructions.append((ufunc, operands))
+        return len(self.__instructions) - 1
+
+    # allocation des tampons
+
+    def __allocate(self, root):
+        # un tampon est libéré après la dernière lecture de sa valeur ; une instruction écrit de
+        # préférence dans le tampon d'une opérande qui meurt (calcul en place), sinon dans un tampon libre
+        if not isinstance(root, int):
+            return [], 0
+
+        last_use = {}
+        for index, (_, operands) in enumerate(self.__instructions):
+            for operand in operands:
+                if isinstance(operand, int):
+                    last_use[operand] = index
+
+        register_of = {}
+        free = []
+        count = 0
+        program = []
+        for index, (ufunc, operands) in enumerate(self.__instructions):
+            dying = [register_of[operand] for operand in set(operands)
+                     if isinstance(operand, int) and last_use[operand] == index]
+            mapped = [operand if not isinstance(operand, int) else register_of[operand] for operand in operands]
+
+            if index == root:
+                dest = None
+            elif dying:
+                dest = dying.pop()
+            elif free:
+                dest = free.pop()
+            else:
+                dest = count
+                count += 1
+
+            free.extend(dying)
+            register_of[index] = dest
+            program.append((ufunc, mapped, dest))
+        return program, count
+
+    @staticmethod
+    def __generate(program, registers):
+        # le bloc est exécuté par une fonction python en ligne droite, générée une fois :
+        #   def kernel(x, out, r0, r1): u0(x, c0, out=r0) ; ... ; u5(r0, r1, out=out)
+        if not program:
+            return None
+        names = {}
+        lines = [f"def kernel(x, out{''.join(f', r{i}' for i in range(registers))}):"]
+        for index, (ufunc, operands, dest) in enumerate(program):
+            args = []
+            for position, operand in enumerate(operands):
+                if operand is _X:
+                    args.append("x")
+                elif isinstance(operand, tuple):
+                    name = f"c{index}_{position}"
+                    names[name] = operand[1]
+                    args.append(name)
+                else:
+                    args.append(f"r{operand}")
+            names[f"u{index}"] = ufunc
+            target = "out" if dest is None else f"r{dest}"
+            lines.append(f"    u{index}({', '.join(args)}, out={target})")
+
+        namespace = dict(names, __builtins__={})
+        exec(compile("\n".join(lines), "<evaluation_plan>", "exec"), namespace)
+        return namespace["kernel"]
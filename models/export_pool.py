@@ -0,0 +1,100 @@
+# Exports de graphiques dans un pool de processus : l'interface reste fluide pendant le rendu
+# (grand n, SVG, PDF) et toute la librairie peut être exportée en parallèle. Comme LibraryWarmup,
+# les résultats sont relevés par un QTimer ; annuler tue les workers et supprime les fichiers partiels.
+import multiprocessing
+import os
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from canvas.plot_export import render_snapshot, export_function, export_filename, partial_path
+
+
+class ExportPool(QObject):
+    # (fichiers terminés, total)
+    progress = pyqtSignal(int, int)
+    fileExported = pyqtSignal(str)
+    # (fichier, message d'erreur)
+    exportFailed = pyqtSignal(str, str)
+    finished = pyqtSignal()
+
+    POLL_INTERVAL_MS = 50
+
+    def __init__(self, processes: int = None, parent=None):
+        super().__init__(parent)
+        self.__processes = processes or max(1, (os.cpu_count() or 2) - 1)
+        self.__pool = None
+        # (résultat asynchrone, fichier de destination)
+        self.__pending = []
+        self.__total = 0
+
+        self.__timer = QTimer(self)
+        self.__timer.setInterval(self.POLL_INTERVAL_MS)
+        self.__timer.timeout.connect(self.__poll)
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self.__pending)
+
+    def export_snapshot(self, snapshot, path: str, dpi: float = 300):
+        # le graphique affiché, figé par PlotCanvas.snapshot()
+        self.__start([(render_snapshot, (snapshot, path, dpi), path)])
+
+    def export_library(self, functions, directory: str, file_format: str, a: float, b: float, n: int,
+                       orientation: str, bg_color: str, text_color: str, dpi: float = 150):
+        jobs = []
+        for index, function_str in enumerate(functions):
+            path = export_filename(directory, index, function_str, file_format)
+            jobs.append((export_function, (function_str, path, a, b, n, orientation, bg_color, text_color, dpi),
+                         path))
+        self.__start(jobs)
+
+    def cancel(self):
+        # les workers peuvent être au milieu d'un savefig : on les tue plutôt que d'attendre
+        self.__timer.stop()
+        if self.__pending and self.__pool is not None:
+            self.__pool.terminate()
+            self.__pool = None
+            for _, path in self.__pending:
+                try:
+                    os.remove(partial_path(path))
+                except OSError:
+                    pass
+        self.__pending = []
+
+    def shutdown(self):
+        self.cancel()
+        if self.__pool is not None:
+            self.__pool.terminate()
+            self.__pool = None
+
+    def __start(self, jobs):
+        # un nouvel export remplace celui en cours
+        self.cancel()
+        if not jobs:
+            self.finished.emit()
+            return
+        if self.__pool is None:
+            self.__pool = multiprocessing.Pool(self.__processes)
+        self.__pending = [(self.__pool.apply_async(task, args), path) for task, args, path in jobs]
+        self.__total = len(jobs)
+        self.progress.emit(0, self.__total)
+        self.__timer.start()
+
+    def __poll(self):
+        still_pending = []
+        for async_result, path in self.__pending:
+            if not async_result.ready():
+                still_pending.append((async_result, path))
+                continue
+            try:
+                self.fileExported.emit(async_result.get())
+            except Exception as e:
+                self.exportFailed.emit(path, str(e))
+
+        if len(still_pending) != len(self.__pending):
+            self.__pending = still_pending
+            self.progress.emit(self.__total - len(self.__pending), self.__total)
+
+        if not self.__pending:
+            self.__timer.stop()
+            self.finished.emit()
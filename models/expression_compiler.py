@@ -0,0 +1,131 @@
+import ast
+from collections import OrderedDict
+
+import numpy as np
+
+from models.evaluation_plan import EvaluationPlan, UnsupportedExpression
+
+
+# Espace de noms construit une seule fois et partagé par toutes les fonctions compilées
+SAFE_NAMESPACE = {
+    "np": np,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "exp": np.exp,
+    "log": np.log,
+    "sqrt": np.sqrt,
+    "abs": np.abs,
+    "pi": np.pi,
+    "e": np.e,
+    "__builtins__": {}
+}
+
+
+def normalize(f_str: str) -> str:
+    # forme canonique de l'expression ("x ** 2" et "x**2" donnent la même clé)
+    # lève SyntaxError si ce n'est pas une expression python valide
+    return ast.unparse(ast.parse(f_str.strip(), mode="eval"))
+
+
+class ExpressionCompiler:
+    # Transforme une chaîne en fonction numpy réutilisable, avec un cache LRU
+
+    def __init__(self, max_size: int = 512):
+        self.__cache = OrderedDict()
+        self.__max_size = max_size
+
+    def compile(self, f_str: str):
+        key = normalize(f_str)
+
+        f = self.__cache.get(key)
+        if f is not None:
+            self.__cache.move_to_end(key)
+            return f
+
+        f = self.__build(key)
+        self.__cache[key] = f
+        if len(self.__cache) > self.__max_size:
+            self.__cache.popitem(last=False)
+        return f
+
+    def __build(self, key: str):
+        # une vraie lambda dont les globals sont SAFE_NAMESPACE : aucun dict à reconstruire par appel
+        code = compile(f"lambda x: ({key})", "<string>", "eval")
+        raw = eval(code, SAFE_NAMESPACE)
+
+        def direct(x, out=None):
+            y = raw(x)
+            if out is not None:
+                out[...] = y
+                return out
+            # une constante ("5") doit quand même donner un tableau de la taille de x
+            if np.ndim(y) == 0 and np.ndim(x) > 0:
+                return np.full(np.shape(x), y, dtype=float)
+            return y
+
+        # grandes grilles : plan fusionné (tampons d'un bloc, out=) si l'expression n'utilise que des
+        # opérateurs et des ufuncs numpy. En dessous d'un bloc les temporaires sont petits et la
+        # lambda a moins de surcoût par appel.
+        try:
+            plan = EvaluationPlan(key, SAFE_NAMESPACE)
+        except UnsupportedExpression:
+            plan = None
+
+        if plan is None:
+            f = direct
+        else:
+            def f(x, out=None):
+                if np.size(x) < plan.chunk_size:
+                    return direct(x, out)
+                return plan(x, out)
+
+        f.source = key
+        f.plan = plan
+        return f
+
+    def compile_many(self, f_strs):
+        # évalue toutes les expressions et retourne un tableau (m, len(x))
+        keys = tuple(normalize(f_str) for f_str in f_strs)
+        cache_key = ("batch",) + keys
+
+        f = self.__cache.get(cache_key)
+        if f is not None:
+            self.__cache.move_to_end(cache_key)
+            return f
+
+        # chaque ligne est écrite directement dans le tableau résultat
+        functions = [self.compile(key) for key in keys]
+
+        def f(x):
+            x = np.asarray(x, dtype=float)
+            out = np.empty((len(keys),) + x.shape, dtype=float)
+            for row, function in zip(out, functions):
+                function(x, out=row)
+            return out
+
+        f.source = keys
+        self.__cache[cache_key] = f
+        if len(self.__cache) > self.__max_size:
+            self.__cache.popitem(last=False)
+        return f
+
+    def clear(self):
+        self.__cache.clear()
+
+    def __len__(self):
+        return len(self.__cache)
+
+    def __contains__(self, f_str: str) -> bool:
+        try:
+            return normalize(f_str) in self.__cache
+        except SyntaxError:
+            return False
+
+
+# instance partagée par FunctionListModel et MainWindowModel
+compiler = ExpressionCompiler()
+
+
+def compile_function(f_str: str):
+    return compiler.compile(f_str)
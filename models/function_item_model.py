@@ -0,0 +1,72 @@
+# Modèle Qt de la librairie pour QListView et QComboBox : une ligne par fonction, mise à jour ligne
+# par ligne (ajout, suppression) au lieu d'une reconstruction complète. Le texte de la fonction est
+# le DisplayRole ; le rendu LaTeX est fait par LatexDelegate, seulement pour les lignes peintes.
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+from models.function_list_model import FunctionListModel
+from models.perf_stats import perf
+
+
+class FunctionItemModel(QAbstractListModel):
+
+    def __init__(self, functions: FunctionListModel, blank_row: bool = False, parent=None):
+        super().__init__(parent)
+        # ligne vide en tête pour le ComboBox (aucune fonction sélectionnée)
+        self.__offset = 1 if blank_row else 0
+        self.__functions = functions.functions
+
+        functions.functionInserted.connect(self.__on_inserted)
+        functions.functionRemoved.connect(self.__on_removed)
+        functions.functionsLoaded.connect(lambda: self.__on_loaded(functions))
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.__functions) + self.__offset
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole,
+                        Qt.ItemDataRole.ToolTipRole, Qt.ItemDataRole.UserRole):
+            return None
+        row = index.row() - self.__offset
+        if row < 0:
+            return "" if role != Qt.ItemDataRole.ToolTipRole else None
+        if row >= len(self.__functions):
+            return None
+        return self.__functions[row]
+
+    def function_at(self, row: int) -> str:
+        row -= self.__offset
+        if 0 <= row < len(self.__functions):
+            return self.__functions[row]
+        return ""
+
+    def row_of(self, function_str: str) -> int:
+        # -1 si absente
+        try:
+            return self.__functions.index(function_str) + self.__offset
+        except ValueError:
+            return -1
+
+    @perf.timed("FunctionItemModel.insert")
+    def __on_inserted(self, index: int, function_str: str):
+        row = index + self.__offset
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.__functions.insert(index, function_str)
+        self.endInsertRows()
+
+    @perf.timed("FunctionItemModel.remove")
+    def __on_removed(self, index: int):
+        row = index + self.__offset
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.__functions[index]
+        self.endRemoveRows()
+
+    @perf.timed("FunctionItemModel.reset")
+    def __on_loaded(self, functions: FunctionListModel):
+        # nouveau fichier : tout peut avoir changé
+        self.beginResetModel()
+        self.__functions = functions.functions
+        self.endResetModel()
@@ -1,18 +1,45 @@
-import json
 import os
 import numpy as np
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from models.expression_compiler import compile_function, normalize
+from models.antiderivative_cache import antiderivatives
+from models.batch_evaluation import LibraryEvaluator
+from models.library_store import FunctionMetadata, save_library, load_library, append_journal, journal_size
 
 
 class FunctionListModel(QObject):
 
     # signal si fonction change
     functionsChanged = pyqtSignal()
+    # changements ligne par ligne (index, fonction) / (index), émis avant functionsChanged
+    functionInserted = pyqtSignal(int, str)
+    functionRemoved = pyqtSignal(int)
+    # émis après chaque lecture du fichier JSON
+    functionsLoaded = pyqtSignal()
+
+    # sauvegarde automatique regroupée : une seule écriture pour une rafale de modifications
+    AUTOSAVE_DELAY_MS = 1000
+    # la sauvegarde automatique n'ajoute que les fonctions modifiées au journal ; le fichier est
+    # réécrit en entier quand le journal dépasse cette fraction de sa taille
+    JOURNAL_COMPACT_RATIO = 0.5
+    # au-delà, le cache du compilateur (512 entrées) oublierait les premières de toute façon
+    WARM_COMPILE_LIMIT = 256
 
     def __init__(self, json_file="functions.json"):
         super().__init__()
         self.__functions = []
         self.__json_file = json_file
+        self.__evaluator = None
+        # fonction -> FunctionMetadata (forme canonique, LaTeX, validité, primitive)
+        self.__metadata = {}
+        # fonction -> "add" / "update" / "remove" depuis la dernière écriture, dans l'ordre des ajouts
+        self.__changes = {}
+        self.__save_timer = QTimer(self)
+        self.__save_timer.setSingleShot(True)
+        self.__save_timer.setInterval(self.AUTOSAVE_DELAY_MS)
+        self.__save_timer.timeout.connect(self.__autosave)
+        self.functionsChanged.connect(self.__invalidate_evaluator)
         self.load_from_json()
 
     @property
@@ -35,38 +62,28 @@ class FunctionListModel(QObject):
             return False
 
         self.__functions.append(function_str)
+        self.__metadata[function_str] = FunctionMetadata(function_str, canonical=normalize(function_str), valid=True)
+        self.functionInserted.emit(len(self.__functions) - 1, function_str)
         self.functionsChanged.emit()
+        self.__schedule_save(function_str, "add")
         return True
 
     def remove_function(self, index: int) -> bool:
         # retire la fonction à l'index donné, true si réussi sinon false
         if 0 <= index < len(self.__functions):
-            self.__functions.pop(index)
+            function_str = self.__functions.pop(index)
+            antiderivatives.evict(function_str)
+            self.__metadata.pop(function_str, None)
+            self.functionRemoved.emit(index)
             self.functionsChanged.emit()
+            self.__schedule_save(function_str, "remove")
             return True
         return False
 
     def __validate_function(self, f_str: str) -> bool:
         # true si réussi sinon false
         try:
-            code = compile(f_str, "<string>", "eval")
-
-            def f(x):
-                safe_dict = {
-                    "x": x,
-                    "np": np,
-                    "sin": np.sin,
-                    "cos": np.cos,
-                    "tan": np.tan,
-                    "exp": np.exp,
-                    "log": np.log,
-                    "sqrt": np.sqrt,
-                    "abs": np.abs,
-                    "pi": np.pi,
-                    "e": np.e,
-                    "__builtins__": {}
-                }
-                return eval(code, safe_dict)
+            f = compile_function(f_str)
 
             # test avec plusieurs valeurs pour détecter les erreurs
             f(1.0)
@@ -75,39 +92,175 @@ class FunctionListModel(QObject):
         except Exception:
             return False
 
+    def __warm_compiler(self):
+        # compile d'avance le début de la librairie pour que la sélection dans le ComboBox ne recompile rien
+        for function_str in self.__functions[:self.WARM_COMPILE_LIMIT]:
+            if self.is_valid(function_str) is False:
+                continue
+            try:
+                compile_function(function_str)
+            except Exception:
+                pass
+
     def save_to_json(self) -> bool:
-        # Sauvegarde la liste des fonctions dans un fichier JSON en format simple: {"functions": ["x**2", "np.sin(x)", ...]}
+        # Sauvegarde atomique de la liste des fonctions et de leurs données dérivées (models/library_store.py)
+        # les primitives déjà calculées sont gardées avec chaque fonction pour les prochaines sessions
         # retourne true si sauvegarde réussi sinon false
-
+        self.__save_timer.stop()
         try:
-            data = {"functions": self.__functions}
-            with open(self.__json_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            known = antiderivatives.to_dict()
+            metadata = [self.__entry_to_save(function_str, known) for function_str in self.__functions]
+            save_library(self.__json_file, metadata)
+            self.__changes.clear()
             return True
         except Exception as e:
             print(f"Erreur lors de la sauvegarde: {e}")
             return False
 
+    def save_pending(self):
+        # écrit tout de suite une sauvegarde automatique encore en attente (fermeture de l'application)
+        if self.__save_timer.isActive():
+            self.__autosave()
+
+    def __schedule_save(self, function_str: str, op: str):
+        # une fonction ajoutée puis modifiée reste un ajout ; retirée puis rajoutée, elle repasse
+        # après les autres ajouts, comme dans la librairie
+        previous = self.__changes.get(function_str)
+        if op == "update" and previous == "add":
+            op = "add"
+        elif op == "add":
+            self.__changes.pop(function_str, None)
+        self.__changes[function_str] = op
+        self.__save_timer.start()
+
+    def __autosave(self):
+        # seulement les fonctions modifiées, ajoutées à la fin du journal ; réécriture complète quand
+        # le journal devient gros ou que presque tout a changé (préchargement d'une nouvelle librairie)
+        self.__save_timer.stop()
+        if not self.__changes:
+            return
+        try:
+            file_size = os.path.getsize(self.__json_file)
+        except OSError:
+            file_size = 0
+        if (not file_size or 2 * len(self.__changes) > len(self.__functions)
+                or journal_size(self.__json_file) > self.JOURNAL_COMPACT_RATIO * file_size):
+            self.save_to_json()
+            return
+
+        try:
+            known = antiderivatives.to_dict()
+            changes = [(op, function_str, self.__entry_to_save(function_str, known) if op != "remove" else None)
+                       for function_str, op in self.__changes.items()]
+            append_journal(self.__json_file, changes)
+            self.__changes.clear()
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde: {e}")
+
+    def __entry_to_save(self, function_str: str, known: dict) -> FunctionMetadata:
+        # les primitives déjà calculées sont gardées avec chaque fonction pour les prochaines sessions
+        entry = self.__metadata_for(function_str)
+        if entry.canonical is None:
+            try:
+                entry.canonical = normalize(function_str)
+            except SyntaxError:
+                pass
+        entry.antiderivative = known.get(entry.canonical, entry.antiderivative)
+        return entry
+
     def load_from_json(self) -> bool:
         #Charge la liste des fonctions depuis un fichier JSON, retourne true si chargement réussi, false sinon
+        # les données dérivées à jour (même hash) sont reprises telles quelles : rien n'est reparsé ni revalidé
 
         if not os.path.exists(self.__json_file):
             # fichier par défault vide
             self.__functions = []
+            self.__metadata = {}
             self.save_to_json()
             return True
 
+        # modifications en attente de l'ancien fichier : sans objet pour celui-ci
+        self.__save_timer.stop()
+        self.__changes.clear()
         try:
-            with open(self.__json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.__functions = data.get("functions", [])
+            metadata, old_antiderivatives = load_library(self.__json_file)
+            self.__functions = [entry.function_str for entry in metadata]
+            self.__metadata = {entry.function_str: entry for entry in metadata}
+            antiderivatives.load_dict(old_antiderivatives)
+            antiderivatives.load_dict({entry.canonical: entry.antiderivative for entry in metadata
+                                       if entry.canonical and entry.antiderivative})
+            self.__warm_compiler()
             self.functionsChanged.emit()
+            self.functionsLoaded.emit()
             return True
         except Exception as e:
             print(f"Erreur lors du chargement: {e}")
             self.__functions = []
+            self.__metadata = {}
             return False
 
+    def __invalidate_evaluator(self):
+        self.__evaluator = None
+
+    def evaluator(self) -> LibraryEvaluator:
+        # toutes les fonctions compilées en une seule lambda, refaite seulement si la liste change
+        if self.__evaluator is None:
+            self.__evaluator = LibraryEvaluator(self.__functions)
+        return self.__evaluator
+
+    def evaluate_all(self, x):
+        # tableau (nb fonctions, len(x)), nan pour les fonctions invalides
+        return self.evaluator().evaluate(x)
+
+    def riemann_all(self, a: float, b: float, n: int, method: str = "Gauche"):
+        return self.evaluator().riemann(a, b, n, method)
+
+    def integrate_all(self, a: float, b: float):
+        return self.evaluator().integrate(a, b)
+
+    def update_metadata(self, function_str: str, valid: bool = None, latex: str = None, antiderivative=None):
+        # résultats du préchargement fait en arrière-plan par LibraryWarmup, sauvegardés avec la librairie
+        if function_str not in self.__metadata and function_str not in self.__functions:
+            return
+        entry = self.__metadata_for(function_str)
+        if entry.canonical is None:
+            try:
+                entry.canonical = normalize(function_str)
+            except SyntaxError:
+                pass
+        if valid is not None:
+            entry.valid = bool(valid)
+        if latex is not None:
+            entry.latex = latex
+        if antiderivative is not None:
+            # (fonction, primitive, singularités), comme retourné par integrate_with_antiderivative
+            _, primitive_str, singularities = antiderivative
+            entry.antiderivative = {"primitive": primitive_str, "singularities": singularities}
+        self.__schedule_save(function_str, "update")
+
+    def metadata(self, function_str: str) -> FunctionMetadata:
+        return self.__metadata.get(function_str)
+
+    def needs_warmup(self, function_str: str) -> bool:
+        entry = self.__metadata.get(function_str)
+        return entry is None or not entry.complete
+
+    def latex(self, function_str: str):
+        # LaTeX déjà calculé pour cette fonction, ou None
+        entry = self.__metadata.get(function_str)
+        return entry.latex if entry is not None else None
+
+    def is_valid(self, function_str: str):
+        # True / False si déjà validée, None si inconnue
+        entry = self.__metadata.get(function_str)
+        return entry.valid if entry is not None else None
+
+    def __metadata_for(self, function_str: str) -> FunctionMetadata:
+        entry = self.__metadata.get(function_str)
+        if entry is None:
+            entry = self.__metadata[function_str] = FunctionMetadata(function_str)
+        return entry
+
     def get_function(self, index: int) -> str:
         # retourne la fonction à la position demandée
         if 0 <= index < len(self.__functions):
@@ -0,0 +1,129 @@
+# Calcul de l'intégrale exacte (sympy) dans un processus séparé pour ne jamais bloquer l'interface.
+# La tâche est configurable (forme fermée des sommes de Riemann) : elle reçoit les arguments de submit
+# et retourne un couple (valeur, données associées).
+import multiprocessing
+import queue
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from models.symbolic import integrate_with_antiderivative
+
+
+def _worker_loop(requests, results, task):
+    # boucle du processus : un job à la fois, résultat renvoyé avec son identifiant
+    while True:
+        job = requests.get()
+        if job is None:
+            break
+        job_id, args = job
+        try:
+            value, antiderivative = task(*args)
+            results.put((job_id, value, antiderivative, None))
+        except Exception as e:
+            results.put((job_id, None, None, str(e)))
+
+
+class IntegrationWorker(QObject):
+    # job_id, valeur (None si sympy échoue), (fonction, primitive, singularités) ou None
+    resultReady = pyqtSignal(int, object, object)
+    # job_id
+    timedOut = pyqtSignal(int)
+
+    POLL_INTERVAL_MS = 30
+
+    def __init__(self, timeout: float = 10.0, parent=None, task=integrate_with_antiderivative):
+        super().__init__(parent)
+        self.__timeout = timeout
+        # fonction de niveau module (elle est transmise au processus)
+        self.__task = task
+        self.__process = None
+        self.__requests = None
+        self.__results = None
+        self.__next_id = 0
+        self.__pending_id = None
+        self.__started_at = 0.0
+
+        self.__timer = QTimer(self)
+        self.__timer.setInterval(self.POLL_INTERVAL_MS)
+        self.__timer.timeout.connect(self.__poll)
+
+    @property
+    def timeout(self):
+        return self.__timeout
+
+    @timeout.setter
+    def timeout(self, val):
+        self.__timeout = float(val)
+
+    @property
+    def is_pending(self) -> bool:
+        return self.__pending_id is not None
+
+    def submit(self, *args) -> int:
+        # un seul calcul à la fois : le précédent est abandonné
+        self.cancel()
+        self.__ensure_process()
+
+        self.__next_id += 1
+        self.__pending_id = self.__next_id
+        self.__started_at = time.monotonic()
+        self.__requests.put((self.__pending_id, args))
+        self.__timer.start()
+        return self.__pending_id
+
+    def cancel(self):
+        # le processus est occupé par le job annulé : on le tue, il sera relancé au prochain submit
+        if self.__pending_id is None:
+            return
+        self.__pending_id = None
+        self.__timer.stop()
+        self.__kill_process()
+
+    def shutdown(self):
+        self.__pending_id = None
+        self.__timer.stop()
+        if self.__process is not None and self.__process.is_alive():
+            self.__requests.put(None)
+            self.__process.join(0.5)
+        self.__kill_process()
+
+    def __ensure_process(self):
+        if self.__process is not None and self.__process.is_alive():
+            return
+        self.__requests = multiprocessing.Queue()
+        self.__results = multiprocessing.Queue()
+        self.__process = multiprocessing.Process(target=_worker_loop,
+                                                 args=(self.__requests, self.__results, self.__task),
+                                                 daemon=True)
+        self.__process.start()
+
+    def __kill_process(self):
+        if self.__process is not None:
+            if self.__process.is_alive():
+                self.__process.terminate()
+            self.__process.join(0.5)
+        self.__process = None
+        self.__requests = None
+        self.__results = None
+
+    def __poll(self):
+        if self.__pending_id is None:
+            self.__timer.stop()
+            return
+
+        try:
+            job_id, value, antiderivative, _error = self.__results.get_nowait()
+        except queue.Empty:
+            if time.monotonic() - self.__started_at > self.__timeout:
+                job_id = self.__pending_id
+                self.cancel()
+                self.timedOut.emit(job_id)
+            return
+
+        if job_id != self.__pending_id:
+            return
+
+        self.__pending_id = None
+        self.__timer.stop()
+        self.resultReady.emit(job_id, value, antiderivative)
@@ -0,0 +1,158 @@
+# Persistance de la librairie de fonctions :
+#   - écriture atomique : fichier temporaire dans le même dossier puis os.replace, un crash pendant
+#     la sauvegarde laisse l'ancien fichier intact (les permissions du fichier sont conservées)
+#   - sauvegarde incrémentale : les modifications sont ajoutées à un journal (une ligne JSON par
+#     fonction ajoutée, modifiée ou retirée) rejoué à la lecture ; save_library réécrit tout et
+#     vide le journal. Une ligne tronquée par un crash est ignorée.
+#   - chaque fonction garde ses données dérivées (forme canonique, LaTeX, validité, primitive) ;
+#     elles ne sont reprises que si le hash du texte correspond, sinon elles sont recalculées
+#
+# Format : {"version": 2, "functions": [{"function": "x**2", "hash": ..., "canonical": ..., ...}]}
+# L'ancien format {"functions": ["x**2", ...], "antiderivatives": {...}} se lit toujours.
+import hashlib
+import json
+import os
+import stat
+import tempfile
+
+FORMAT_VERSION = 2
+
+
+def content_hash(function_str: str) -> str:
+    # la version du format fait partie du hash : changer ce qui est dérivé invalide tout le cache
+    return hashlib.sha1(f"{FORMAT_VERSION}:{function_str}".encode("utf-8")).hexdigest()[:16]
+
+
+class FunctionMetadata:
+    # données dérivées d'une fonction ; None = pas encore calculé
+    def __init__(self, function_str: str, canonical: str = None, latex: str = None, valid: bool = None,
+                 antiderivative: dict = None):
+        self.function_str = function_str
+        self.hash = content_hash(function_str)
+        self.canonical = canonical
+        self.latex = latex
+        self.valid = valid
+        # {"primitive": ..., "singularities": ...}, gardée ici même quand le cache LRU l'a oubliée
+        self.antiderivative = antiderivative
+
+    @property
+    def complete(self) -> bool:
+        # le préchargement n'a plus rien à apprendre sur cette fonction
+        return self.valid is not None and self.latex is not None
+
+    def to_dict(self) -> dict:
+        return {"function": self.function_str, "hash": self.hash, "canonical": self.canonical,
+                "latex": self.latex, "valid": self.valid, "antiderivative": self.antiderivative}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        # entrée sans hash ou au hash périmé : seul le texte de la fonction est gardé
+        function_str = data["function"]
+        metadata = cls(function_str)
+        if data.get("hash") != metadata.hash:
+            return metadata
+        metadata.canonical = data.get("canonical")
+        metadata.latex = data.get("latex")
+        metadata.valid = data.get("valid")
+        metadata.antiderivative = data.get("antiderivative")
+        return metadata
+
+
+def atomic_write_json(path: str, data, indent=None):
+    # sans indentation json passe par son encodeur C, plus rapide sur une grande librairie
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        # mkstemp crée le fichier en 0600 : on reprend les droits de l'ancien fichier (ou ceux du umask)
+        os.chmod(tmp_path, _file_mode(path))
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _file_mode(path: str) -> int:
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def journal_path(path: str) -> str:
+    return path + ".journal"
+
+
+def save_library(path: str, metadata):
+    # metadata : liste de FunctionMetadata, dans l'ordre de la librairie ; le journal est alors inutile
+    atomic_write_json(path, {"version": FORMAT_VERSION, "functions": [entry.to_dict() for entry in metadata]})
+    try:
+        os.remove(journal_path(path))
+    except FileNotFoundError:
+        pass
+
+
+def append_journal(path: str, changes):
+    # changes : (op, fonction, FunctionMetadata ou None) avec op "add" (en fin de librairie),
+    # "update" (la fonction garde sa place) ou "remove"
+    lines = []
+    for op, function_str, entry in changes:
+        if op == "remove":
+            lines.append(json.dumps({"op": op, "function": function_str}, ensure_ascii=False))
+        else:
+            lines.append(json.dumps({"op": op, "entry": entry.to_dict()}, ensure_ascii=False))
+    with open(journal_path(path), "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def journal_size(path: str) -> int:
+    try:
+        return os.path.getsize(journal_path(path))
+    except OSError:
+        return 0
+
+
+def load_library(path: str):
+    # liste de FunctionMetadata, et les primitives de l'ancien format (clés déjà normalisées)
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    entries = {}
+    for item in data.get("functions", []):
+        entry = FunctionMetadata(item) if isinstance(item, str) else FunctionMetadata.from_dict(item)
+        entries[entry.function_str] = entry
+    _replay_journal(path, entries)
+    return list(entries.values()), data.get("antiderivatives", {})
+
+
+def _replay_journal(path: str, entries: dict):
+    # entries : fonction -> FunctionMetadata, dans l'ordre de la librairie (modifié sur place).
+    # Rejouer un journal déjà intégré au fichier ne change rien (crash entre os.replace et sa suppression)
+    try:
+        f = open(journal_path(path), "r", encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                if record["op"] == "remove":
+                    entries.pop(record["function"], None)
+                else:
+                    entry = FunctionMetadata.from_dict(record["entry"])
+                    if record["op"] == "add":
+                        entries.pop(entry.function_str, None)
+                    entries[entry.function_str] = entry
+            except (ValueError, KeyError, TypeError):
+                # dernière ligne tronquée par un crash
+                continue
@@ -0,0 +1,173 @@
+# Préchargement de la librairie après son chargement : chaque fonction est validée, sa formule rendue
+# en PNG, sa primitive et son intégrale aux bornes par défaut calculées dans un pool de processus.
+# Les résultats reviennent un par un par entryReady, les sélections suivantes sont instantanées.
+# Une tâche bloquée (sympy sans fin) est abandonnée après `timeout` secondes, comme dans IntegrationWorker.
+import multiprocessing
+import os
+import time
+
+import numpy as np
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from models.expression_compiler import compile_function
+from models.quadrature import gauss_kronrod
+from models.symbolic import integrate_with_antiderivative
+
+
+def warmup_entry(function_str: str, a: float, b: float, renders, symbolic: bool = True):
+    # renders : liste de (couleur, taille de police, device pixel ratio) à rendre
+    # symbolic=False : pas d'intégration sympy (relance après un dépassement du délai)
+    entry = {"function": function_str, "valid": False, "latex": None, "pngs": [], "antiderivative": None,
+             "a": a, "b": b, "integrale": None, "methode": None, "erreur": None, "timed_out": False}
+    try:
+        f = compile_function(function_str)
+        f(1.0)
+        f(np.array([1.0, 2.0, 3.0]))
+    except Exception:
+        return entry
+    entry["valid"] = True
+
+    # le LaTeX est gardé dans le fichier de la librairie, les rendus suivants ne repassent pas par sympy
+    from styles.latex_png import function_to_latex, render_latex_png
+    latex = entry["latex"] = function_to_latex(function_str)
+    if renders:
+        for color, fontsize, dpr in renders:
+            try:
+                entry["pngs"].append((color, fontsize, dpr, render_latex_png(latex, color, fontsize, dpi=100 * dpr)))
+            except Exception:
+                pass
+
+    if symbolic:
+        try:
+            value, antiderivative = integrate_with_antiderivative(function_str, a, b)
+            entry.update(integrale=value, methode="symbolique", erreur=0.0, antiderivative=antiderivative)
+            return entry
+        except Exception:
+            pass
+    result = gauss_kronrod(f, a, b)
+    if result.converged:
+        entry.update(integrale=result.value, methode="numérique", erreur=result.error)
+    return entry
+
+
+def timed_out_entry(function_str: str, a: float, b: float):
+    # délai dépassé ou worker en erreur : rien n'est connu, la fonction sera reprise au prochain chargement
+    return {"function": function_str, "valid": None, "latex": None, "pngs": [], "antiderivative": None,
+            "a": a, "b": b, "integrale": None, "methode": None, "erreur": None, "timed_out": True}
+
+
+class LibraryWarmup(QObject):
+    # un dict par fonction (voir warmup_entry)
+    entryReady = pyqtSignal(dict)
+    finished = pyqtSignal()
+
+    POLL_INTERVAL_MS = 50
+
+    def __init__(self, processes: int = None, timeout: float = 10.0, parent=None):
+        super().__init__(parent)
+        self.__processes = processes or max(1, (os.cpu_count() or 2) - 1)
+        self.__timeout = timeout
+        self.__pool = None
+        # tâches non terminées, dans l'ordre de soumission : [résultat asynchrone, fonction, symbolic, début]
+        self.__pending = []
+        self.__args = None
+
+        self.__timer = QTimer(self)
+        self.__timer.setInterval(self.POLL_INTERVAL_MS)
+        self.__timer.timeout.connect(self.__poll)
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self.__pending)
+
+    @property
+    def timeout(self):
+        return self.__timeout
+
+    @timeout.setter
+    def timeout(self, val):
+        self.__timeout = float(val)
+
+    def start(self, functions, a: float, b: float, renders=()):
+        # un nouveau chargement remplace le précédent
+        self.cancel()
+        if not functions:
+            return
+        self.__args = (a, b, list(renders))
+        self.__submit([(function_str, True) for function_str in functions])
+        self.__timer.start()
+
+    def cancel(self):
+        # les workers peuvent être bloqués dans sympy : on les tue plutôt que d'attendre
+        self.__timer.stop()
+        if self.__pending and self.__pool is not None:
+            self.__pool.terminate()
+            self.__pool = None
+        self.__pending = []
+
+    def shutdown(self):
+        self.cancel()
+        if self.__pool is not None:
+            self.__pool.terminate()
+            self.__pool = None
+
+    def __submit(self, tasks):
+        # tasks : liste de (fonction, symbolic)
+        if self.__pool is None:
+            self.__pool = multiprocessing.Pool(self.__processes)
+        a, b, renders = self.__args
+        self.__pending = [[self.__pool.apply_async(warmup_entry, (function_str, a, b, renders, symbolic)),
+                           function_str, symbolic, None]
+                          for function_str, symbolic in tasks]
+
+    def __poll(self):
+        still_pending = []
+        for task in self.__pending:
+            async_result = task[0]
+            if not async_result.ready():
+                still_pending.append(task)
+                continue
+            try:
+                entry = async_result.get()
+            except Exception as e:
+                # même notification qu'un dépassement de délai : la fonction reste inconnue
+                print(f"Erreur lors du préchargement de {task[1]}: {e}")
+                a, b, _ = self.__args
+                entry = timed_out_entry(task[1], a, b)
+            self.entryReady.emit(entry)
+        self.__pending = still_pending
+
+        # le pool prend les tâches dans l'ordre : les `processes` plus anciennes sont celles en cours,
+        # leur délai court à partir du moment où on les voit démarrer
+        now = time.monotonic()
+        expired = []
+        for task in self.__pending[:self.__processes]:
+            if task[3] is None:
+                task[3] = now
+            elif now - task[3] > self.__timeout:
+                expired.append(task)
+        if expired:
+            self.__restart(expired)
+
+        if not self.__pending:
+            self.__timer.stop()
+            self.finished.emit()
+
+    def __restart(self, expired):
+        # un worker bloqué ne peut pas être interrompu seul : on relance le pool et on resoumet le reste.
+        # Une tâche expirée est reprise sans sympy, puis abandonnée si elle bloque encore
+        self.__pool.terminate()
+        self.__pool = None
+        a, b, _ = self.__args
+        tasks = []
+        for task in self.__pending:
+            _, function_str, symbolic, _ = task
+            if task in expired:
+                if not symbolic:
+                    self.entryReady.emit(timed_out_entry(function_str, a, b))
+                    continue
+                symbolic = False
+            tasks.append((function_str, symbolic))
+        self.__pending = []
+        if tasks:
+            self.__submit(tasks)
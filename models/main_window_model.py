@@ -1,23 +1,80 @@
-import sympy as sp
+from collections import OrderedDict
+from contextlib import contextmanager
+
 from PyQt6.QtCore import pyqtSignal, QObject
-import numpy as np
+
+from models.expression_compiler import compile_function
+from models.integration_worker import IntegrationWorker
+from models.symbolic import integrate_with_antiderivative
+from models.antiderivative_cache import antiderivatives
+from models.quadrature import effective_n, integrate, gauss_kronrod
+from models.convergence import convergence_study, NESTED_METHODS
+from models.perf_stats import perf
+from models.symbolic_riemann import derive_left_sum, riemann_formulas
+from models.precision import (PRECISIONS, DEFAULT_PRECISION, numpy_dtype, mp_riemann, mp_integrate,
+                              is_real_finite)
 
 
 class MainWindowModel(QObject):
     modelChanged = pyqtSignal()
+    # émis quand le calcul exact en arrière-plan se termine (réussi, échoué ou expiré)
+    integraleChanged = pyqtSignal()
+    # émis quand une étude de convergence est terminée
+    convergenceChanged = pyqtSignal()
 
     def __init__(self):
         super().__init__()
         self.__function_str = ""
         self.__function = None
-        self.__x = sp.Symbol("x")
         self.__borne_inf = 0.0
         self.__borne_sup = 1.0
         self.__nb_rectangles = 0
         self.__orientation = "Gauche"
         self.__rectangles_active = False
         self.__valeur_riemann = None
+        self.__erreur_riemann = None
+        self.__evaluations_riemann = 0
+        self.__riemann_forme_fermee = False
         self.__valeur_integrale = None
+        self.__integrale_status = None
+        self.__integrale_methode = None
+        self.__erreur_integrale = None
+        self.__tolerance = 1e-10
+        self.__precision = DEFAULT_PRECISION
+        self.__mp_dps = 30
+        self.__convergence = None
+        # intégrales déjà connues (préchargement) : (fonction, a, b) -> (valeur, méthode, erreur)
+        self.__integrales_connues = OrderedDict()
+        self.__batch_depth = 0
+        self.__batch_dirty = False
+
+        self.__worker = IntegrationWorker(parent=self)
+        self.__worker.resultReady.connect(self.__on_integrale_ready)
+        self.__worker.timedOut.connect(self.__on_integrale_timed_out)
+
+        # forme fermée des sommes de Riemann : cherchée une fois par fonction, en arrière-plan
+        self.__riemann_worker = IntegrationWorker(timeout=30.0, parent=self, task=derive_left_sum)
+        self.__riemann_worker.resultReady.connect(self.__on_formule_riemann_ready)
+        self.__riemann_worker.timedOut.connect(self.__on_formule_riemann_timed_out)
+        self.__formule_en_cours = None
+
+    @contextmanager
+    def batch_update(self):
+        # regroupe plusieurs modifications : modelChanged n'est émis qu'une fois à la fin
+        self.__batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.__batch_depth -= 1
+            if self.__batch_depth == 0 and self.__batch_dirty:
+                self.__batch_dirty = False
+                self.modelChanged.emit()
+
+    def __notify_changed(self):
+        if self.__batch_depth > 0:
+            self.__batch_dirty = True
+        else:
+            self.modelChanged.emit()
 
     @property
     def function_str(self):
@@ -34,7 +91,9 @@ class MainWindowModel(QObject):
     @function.setter
     def function(self, f):
         self.__function = f
-        self.modelChanged.emit()
+        self.annuler_integrale()
+        self.__demander_formule_riemann()
+        self.__notify_changed()
 
     @property
     def borne_inf(self):
@@ -43,7 +102,8 @@ class MainWindowModel(QObject):
     @borne_inf.setter
     def borne_inf(self, val):
         self.__borne_inf = float(val)
-        self.modelChanged.emit()
+        self.annuler_integrale()
+        self.__notify_changed()
 
     @property
     def borne_sup(self):
@@ -52,7 +112,8 @@ class MainWindowModel(QObject):
     @borne_sup.setter
     def borne_sup(self, val):
         self.__borne_sup = float(val)
-        self.modelChanged.emit()
+        self.annuler_integrale()
+        self.__notify_changed()
 
     @property
     def nb_rectangles(self):
@@ -61,7 +122,7 @@ class MainWindowModel(QObject):
     @nb_rectangles.setter
     def nb_rectangles(self, val):
         self.__nb_rectangles = max(1, int(val))
-        self.modelChanged.emit()
+        self.__notify_changed()
 
     @property
     def orientation(self):
@@ -70,7 +131,7 @@ class MainWindowModel(QObject):
     @orientation.setter
     def orientation(self, val):
         self.__orientation = val
-        self.modelChanged.emit()
+        self.__notify_changed()
 
     @property
     def rectangles_active(self):
@@ -79,38 +140,101 @@ class MainWindowModel(QObject):
     @rectangles_active.setter
     def rectangles_active(self, val):
         self.__rectangles_active = val
-        self.modelChanged.emit()
+        self.__notify_changed()
+
+    @property
+    def precision(self):
+        # "float32", "float64" ou "mpmath" (voir models.precision)
+        return self.__precision
+
+    @precision.setter
+    def precision(self, val):
+        if val not in PRECISIONS:
+            raise ValueError(f"Précision inconnue : {val}")
+        self.__precision = val
+        self.__notify_changed()
+
+    @property
+    def mp_dps(self):
+        # chiffres significatifs du mode mpmath
+        return self.__mp_dps
+
+    @mp_dps.setter
+    def mp_dps(self, val):
+        self.__mp_dps = max(15, int(val))
+        self.__notify_changed()
 
     @property
     def valeur_riemann(self):
         return self.__valeur_riemann
 
+    @property
+    def erreur_riemann(self):
+        # estimation de l'erreur de la méthode choisie dans orientation
+        return self.__erreur_riemann
+
+    @property
+    def evaluations_riemann(self):
+        return self.__evaluations_riemann
+
+    @property
+    def n_effectif(self):
+        # nombre d'intervalles réellement utilisé (arrondi au-dessus pour les trapèzes et Simpson)
+        return effective_n(self.orientation, self.nb_rectangles)
+
+    @property
+    def riemann_forme_fermee(self):
+        # True si la dernière somme vient de la formule symbolique (aucun point de la grille évalué)
+        return self.__riemann_forme_fermee
+
     @property
     def valeur_integrale(self):
         return self.__valeur_integrale
 
+    @property
+    def integrale_status(self):
+        # None, "pending", "ok", "failed" ou "timeout"
+        return self.__integrale_status
+
+    @property
+    def integrale_methode(self):
+        # "symbolique" (sympy) ou "numérique" (Gauss-Kronrod adaptatif) selon le chemin qui a réussi
+        return self.__integrale_methode
+
+    @property
+    def erreur_integrale(self):
+        # estimation de l'erreur du chemin numérique, 0 pour le chemin symbolique
+        return self.__erreur_integrale
+
+    @property
+    def tolerance(self):
+        return self.__tolerance
+
+    @tolerance.setter
+    def tolerance(self, val):
+        self.__tolerance = float(val)
+
+    @property
+    def convergence(self):
+        # dernier ConvergenceResult calculé, ou None
+        return self.__convergence
+
+    @property
+    def integrale_pending(self):
+        return self.__integrale_status == "pending"
+
+    @property
+    def integration_timeout(self):
+        return self.__worker.timeout
+
+    @integration_timeout.setter
+    def integration_timeout(self, val):
+        self.__worker.timeout = val
+
     # Methode de validation de la fonction, avec l'aide de chatGPT pour certains elements
     def validate_function(self, f_str: str):
         try:
-            code = compile(f_str, "<string>", "eval")
-
-            def f(x):
-                safe_dict = {
-                    "x": x,
-                    "np": np,
-                    "sin": np.sin,
-                    "cos": np.cos,
-                    "tan": np.tan,
-                    "exp": np.exp,
-                    "log": np.log,
-                    "sqrt": np.sqrt,
-                    "abs": np.abs,
-                    "pi": np.pi,
-                    "e": np.e,
-                    "__builtins__": {}
-                }
-                return eval(code, safe_dict)
-
+            f = compile_function(f_str)
             f(1)
             self.function_str = f_str
             self.function = f
@@ -135,33 +259,205 @@ class MainWindowModel(QObject):
         if not self.function:
             return None
 
-        a, b = self.borne_inf, self.borne_sup
-        n = self.nb_rectangles
-        dx = (b - a) / n
-
-        if self.orientation == "Droite":
-            x_points = np.linspace(a + dx, b, n)
-        else:
-            x_points = np.linspace(a, b - dx, n)
-
-        y_points = self.function(x_points)
-        self.__valeur_riemann = np.sum(y_points) * dx
+        # orientation : "Gauche", "Droite" ou une des autres méthodes de models.quadrature
+        # formule en n si sympy en a trouvé une pour cette fonction, sinon sommation numérique
+        # (en mpmath si n le permet, sinon en float64). En float32 la forme fermée est ignorée :
+        # la somme affichée doit avoir la précision choisie, pas celle de la formule
+        dps = self.__mp_dps if self.__precision == "mpmath" else None
+        result = None
+        if self.function_str and self.__precision != "float32":
+            result = riemann_formulas.integrate(self.orientation, self.function_str, self.function,
+                                                self.borne_inf, self.borne_sup, self.nb_rectangles, dps)
+        self.__riemann_forme_fermee = result is not None
+        if result is None and dps and self.function_str:
+            result = mp_riemann(self.orientation, self.function_str, self.borne_inf, self.borne_sup,
+                                self.nb_rectangles, dps)
+        if result is None:
+            result = integrate(self.orientation, self.function, self.borne_inf, self.borne_sup, self.nb_rectangles,
+                               dtype=numpy_dtype(self.__precision))
+        self.__valeur_riemann = result.value
+        self.__erreur_riemann = result.error
+        self.__evaluations_riemann = result.evaluations
         return self.__valeur_riemann
 
+    @perf.timed("MainWindowModel.calculer_integrale")
     def calculer_integrale(self):
+        # version synchrone, bloque jusqu'au résultat de sympy
         if not self.function_str:
             return None
         try:
-            f_sympy = sp.sympify(self.function_str)
-            integrale_definie = sp.integrate(f_sympy, (self.__x, self.borne_inf, self.borne_sup))
-            self.__valeur_integrale = float(integrale_definie.evalf())
+            value = antiderivatives.definite(self.function_str, self.borne_inf, self.borne_sup, self.__dps())
+            if value is None:
+                value, antiderivative = integrate_with_antiderivative(self.function_str,
+                                                                      self.borne_inf, self.borne_sup)
+                if antiderivative is not None:
+                    antiderivatives.put(*antiderivative)
+                    value = self.__reevaluer_primitive(value)
+            self.__set_integrale_symbolique(value)
             return self.__valeur_integrale
         except Exception:
-            self.__valeur_integrale = None
+            self.__integrale_numerique("failed")
+            return self.__valeur_integrale
+
+    def calculer_integrale_async(self):
+        # lance sympy en arrière-plan, le résultat arrive par integraleChanged
+        self.__valeur_integrale = None
+        self.__integrale_methode = None
+        self.__erreur_integrale = None
+        if not self.function_str:
+            self.__integrale_status = None
+            return
+
+        # les valeurs préchargées sont en float64 : pas assez précises pour le mode mpmath
+        known = None
+        if self.__precision != "mpmath":
+            known = self.__integrales_connues.get((self.function_str, self.borne_inf, self.borne_sup))
+        if known is not None:
+            self.__valeur_integrale, self.__integrale_methode, self.__erreur_integrale = known
+            self.__integrale_status = "ok"
+            self.integraleChanged.emit()
+            return
+
+        # primitive déjà connue : deux évaluations suffisent, pas besoin du worker
+        value = antiderivatives.definite(self.function_str, self.borne_inf, self.borne_sup, self.__dps())
+        if value is not None:
+            self.__set_integrale_symbolique(value)
+            self.integraleChanged.emit()
+            return
+
+        self.__integrale_status = "pending"
+        self.__worker.submit(self.function_str, self.borne_inf, self.borne_sup)
+
+    def memoriser_integrale(self, function_str: str, a: float, b: float, value: float, methode: str,
+                            erreur: float = 0.0, max_size: int = 1024):
+        self.__integrales_connues[(function_str, float(a), float(b))] = (value, methode, erreur)
+        if len(self.__integrales_connues) > max_size:
+            self.__integrales_connues.popitem(last=False)
+
+    def shutdown(self):
+        # arrête les processus de sympy (intégrale exacte et forme fermée des sommes)
+        self.__worker.shutdown()
+        self.__riemann_worker.shutdown()
+        self.__formule_en_cours = None
+
+    def annuler_integrale(self):
+        # fonction ou bornes changées : le calcul en cours et le résultat précédent ne valent plus
+        # (l'étude de convergence s'en servirait comme valeur exacte)
+        if self.__integrale_status is None:
+            return
+        if self.__integrale_status == "pending":
+            self.__worker.cancel()
+        self.__integrale_status = None
+        self.__valeur_integrale = None
+        self.__integrale_methode = None
+        self.__erreur_integrale = None
+        self.integraleChanged.emit()
+
+    def __on_integrale_ready(self, job_id, value, antiderivative):
+        if antiderivative is not None:
+            antiderivatives.put(*antiderivative)
+        if value is not None:
+            self.__set_integrale_symbolique(self.__reevaluer_primitive(value))
+        else:
+            # sympy n'y arrive pas (par exemple une fonction écrite avec np.)
+            self.__integrale_numerique("failed")
+        self.integraleChanged.emit()
+
+    def __on_integrale_timed_out(self, job_id):
+        self.__integrale_numerique("timeout")
+        self.integraleChanged.emit()
+
+    def __demander_formule_riemann(self):
+        function_str = self.function_str
+        if not function_str or function_str in riemann_formulas or function_str == self.__formule_en_cours:
+            return
+        self.__formule_en_cours = function_str
+        self.__riemann_worker.submit(function_str)
+
+    def __on_formule_riemann_ready(self, job_id, formula_str, singularities):
+        riemann_formulas.put(self.__formule_en_cours, formula_str, singularities)
+        self.__formule_en_cours = None
+
+    def __on_formule_riemann_timed_out(self, job_id):
+        # pas de forme fermée dans le temps imparti : on ne réessaie pas pour cette fonction
+        riemann_formulas.put(self.__formule_en_cours, None, None)
+        self.__formule_en_cours = None
+
+    def __dps(self):
+        return self.__mp_dps if self.__precision == "mpmath" else None
+
+    def __reevaluer_primitive(self, value):
+        # le worker renvoie un float ; en mode mpmath la primitive tout juste mise en cache
+        # est réévaluée avec mp_dps chiffres
+        if self.__precision != "mpmath":
+            return value
+        precise = antiderivatives.definite(self.function_str, self.borne_inf, self.borne_sup, self.__mp_dps)
+        return value if precise is None else precise
+
+    def __set_integrale_symbolique(self, value):
+        self.__valeur_integrale = value
+        self.__erreur_integrale = 0.0
+        self.__integrale_methode = "symbolique"
+        self.__integrale_status = "ok"
+
+    def __integrale_numerique(self, status_if_fail):
+        # Gauss-Kronrod adaptatif directement sur la fonction numpy compilée
+        self.__valeur_integrale = None
+        self.__erreur_integrale = None
+        self.__integrale_methode = None
+        self.__integrale_status = status_if_fail
+        if not self.function:
+            return
+
+        if self.__precision == "mpmath" and self.__integrale_mpmath():
+            return
+
+        try:
+            result = gauss_kronrod(self.function, self.borne_inf, self.borne_sup, self.__tolerance)
+        except Exception:
+            return
+        if not result.converged:
+            return
+
+        self.__valeur_integrale = result.value
+        self.__erreur_integrale = result.error
+        self.__integrale_methode = "numérique"
+        self.__integrale_status = "ok"
+
+    def __integrale_mpmath(self) -> bool:
+        # tanh-sinh de mpmath ; rejeté comme Gauss-Kronrod si l'erreur estimée reste trop grande
+        try:
+            result = mp_integrate(self.function_str, self.borne_inf, self.borne_sup, self.__mp_dps)
+        except Exception:
+            return False
+        if result is None:
+            return False
+        value, error = result
+        if not is_real_finite(error) or error > max(self.__tolerance, self.__tolerance * abs(value)) * 1e3:
+            return False
+        self.__valeur_integrale = value
+        self.__erreur_integrale = error
+        self.__integrale_methode = "numérique"
+        self.__integrale_status = "ok"
+        return True
+
+    def calculer_convergence(self, n0: int = 4, levels: int = 10):
+        # sommes pour n0, 2*n0, ..., 2^levels*n0 avec la méthode courante, en réutilisant les points
+        if not self.is_valid_for_calculation() or self.orientation not in NESTED_METHODS:
+            self.__convergence = None
+            self.convergenceChanged.emit()
             return None
 
+        reference = float(self.__valeur_integrale) if self.__integrale_status == "ok" else None
+        self.__convergence = convergence_study(self.function, self.borne_inf, self.borne_sup,
+                                               self.orientation, n0, levels, reference)
+        self.convergenceChanged.emit()
+        return self.__convergence
+
+    @perf.timed("MainWindowModel.calculer")
     def calculer(self):
+        # la somme de Riemann est immédiate, l'intégrale exacte suit via integraleChanged
         self.calculer_somme_riemann()
-        self.calculer_integrale()
-        self.modelChanged.emit()
+        self.calculer_integrale_async()
+        self.__notify_changed()
         return self.__valeur_riemann, self.__valeur_integrale
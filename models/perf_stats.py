@@ -0,0 +1,132 @@
+# Instrumentation légère : nombre d'appels et histogramme des latences des opérations coûteuses
+# (calculs, sympy, dessin matplotlib, rendu LaTeX). Désactivée, un appel décoré ne coûte qu'un test.
+# Sans Qt : utilisable aussi par le mode ligne de commande et le banc d'essai.
+import bisect
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import time
+from collections import deque
+
+# bornes supérieures des classes de l'histogramme, en millisecondes (la dernière classe est ouverte)
+BUCKETS_MS = (0.1, 0.3, 1, 3, 10, 30, 100, 300, 1000, 3000)
+
+
+class OperationStats:
+    # les percentiles viennent des derniers échantillons, l'histogramme couvre tous les appels
+    def __init__(self, samples: int = 1000):
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+        self.histogram = [0] * (len(BUCKETS_MS) + 1)
+        self.__recent = deque(maxlen=samples)
+
+    def add(self, ms: float):
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+        self.max_ms = ms if self.max_ms is None else max(self.max_ms, ms)
+        self.histogram[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.__recent.append(ms)
+
+    def percentile(self, q: float):
+        if not self.__recent:
+            return None
+        ordered = sorted(self.__recent)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "mean_ms": self.total_ms / self.count if self.count else None,
+            "min_ms": self.min_ms,
+            "max_ms": self.max_ms,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "histogram": dict(zip([f"<={edge}" for edge in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"],
+                                  self.histogram)),
+        }
+
+
+class PerfStats:
+    def __init__(self, enabled: bool = False):
+        self.__enabled = enabled
+        self.__operations = {}
+        self.__profiler = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+    @enabled.setter
+    def enabled(self, val):
+        self.__enabled = bool(val)
+
+    @property
+    def profiling(self) -> bool:
+        return self.__profiler is not None
+
+    def record(self, name: str, ms: float):
+        operation = self.__operations.get(name)
+        if operation is None:
+            operation = self.__operations[name] = OperationStats()
+        operation.add(ms)
+
+    def timed(self, name: str):
+        # décorateur : @perf.timed("PlotCanvas.dessiner")
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.__enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(name, (time.perf_counter() - start) * 1000)
+            return wrapper
+        return decorator
+
+    def operations(self):
+        return sorted(self.__operations)
+
+    def stats(self, name: str) -> OperationStats:
+        return self.__operations.get(name)
+
+    def snapshot(self) -> dict:
+        return {name: self.__operations[name].as_dict() for name in self.operations()}
+
+    def reset(self):
+        self.__operations.clear()
+
+    def export_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"buckets_ms": list(BUCKETS_MS), "operations": self.snapshot()}, f, indent=2)
+
+    # capture cProfile d'une interaction : start_profile(), on clique, stop_profile()
+    def start_profile(self):
+        if self.__profiler is not None:
+            return
+        self.__profiler = cProfile.Profile()
+        self.__profiler.enable()
+
+    def stop_profile(self, dump_path: str = None, limit: int = 30) -> str:
+        # retourne le résumé trié par temps cumulé ; dump_path garde le profil complet (.prof)
+        if self.__profiler is None:
+            return ""
+        profiler, self.__profiler = self.__profiler, None
+        profiler.disable()
+        if dump_path:
+            profiler.dump_stats(dump_path)
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+
+# instance partagée par les modèles et les vues instrumentés ; TP2_PERF_STATS=1 l'active dès le lancement
+perf = PerfStats(enabled=os.environ.get("TP2_PERF_STATS") == "1")
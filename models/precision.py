@@ -0,0 +1,136 @@
+# Modes de précision du calcul :
+#   "float32" : aperçu rapide, la grille et f sont évaluées en simple précision (sommes accumulées en float64)
+#   "float64" : le calcul numpy habituel
+#   "mpmath"  : précision arbitraire pour la somme de Riemann et l'intégrale (mp.dps chiffres)
+# mpmath n'est importé que lorsque ce mode est utilisé.
+import ast
+import math
+from types import SimpleNamespace
+
+import numpy as np
+
+from models.expression_compiler import normalize
+from models.quadrature import QuadratureResult, effective_n
+
+PRECISIONS = ("float32", "float64", "mpmath")
+DEFAULT_PRECISION = "float64"
+
+# au-delà, une somme point par point en mpmath prendrait plusieurs secondes : on repasse en float64
+MPMATH_MAX_POINTS = 200_000
+MPMATH_METHODS = ("Gauche", "Droite", "Milieu", "Trapèzes", "Simpson")
+
+_mp_functions = {}
+
+
+def numpy_dtype(precision: str):
+    return np.float32 if precision == "float32" else np.float64
+
+
+def _mpmath_namespace():
+    # équivalent de SAFE_NAMESPACE où np.sin, sin, pi... sont les fonctions et constantes de mpmath
+    import mpmath
+    functions = {
+        "sin": mpmath.sin, "cos": mpmath.cos, "tan": mpmath.tan,
+        "arcsin": mpmath.asin, "arccos": mpmath.acos, "arctan": mpmath.atan, "arctan2": mpmath.atan2,
+        "sinh": mpmath.sinh, "cosh": mpmath.cosh, "tanh": mpmath.tanh,
+        "exp": mpmath.exp, "log": mpmath.log, "log10": mpmath.log10, "log2": lambda v: mpmath.log(v, 2),
+        "sqrt": mpmath.sqrt, "cbrt": mpmath.cbrt, "abs": mpmath.fabs, "absolute": mpmath.fabs,
+        "power": mpmath.power, "floor": mpmath.floor, "ceil": mpmath.ceil, "sign": mpmath.sign,
+    }
+    constants = {"pi": mpmath.pi, "e": mpmath.e}
+    namespace = dict(functions, **constants)
+    namespace["np"] = SimpleNamespace(**functions, **constants)
+    namespace["__builtins__"] = {}
+    return namespace
+
+
+def mp_function(function_str: str):
+    # f(x) sur des mpf ; AttributeError/NameError à l'appel si l'expression utilise une fonction
+    # numpy sans équivalent mpmath
+    key = normalize(function_str)
+    f = _mp_functions.get(key)
+    if f is None:
+        code = compile(ast.parse(f"lambda x: ({key})", mode="eval"), "<mpmath>", "eval")
+        f = _mp_functions[key] = eval(code, _mpmath_namespace())
+    return f
+
+
+def mp_riemann(method: str, function_str: str, a: float, b: float, n: int, dps: int):
+    # mêmes règles et mêmes estimations d'erreur que models.quadrature, en précision arbitraire ;
+    # None si la méthode, le nombre de points ou l'expression ne s'y prêtent pas
+    if method not in MPMATH_METHODS:
+        return None
+    n = effective_n(method, n)
+    if 2 * n + 1 > MPMATH_MAX_POINTS:
+        return None
+
+    import mpmath
+    f = mp_function(function_str)
+    with mpmath.workdps(dps):
+        a, b = mpmath.mpf(a), mpmath.mpf(b)
+        dx = (b - a) / n
+        try:
+            # k = 0..n : les bords de la grille
+            y = [mpmath.mpmathify(f(a + k * dx)) for k in range(n + 1)]
+            mids = []
+            if method == "Milieu":
+                mids = [mpmath.mpmathify(f(a + (k + mpmath.mpf(0.5)) * dx)) for k in range(n)]
+        except (AttributeError, NameError, TypeError, ValueError, ZeroDivisionError):
+            return None
+        # valeur complexe (log d'un négatif) ou infinie : pas de somme réelle
+        if not all(is_real_finite(v) for v in y + mids):
+            return None
+
+        delta = y[-1] - y[0]
+        trapeze = (mpmath.fsum(y) - (y[0] + y[-1]) / 2) * dx
+        if method == "Gauche":
+            return QuadratureResult(mpmath.fsum(y[:-1]) * dx, abs(dx * delta / 2), n + 1)
+        if method == "Droite":
+            return QuadratureResult(mpmath.fsum(y[1:]) * dx, abs(dx * delta / 2), n + 1)
+        if method == "Milieu":
+            value = mpmath.fsum(mids) * dx
+            return QuadratureResult(value, abs(trapeze - value) / 3, 2 * n + 1)
+        if method == "Trapèzes":
+            coarse = (mpmath.fsum(y[::2]) - (y[0] + y[-1]) / 2) * 2 * dx
+            return QuadratureResult(trapeze, abs(trapeze - coarse) / 3, n + 1)
+
+        fine = _mp_simpson(y, dx)
+        coarse = _mp_simpson(y[::2], 2 * dx)
+        return QuadratureResult(fine, abs(fine - coarse) / 15, n + 1)
+
+
+def _mp_simpson(y, dx):
+    import mpmath
+    return dx / 3 * (y[0] + y[-1] + 4 * mpmath.fsum(y[1:-1:2]) + 2 * mpmath.fsum(y[2:-1:2]))
+
+
+def mp_integrate(function_str: str, a: float, b: float, dps: int):
+    # intégrale numérique en précision arbitraire (tanh-sinh de mpmath) : (valeur, erreur) ou None
+    import mpmath
+    f = mp_function(function_str)
+    with mpmath.workdps(dps):
+        try:
+            value, error = mpmath.quad(f, [mpmath.mpf(a), mpmath.mpf(b)], error=True)
+        except (AttributeError, NameError, TypeError, ValueError, ZeroDivisionError):
+            return None
+        if not is_real_finite(value):
+            return None
+        return value, error
+
+
+def is_real_finite(value) -> bool:
+    import mpmath
+    return isinstance(value, mpmath.mpf) and bool(mpmath.isfinite(value))
+
+
+def format_value(value, precision: str = DEFAULT_PRECISION) -> str:
+    # les valeurs mpmath sont affichées avec tous leurs chiffres significatifs utiles
+    if precision == "mpmath" and not isinstance(value, (float, np.floating)):
+        import mpmath
+        return mpmath.nstr(value, 25)
+    return f"{float(value):.6f}"
+
+
+def format_error(error) -> str:
+    error = float(error)
+    return f"{error:.1e}" if math.isfinite(error) else "∞"
@@ -0,0 +1,346 @@
+# Moteur de quadrature vectorisé : chaque méthode retourne la valeur, une estimation de l'erreur
+# et le nombre d'évaluations de f. Les noms sont ceux affichés dans orientationComboBox.
+# dtype=np.float32 évalue f en simple précision (aperçu rapide) ; les sommes restent en float64.
+import numpy as np
+
+from models.streaming_sum import grid_sums
+
+
+class QuadratureResult:
+    def __init__(self, value: float, error: float, evaluations: int, converged: bool = True):
+        self.value = value
+        self.error = error
+        self.evaluations = evaluations
+        self.converged = converged
+
+    def __iter__(self):
+        return iter((self.value, self.error, self.evaluations))
+
+    def __repr__(self):
+        return f"QuadratureResult(value={self.value!r}, error={self.error!r}, evaluations={self.evaluations})"
+
+
+def _eval(f, x, dtype=np.float64):
+    with np.errstate(all="ignore"):
+        return np.asarray(f(np.asarray(x, dtype=dtype)), dtype=float)
+
+
+def gauche(f, a, b, n, dtype=np.float64):
+    dx = (b - a) / n
+    sums = grid_sums(f, a, dx, 0, n, dtype=dtype)
+    fb = _eval(f, np.array([b]), dtype)[0]
+    value = sums.total * dx
+    # L - T = dx/2 (f(a) - f(b)) : erreur au premier ordre de la méthode des rectangles
+    return QuadratureResult(value, abs(dx * (fb - sums.first) / 2), n + 1)
+
+
+def droite(f, a, b, n, dtype=np.float64):
+    dx = (b - a) / n
+    sums = grid_sums(f, a, dx, 1, n, dtype=dtype)
+    fa = _eval(f, np.array([a]), dtype)[0]
+    value = sums.total * dx
+    return QuadratureResult(value, abs(dx * (sums.last - fa) / 2), n + 1)
+
+
+def milieu(f, a, b, n, dtype=np.float64):
+    # erreur du point milieu ~ dx²/24 (f'(b) - f'(a)) (Euler-Maclaurin) ; les dérivées aux bords sont
+    # estimées avec le premier et le dernier milieu, seuls f(a) et f(b) s'ajoutent aux n évaluations
+    dx = (b - a) / n
+    sums = grid_sums(f, a, dx, 0.5, n, dtype=dtype)
+    fa, fb = _eval(f, np.array([a, b]), dtype)
+    value = sums.total * dx
+    return QuadratureResult(value, abs(dx * ((fb - sums.last) - (sums.first - fa)) / 12), n + 2)
+
+
+def effective_n(method: str, n: int) -> int:
+    # les trapèzes veulent n pair et Simpson un multiple de 4 (erreur estimée sur la grille à pas double) :
+    # n est arrondi au-dessus, c'est ce nombre d'intervalles qui est réellement utilisé
+    n = max(1, int(n))
+    if method == "Trapèzes":
+        return max(2, n + n % 2)
+    if method == "Simpson":
+        return max(4, n + (-n) % 4)
+    return n
+
+
+def trapezes(f, a, b, n, dtype=np.float64):
+    # n pair pour réutiliser un point sur deux : T_{n/2} ne coûte aucune évaluation de plus
+    n = effective_n("Trapèzes", n)
+    dx = (b - a) / n
+    sums = grid_sums(f, a, dx, 0, n + 1, dtype=dtype)
+    ends = (sums.first + sums.last) / 2
+    fine = (sums.total - ends) * dx
+    coarse = (sums.even - ends) * 2 * dx
+    return QuadratureResult(fine, abs(fine - coarse) / 3, n + 1)
+
+
+def simpson(f, a, b, n, dtype=np.float64):
+    # S_{n/2} se calcule sur les mêmes points, erreur ~ |S_n - S_{n/2}| / 15
+    # (les points impairs de la grille à pas double sont les indices de reste 2 modulo 4)
+    n = effective_n("Simpson", n)
+    dx = (b - a) / n
+    sums = grid_sums(f, a, dx, 0, n + 1, dtype=dtype)
+    ends = sums.first + sums.last
+    fine = dx / 3 * (4 * sums.odd + 2 * (sums.even - ends) + ends)
+    coarse = 2 * dx / 3 * (4 * sums.residues[2] + 2 * (sums.residues[0] - ends) + ends)
+    return QuadratureResult(fine, abs(fine - coarse) / 15, n + 1)
+
+
+def romberg(f, a, b, n, max_levels: int = 20, dtype=np.float64):
+    # autant de niveaux que nécessaire pour atteindre au moins n intervalles, chaque niveau
+    # n'évalue que les nouveaux milieux
+    levels = min(max_levels, max(2, int(np.ceil(np.log2(max(n, 2)))) + 1))
+    h = b - a
+    ends = _eval(f, np.array([a, b]), dtype)
+    table = [[h * (ends[0] + ends[1]) / 2]]
+    evaluations = 2
+
+    for k in range(1, levels):
+        h /= 2
+        count = 2 ** (k - 1)
+        new_points = _eval(f, a + h * (2 * np.arange(count) + 1), dtype)
+        evaluations += count
+        row = [table[-1][0] / 2 + h * np.sum(new_points)]
+        for j in range(1, k + 1):
+            row.append(row[j - 1] + (row[j - 1] - table[-1][j - 1]) / (4 ** j - 1))
+        table.append(row)
+
+    return QuadratureResult(table[-1][-1], abs(table[-1][-1] - table[-2][-1]), evaluations)
+
+
+def gauss_legendre(f, a, b, n, order: int = 5, dtype=np.float64):
+    # n nœuds répartis en panneaux de `order` points ; l'erreur est comparée à une règle
+    # à 3 points sur les mêmes panneaux (estimation pessimiste)
+    panels = max(1, int(np.ceil(n / order)))
+    edges = np.linspace(a, b, panels + 1)
+    value, evaluations = _gauss_panels(f, edges, order, dtype)
+    low, low_evaluations = _gauss_panels(f, edges, 3, dtype)
+    return QuadratureResult(value, abs(value - low), evaluations + low_evaluations)
+
+
+def _gauss_panels(f, edges, order, dtype=np.float64):
+    nodes, weights = np.polynomial.legendre.leggauss(order)
+    half = (edges[1:] - edges[:-1]) / 2
+    centers = (edges[1:] + edges[:-1]) / 2
+    x = centers[:, None] + half[:, None] * nodes[None, :]
+    y = _eval(f, x.ravel(), dtype).reshape(x.shape)
+    return float(np.sum(half * (y @ weights))), x.size
+
+
+# Gauss-Kronrod 7-15 (valeurs de QUADPACK) : nœuds positifs de Kronrod, le dernier est 0
+_XGK = np.array([0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+                 0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+                 0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+                 0.207784955007898467600689403773245, 0.0])
+_WGK = np.array([0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+                 0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+                 0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+                 0.204432940075298892414161999234649, 0.209482141084727828012999174891714])
+# poids de Gauss à 7 points, sur les nœuds de Kronrod d'indice impair (xgk[1], xgk[3], xgk[5], 0)
+_WG = np.array([0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+                0.381830050505118944950369775488975, 0.417959183673469387755102040816327])
+
+_NODES = np.concatenate([-_XGK[:-1], _XGK[::-1]])
+_WEIGHTS_K = np.concatenate([_WGK[:-1], _WGK[::-1]])
+_WEIGHTS_G = np.zeros(15)
+_WEIGHTS_G[[1, 3, 5]] = _WG[:3]
+_WEIGHTS_G[[13, 11, 9]] = _WG[:3]
+_WEIGHTS_G[7] = _WG[3]
+
+
+def _kronrod_panels(f, left, right):
+    # évalue tous les panneaux d'un coup ; une valeur non finie (singularité atteinte par un nœud)
+    # compte pour 0 et rend l'erreur du panneau infinie pour forcer la subdivision
+    half = (right - left) / 2
+    center = (right + left) / 2
+    x = center[:, None] + half[:, None] * _NODES[None, :]
+    y = _eval(f, x.ravel()).reshape(x.shape)
+    bad = ~np.isfinite(y).all(axis=1)
+    y = np.where(np.isfinite(y), y, 0.0)
+    kronrod = half * (y @ _WEIGHTS_K)
+    gauss = half * (y @ _WEIGHTS_G)
+    error = np.abs(kronrod - gauss)
+    error[bad] = np.inf
+    return kronrod, error
+
+
+def _allowed(tolerance: float, value: float) -> float:
+    # tolérance absolue, ou relative pour les grandes valeurs
+    return max(tolerance, tolerance * abs(value))
+
+
+def _adaptive(f, a: float, b: float, tolerance: float, max_panels: int):
+    # on coupe en deux les panneaux dont l'erreur dépasse leur part de la tolérance, jusqu'à une
+    # largeur minimale. Retourne (valeur, erreur, évaluations, panneaux bloqués) ; les panneaux
+    # bloqués (gauches, droites) sont trop étroits pour être coupés encore, ou restaient à couper
+    # quand la limite de panneaux a été atteinte
+    left = np.array([float(a)])
+    right = np.array([float(b)])
+    values, errors = _kronrod_panels(f, left, right)
+    evaluations = 15
+    min_width = abs(b - a) * 1e-12
+
+    done_value = 0.0
+    done_error = 0.0
+    stuck_left, stuck_right = [], []
+    while True:
+        total = done_value + np.sum(values)
+        allowed = _allowed(tolerance, total) * (right - left) / (b - a)
+        over = errors > allowed
+        split = over & ((right - left) > min_width)
+
+        done_value += np.sum(values[~split])
+        done_error += np.sum(errors[~split])
+        stuck_left.extend(left[over & ~split])
+        stuck_right.extend(right[over & ~split])
+        if not split.any():
+            break
+        if left.size + np.count_nonzero(split) > max_panels:
+            done_value += np.sum(values[split])
+            done_error += np.sum(errors[split])
+            stuck_left.extend(left[split])
+            stuck_right.extend(right[split])
+            break
+
+        left, right = left[split], right[split]
+        middle = (left + right) / 2
+        left, right = np.concatenate([left, middle]), np.concatenate([middle, right])
+        values, errors = _kronrod_panels(f, left, right)
+        evaluations += 15 * left.size
+
+    return done_value, done_error, evaluations, (np.array(stuck_left), np.array(stuck_right))
+
+
+def _singular_points(f, stuck, a: float, b: float):
+    # les panneaux bloqués doivent se resserrer sur a, sur b, ou sur un bord de panneau intérieur où
+    # f n'est pas finie (1/sqrt(|x|) en 0) ; sinon la singularité n'est pas localisable : None.
+    # Près d'une singularité l'arrondi bloque aussi des panneaux voisins, d'où une marge large :
+    # l'extrapolation dira elle-même si elle converge
+    stuck_left, stuck_right = stuck
+    near = abs(b - a) * 1e-3
+    edges = np.intersect1d(stuck_left, stuck_right)
+    interior = edges[~np.isfinite(_eval(f, edges))] if edges.size else edges
+
+    points = set()
+    for left, right in zip(stuck_left, stuck_right):
+        if left - a <= near:
+            points.add(float(a))
+        elif b - right <= near:
+            points.add(float(b))
+        else:
+            close = interior[(interior >= left - near) & (interior <= right + near)]
+            if close.size == 0:
+                return None
+            points.add(float(close[0]))
+    return sorted(points)
+
+
+def _wynn_epsilon(sums):
+    # algorithme epsilon de Wynn : limite d'une suite à convergence géométrique (sommes partielles
+    # vers une singularité x^alpha, log x) ; on garde la dernière colonne paire calculable
+    previous = [0.0] * (len(sums) + 1)
+    current = list(sums)
+    best = current[-1]
+    for column in range(1, len(sums)):
+        following = []
+        for i in range(len(current) - 1):
+            diff = current[i + 1] - current[i]
+            if diff == 0 or not np.isfinite(diff):
+                return best
+            following.append(previous[i + 1] + 1.0 / diff)
+        previous, current = current, following
+        if column % 2 == 0:
+            if not np.isfinite(current[-1]):
+                return best
+            best = current[-1]
+    return best
+
+
+def _endpoint_extrapolation(f, s: float, e: float, tolerance: float, window: int = 16):
+    # intégrale sur [s, e] avec une singularité intégrable en s : découpage dyadique vers s
+    # ([s + w/2, s + w], [s + w/4, s + w/2], ...), chaque morceau est lisse à son échelle, puis
+    # la queue restante est extrapolée (epsilon de Wynn) sur les sommes partielles
+    # on s'arrête avant que l'arrondi de s + x ne fausse les nœuds des morceaux (s loin de 0)
+    w = e - s
+    levels = 1
+    while levels < 100 and abs(w) * 2.0 ** -levels > 2 ** 20 * np.finfo(float).eps * abs(s):
+        levels += 1
+
+    k = np.arange(levels)
+    outer = s + w * 2.0 ** -k
+    inner = s + w * 2.0 ** -(k + 1)
+    values, errors = _kronrod_panels(f, np.minimum(inner, outer), np.maximum(inner, outer))
+    evaluations = 15 * levels
+
+    # morceau qui reste difficile à son échelle (autre singularité, oscillations) : adaptatif
+    for i in np.flatnonzero(~(errors <= tolerance * np.abs(values))):
+        lo, hi = sorted((inner[i], outer[i]))
+        values[i], errors[i], more, _ = _adaptive(f, lo, hi, tolerance, 200)
+        evaluations += more
+
+    # les morceaux ne décroissent pas (1/x) : intégrale divergente
+    magnitudes = np.abs(values)
+    decay = 0.999 ** (levels // 2)
+    if not np.isfinite(values).all() or levels < 8 or magnitudes[-1] >= decay * magnitudes[levels // 2]:
+        return float(np.sum(values)), np.inf, evaluations
+
+    sums = np.cumsum(values)
+    estimates = [_wynn_epsilon(sums[max(0, n - window):n]) for n in range(3, levels + 1)]
+    best_value, best_error = float(sums[-1]), np.inf
+    for n in range(2, len(estimates)):
+        error = abs(estimates[n] - estimates[n - 1]) + abs(estimates[n] - estimates[n - 2])
+        if error < best_error:
+            best_value, best_error = float(estimates[n]), error
+    best_error += float(np.sum(errors)) + 50 * np.finfo(float).eps * abs(best_value)
+    return best_value, best_error, evaluations
+
+
+def gauss_kronrod(f, a: float, b: float, tolerance: float = 1e-10, max_panels: int = 2000):
+    # intégration adaptative (bissection des panneaux). Si des panneaux restent bloqués sur une
+    # singularité intégrable en a, en b ou en un point intérieur où f est infinie, [a, b] est coupé
+    # en ces points et chaque morceau est intégré par extrapolation vers la singularité. Une
+    # singularité non intégrable (1/x sur [0, 1]) ne converge pas : converged=False.
+    value, error, evaluations, stuck = _adaptive(f, a, b, tolerance, max_panels)
+    points = None
+    if error > _allowed(tolerance, value) and len(stuck[0]):
+        points = _singular_points(f, stuck, a, b)
+
+    if points:
+        edges = sorted(set([float(a), float(b)] + points))
+        parts = len(edges) - 1
+        value, error = 0.0, 0.0
+        for lo, hi in zip(edges[:-1], edges[1:]):
+            ends = [end for end in (lo, hi) if end in points]
+            if len(ends) == 2:
+                middle = (lo + hi) / 2
+                pieces = [_endpoint_extrapolation(f, lo, middle, tolerance / (2 * parts)),
+                          _endpoint_extrapolation(f, hi, middle, tolerance / (2 * parts))]
+            elif ends:
+                other = hi if ends[0] == lo else lo
+                pieces = [_endpoint_extrapolation(f, ends[0], other, tolerance / parts)]
+            else:
+                pieces = [_adaptive(f, lo, hi, tolerance / parts, max_panels)[:3]]
+            for piece_value, piece_error, piece_evaluations in pieces:
+                value += piece_value
+                error += piece_error
+                evaluations += piece_evaluations
+
+    converged = np.isfinite(error) and error <= _allowed(tolerance, value)
+    return QuadratureResult(float(value), float(error), evaluations, bool(converged))
+
+
+METHODS = {
+    "Gauche": gauche,
+    "Droite": droite,
+    "Milieu": milieu,
+    "Trapèzes": trapezes,
+    "Simpson": simpson,
+    "Romberg": romberg,
+    "Gauss-Legendre": gauss_legendre,
+}
+
+
+def integrate(method: str, f, a: float, b: float, n: int, dtype=np.float64) -> QuadratureResult:
+    if method not in METHODS:
+        raise ValueError(f"Méthode inconnue : {method}")
+    return METHODS[method](f, a, b, max(1, int(n)), dtype=dtype)
@@ -0,0 +1,33 @@
+# Intégration symbolique (sympy) sans dépendance à Qt : utilisée par le worker, le modèle et la CLI
+# sympy est importé au premier appel seulement, pour ne pas ralentir le démarrage de l'application
+from models.antiderivative_cache import compute_antiderivative, evaluate_primitive
+
+
+def integrate_exact(function_str: str, a: float, b: float) -> float:
+    import sympy as sp
+    x = sp.Symbol("x")
+    f_sympy = sp.sympify(function_str)
+    integrale_definie = sp.integrate(f_sympy, (x, a, b))
+    return float(integrale_definie.evalf())
+
+
+def integrate_with_antiderivative(function_str: str, a: float, b: float):
+    # calcule aussi la primitive pour que les prochains changements de bornes soient gratuits
+    # retourne (valeur, (fonction, primitive, singularités) ou None)
+    import sympy as sp
+    antiderivative = None
+    try:
+        found = compute_antiderivative(function_str)
+    except Exception:
+        found = None
+
+    if found is not None:
+        primitive_str, singularities = found
+        antiderivative = (function_str, primitive_str, singularities)
+        primitive = sp.lambdify(sp.Symbol("x"), sp.sympify(primitive_str), modules="numpy")
+        value = evaluate_primitive(primitive, singularities, a, b)
+        if value is not None:
+            return value, antiderivative
+
+    # singularité dans [a, b] ou pas de primitive : intégrale définie classique
+    return integrate_exact(function_str, a, b), antiderivative
@@ -0,0 +1,183 @@
+# Sommes de Riemann en forme fermée : sympy calcule une fois L(a, b, n) = dx * somme f(a + k dx),
+# k = 0..n-1, et chaque somme ensuite ne coûte qu'une évaluation de cette formule, quel que soit n.
+# Les autres méthodes s'en déduisent avec f(a) et f(b) seulement :
+#   Droite = L + dx (f(b) - f(a)),  Trapèzes = L + dx/2 (f(b) - f(a)),  Milieu = 2 T_2n - T_n
+# sympy et mpmath sont importés au premier appel seulement.
+from collections import OrderedDict
+
+import numpy as np
+
+from models.expression_compiler import compile_function, normalize
+from models.antiderivative_cache import find_singularities
+from models.quadrature import QuadratureResult, effective_n
+from models.precision import mp_function, is_real_finite
+
+CLOSED_FORM_METHODS = ("Gauche", "Droite", "Milieu", "Trapèzes")
+
+# (a, b, n) où la formule est comparée à la somme numérique avant d'être acceptée
+_CHECKS = ((0.0, 1.0, 7), (-1.5, 2.0, 10), (0.5, 3.0, 13))
+
+
+def derive_left_sum(function_str: str):
+    # retourne (formule en a, b, n, singularités de f) ou (None, None) si pas de forme fermée
+    import sympy as sp
+    x, a, b, n, k = sp.symbols("x a b n k")
+    f_sympy = sp.sympify(function_str)
+    if not f_sympy.free_symbols <= {x}:
+        return None, None
+
+    dx = (b - a) / n
+    # sin et cos se somment comme des séries géométriques une fois écrits avec exp
+    for candidate in (f_sympy, f_sympy.rewrite(sp.exp)):
+        total = sp.summation(candidate.subs(x, a + k * dx), (k, 0, n - 1))
+        if total.has(sp.Sum):
+            continue
+        formula = str(total * dx)
+        if _matches_numeric(function_str, formula):
+            return formula, find_singularities(f_sympy)
+    return None, None
+
+
+def _matches_numeric(function_str: str, formula_str: str) -> bool:
+    f = compile_function(function_str)
+    entry = RiemannFormula(formula_str, [])
+    for a, b, n in _CHECKS:
+        dx = (b - a) / n
+        with np.errstate(all="ignore"):
+            expected = float(np.sum(f(a + dx * np.arange(n))) * dx)
+        if not np.isfinite(expected):
+            continue
+        value = entry.left_sum(a, b, n)
+        if value is None or abs(value - expected) > 1e-9 * max(1.0, abs(expected)):
+            return False
+    return True
+
+
+class RiemannFormula:
+    def __init__(self, formula_str: str, singularities):
+        self.formula_str = formula_str
+        self.singularities = singularities
+        self.__formula = None
+
+    @property
+    def formula(self):
+        # lambdify seulement au premier usage ; mpmath pour garder la précision quand n est énorme
+        if self.__formula is None:
+            import sympy as sp
+            self.__formula = sp.lambdify(sp.symbols("a b n"), sp.sympify(self.formula_str), modules="mpmath")
+        return self.__formula
+
+    def left_sum(self, a: float, b: float, n: int, dps: int = None):
+        # flottant, ou mpf avec dps chiffres ; None si la formule ne donne pas un réel fini
+        import mpmath
+        try:
+            # assez de chiffres pour que les annulations en 1/n et n^p restent exactes
+            with mpmath.workdps((dps or 15) + 15 + 2 * len(str(int(n)))):
+                value = mpmath.mpmathify(self.formula(mpmath.mpf(a), mpmath.mpf(b), mpmath.mpf(n)))
+                real, imag = mpmath.re(value), mpmath.im(value)
+                if not mpmath.isfinite(real) or abs(imag) > 1e-12 * max(1, abs(real)):
+                    return None
+        except Exception:
+            return None
+        return +real if dps else float(real)
+
+    def integrate(self, method: str, fa, fb, a: float, b: float, n: int, dps: int = None):
+        # même résultat et même estimation d'erreur que models.quadrature, ou None ;
+        # fa et fb sont f(a) et f(b), en mpf quand dps est donné
+        if method not in CLOSED_FORM_METHODS:
+            return None
+        if self.singularities is None or any(a <= p <= b for p in self.singularities):
+            return None
+
+        def trapeze(count):
+            left = self.left_sum(a, b, count, dps)
+            return None if left is None else left + width / count / 2 * delta
+
+        import mpmath
+        with mpmath.workdps(dps or 15):
+            width = mpmath.mpf(b) - mpmath.mpf(a) if dps else b - a
+            delta = fb - fa
+            n = max(1, int(n))
+            dx = width / n
+            if method in ("Gauche", "Droite"):
+                left = self.left_sum(a, b, n, dps)
+                if left is None:
+                    return None
+                value = left if method == "Gauche" else left + dx * delta
+                return QuadratureResult(value, abs(dx * delta / 2), 2)
+
+            if method == "Trapèzes":
+                n = effective_n(method, n)
+                fine, coarse = trapeze(n), trapeze(n // 2)
+                if fine is None or coarse is None:
+                    return None
+                return QuadratureResult(fine, abs(fine - coarse) / 3, 2)
+
+            fine, coarse = trapeze(2 * n), trapeze(n)
+            if fine is None or coarse is None:
+                return None
+            value = 2 * fine - coarse
+            return QuadratureResult(value, abs(coarse - value) / 3, 2)
+
+    def to_dict(self) -> dict:
+        return {"formula": self.formula_str, "singularities": self.singularities}
+
+
+class RiemannFormulaCache:
+    # expression normalisée -> RiemannFormula, ou None quand sympy n'a pas trouvé de forme fermée
+
+    def __init__(self, max_size: int = 256):
+        self.__entries = OrderedDict()
+        self.__max_size = max_size
+
+    def __contains__(self, function_str: str) -> bool:
+        return self.__key(function_str) in self.__entries
+
+    def get(self, function_str: str):
+        key = self.__key(function_str)
+        entry = self.__entries.get(key)
+        if key in self.__entries:
+            self.__entries.move_to_end(key)
+        return entry
+
+    def put(self, function_str: str, formula_str, singularities):
+        key = self.__key(function_str)
+        self.__entries[key] = None if formula_str is None else RiemannFormula(formula_str, singularities)
+        if len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def integrate(self, method: str, function_str: str, f, a: float, b: float, n: int, dps: int = None):
+        # f(a) et f(b) sont les seules évaluations de f : numpy, ou mpmath quand dps est donné
+        entry = self.get(function_str)
+        if entry is None:
+            return None
+        if dps:
+            import mpmath
+            try:
+                with mpmath.workdps(dps):
+                    mp_f = mp_function(function_str)
+                    fa, fb = (mpmath.mpmathify(mp_f(mpmath.mpf(v))) for v in (a, b))
+            except Exception:
+                return None
+            if not (is_real_finite(fa) and is_real_finite(fb)):
+                return None
+        else:
+            with np.errstate(all="ignore"):
+                fa, fb = (float(v) for v in np.asarray(f(np.array([a, b])), dtype=float))
+            if not (np.isfinite(fa) and np.isfinite(fb)):
+                return None
+        return entry.integrate(method, fa, fb, a, b, n, dps)
+
+    def clear(self):
+        self.__entries.clear()
+
+    @staticmethod
+    def __key(function_str: str):
+        try:
+            return normalize(function_str)
+        except SyntaxError:
+            return function_str
+
+
+# instance partagée, remplie par le worker de MainWindowModel
+riemann_formulas = RiemannFormulaCache()
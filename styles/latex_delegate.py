@@ -1,71 +1,27 @@
 #Classe cree avec Claude pour integrer le LaTeX au combo box des fonctions
-from PyQt6.QtWidgets import QStyledItemDelegate
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QPixmap, QPainter
-import matplotlib
+# Le rendu est paresseux : Qt n'appelle paint que pour les lignes visibles, et la taille des lignes
+# est fixe (sizeHint) pour que la vue n'ait jamais à rendre une formule pour mesurer une ligne.
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem, QStyle, QApplication
+from PyQt6.QtCore import Qt, QSize, QRect
+from PyQt6.QtGui import QPainter
 
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from io import BytesIO
+from styles.latex_renderer import renderer
+from styles.themes import DARK
+from models.perf_stats import perf
 
 
 class LatexDelegate(QStyledItemDelegate):
-    def __init__(self, parent=None, main_window=None):
+    def __init__(self, parent=None, main_window=None, fontsize: int = 18, row_height: int = 40):
         super().__init__(parent)
         self.__main_window = main_window
+        self.__fontsize = fontsize
+        self.__row_height = row_height
 
     def __get_latex_color(self):
-        if self.__main_window and hasattr(self.__main_window, '_MainWindowView__is_dark_mode'):
-            return 'white' if self.__main_window._MainWindowView__is_dark_mode else 'black'
-        return 'white'
-
-    def __function_to_latex(self, function_str: str) -> str:
-        try:
-            import sympy as sp
-            sympy_str = function_str.replace('np.', '')
-            expr = sp.sympify(sympy_str)
-            latex = sp.latex(expr)
-            return f'${latex}$'
-        except:
-            latex = function_str
-            latex = latex.replace('**', '^')
-            latex = latex.replace('*', r'\cdot ')
-            latex = latex.replace('np.sin', r'\sin')
-            latex = latex.replace('np.cos', r'\cos')
-            latex = latex.replace('np.exp', r'e^')
-            return f'${latex}$'
-
-    def __render_latex_to_pixmap(self, latex_str: str) -> QPixmap:
-        try:
-            fig = plt.figure(figsize=(4, 0.5))
-            fig.patch.set_visible(False)
-            ax = fig.add_axes([0, 0, 1, 1])
-            ax.axis('off')
-
-            text_color = self.__get_latex_color()
-
-            ax.text(0.5, 0.5, latex_str,
-                    fontsize=18,
-                    color=text_color,
-                    ha='center',
-                    va='center',
-                    transform=ax.transAxes)
-
-            buf = BytesIO()
-            fig.savefig(buf, format='png', dpi=100, bbox_inches='tight',
-                        transparent=True, pad_inches=0.1)
-            buf.seek(0)
-
-            pixmap = QPixmap()
-            pixmap.loadFromData(buf.read())
-
-            plt.close(fig)
-            return pixmap
-
-        except Exception as e:
-            print(f"Erreur de rendu LaTeX: {e}")
-            return QPixmap()
+        theme = getattr(self.__main_window, "theme", None) or DARK
+        return theme.latex_color
 
+    @perf.timed("LatexDelegate.paint")
     def paint(self, painter, option, index):
         function_str = index.data(Qt.ItemDataRole.DisplayRole)
 
@@ -73,16 +29,28 @@ class LatexDelegate(QStyledItemDelegate):
             super().paint(painter, option, index)
             return
 
-        latex_str = self.__function_to_latex(function_str)
-        pixmap = self.__render_latex_to_pixmap(latex_str)
+        dpr = painter.device().devicePixelRatioF() if painter.device() else 1.0
+        pixmap = renderer.pixmap(function_str, self.__get_latex_color(), self.__fontsize, dpr)
 
         if not pixmap.isNull():
+            # fond de la ligne (sélection, survol, couleurs alternées) sans le texte
+            background = QStyleOptionViewItem(option)
+            self.initStyleOption(background, index)
+            style = background.widget.style() if background.widget else QApplication.style()
+            style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, background, painter, background.widget)
+
             painter.save()
 
-            x = option.rect.x() + (option.rect.width() - pixmap.width()) // 2
-            y = option.rect.y() + (option.rect.height() - pixmap.height()) // 2
+            # la formule est réduite si elle dépasse la ligne, jamais agrandie
+            width = pixmap.width() / pixmap.devicePixelRatio()
+            height = pixmap.height() / pixmap.devicePixelRatio()
+            scale = min(1.0, option.rect.width() / width, option.rect.height() / height)
+            width, height = round(width * scale), round(height * scale)
+            x = option.rect.x() + (option.rect.width() - width) // 2
+            y = option.rect.y() + (option.rect.height() - height) // 2
 
-            painter.drawPixmap(x, y, pixmap)
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+            painter.drawPixmap(QRect(x, y, width, height), pixmap)
             painter.restore()
         else:
             super().paint(painter, option, index)
@@ -93,4 +61,4 @@ class LatexDelegate(QStyledItemDelegate):
         if not function_str or function_str.strip() == "":
             return QSize(200, 25)
 
-        return QSize(200, 40)
\ No newline at end of file
+        return QSize(200, self.__row_height)
\ No newline at end of file
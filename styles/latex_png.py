@@ -0,0 +1,47 @@
+# Rendu d'une formule LaTeX en PNG avec matplotlib (Agg), sans Qt : utilisable dans un processus séparé
+# On crée la Figure et son canvas Agg directement : pas de pyplot, donc pas de matplotlib.use('Agg')
+# qui changerait le backend global utilisé par PlotCanvas
+from io import BytesIO
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+def function_to_latex(function_str: str) -> str:
+    try:
+        import sympy as sp
+        sympy_str = function_str.replace('np.', '')
+        expr = sp.sympify(sympy_str)
+        latex = sp.latex(expr)
+        return f'${latex}$'
+    except:
+        latex = function_str
+        latex = latex.replace('**', '^')
+        latex = latex.replace('*', r'\cdot ')
+        latex = latex.replace('np.sin', r'\sin')
+        latex = latex.replace('np.cos', r'\cos')
+        latex = latex.replace('np.exp', r'e^')
+        return f'${latex}$'
+
+
+def render_latex_png(latex_str: str, color: str, fontsize: int, dpi: float = 100) -> bytes:
+    fig = Figure(figsize=(4, 0.5))
+    FigureCanvasAgg(fig)
+    try:
+        fig.patch.set_visible(False)
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.axis('off')
+
+        ax.text(0.5, 0.5, latex_str,
+                fontsize=fontsize,
+                color=color,
+                ha='center',
+                va='center',
+                transform=ax.transAxes)
+
+        buf = BytesIO()
+        fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight',
+                    transparent=True, pad_inches=0.1)
+        return buf.getvalue()
+    finally:
+        fig.clear()
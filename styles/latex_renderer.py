@@ -0,0 +1,240 @@
+# Rendu LaTeX partagé par LatexDelegate et FunctionListView, avec cache LRU en mémoire et cache disque optionnel.
+# Le cache disque est activé par la variable d'environnement TP2_LATEX_CACHE :
+#   TP2_LATEX_CACHE=1              -> ~/.cache/tp2_riemann/latex
+#   TP2_LATEX_CACHE=/chemin/cache  -> ce dossier
+# Il est borné en octets ; les PNG les moins récemment utilisés sont supprimés.
+import hashlib
+import os
+from collections import OrderedDict
+
+from PyQt6.QtGui import QColor, QImage, QPainter, QPixmap
+
+from styles.latex_png import function_to_latex, render_latex_png
+
+
+DEFAULT_DISK_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "tp2_riemann", "latex")
+
+
+def disk_cache_from_environment():
+    # dossier du cache disque, ou None s'il n'est pas demandé
+    target = os.environ.get("TP2_LATEX_CACHE")
+    if not target or target == "0":
+        return None
+    return DEFAULT_DISK_CACHE_DIR if target == "1" else target
+
+
+class LatexRenderer:
+    # Chaque formule est rendue une seule fois par matplotlib, en masque alpha indépendant de la couleur
+    # (clé : fonction, taille de police, device pixel ratio). La couleur du thème est appliquée au moment
+    # de peindre : changer de thème ne refait aucun rendu, seules les lignes peintes sont reteintes.
+    # La mémoire est bornée par le nombre d'octets des images, pas par le nombre d'entrées.
+
+    # couleur du rendu matplotlib ; seul son canal alpha est gardé
+    MASK_COLOR = 'black'
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, disk_cache_dir: str = None,
+                 max_disk_bytes: int = 64 * 1024 * 1024):
+        self.__masks = OrderedDict()
+        self.__tinted = OrderedDict()
+        self.__sizes = {}
+        self.__total_bytes = 0
+        self.__max_bytes = max_bytes
+        self.__disk_cache_dir = disk_cache_dir
+        self.__max_disk_bytes = max_disk_bytes
+        # taille du cache disque, mesurée à la première écriture
+        self.__disk_bytes = None
+        # fonction -> LaTeX déjà connu (données de la librairie), évite sympy au rendu
+        self.__latex_source = None
+
+    @property
+    def disk_cache_dir(self):
+        return self.__disk_cache_dir
+
+    @disk_cache_dir.setter
+    def disk_cache_dir(self, path):
+        self.__disk_cache_dir = path
+        self.__disk_bytes = None
+
+    @property
+    def latex_source(self):
+        return self.__latex_source
+
+    @latex_source.setter
+    def latex_source(self, source):
+        self.__latex_source = source
+
+    @property
+    def total_bytes(self):
+        return self.__total_bytes
+
+    def pixmap(self, function_str: str, color: str, fontsize: int, device_pixel_ratio: float = 1.0) -> QPixmap:
+        key = self.__key(function_str, fontsize, device_pixel_ratio)
+        tinted_key = (key, color)
+
+        pixmap = self.__tinted.get(tinted_key)
+        if pixmap is not None:
+            self.__tinted.move_to_end(tinted_key)
+            return pixmap
+
+        mask = self.mask(function_str, fontsize, device_pixel_ratio)
+        if mask.isNull():
+            return QPixmap()
+        pixmap = self.__tint(mask, color)
+        pixmap.setDevicePixelRatio(key[3])
+        self.__store(self.__tinted, tinted_key, pixmap, pixmap.width() * pixmap.height() * 4)
+        return pixmap
+
+    def mask(self, function_str: str, fontsize: int, device_pixel_ratio: float = 1.0) -> QImage:
+        # QImage Alpha8 : couverture de la formule, sans couleur
+        key = self.__key(function_str, fontsize, device_pixel_ratio)
+
+        mask = self.__masks.get(key)
+        if mask is not None:
+            self.__masks.move_to_end(key)
+            return mask
+
+        mask = self.__load(key)
+        if not mask.isNull():
+            self.__store(self.__masks, key, mask, mask.sizeInBytes())
+        return mask
+
+    def is_cached(self, function_str: str, fontsize: int, device_pixel_ratio: float = 1.0) -> bool:
+        key = self.__key(function_str, fontsize, device_pixel_ratio)
+        if key in self.__masks:
+            return True
+        disk_path = self.__disk_path(key)
+        return bool(disk_path) and os.path.exists(disk_path)
+
+    def insert_png(self, function_str: str, fontsize: int, device_pixel_ratio: float, data: bytes):
+        # PNG déjà rendu ailleurs (préchargement en arrière-plan, en MASK_COLOR) : on l'ajoute aux deux caches
+        key = self.__key(function_str, fontsize, device_pixel_ratio)
+        if key in self.__masks:
+            return
+        self.__save_to_disk(self.__disk_path(key), data)
+        mask = self.__to_mask(data)
+        if not mask.isNull():
+            self.__store(self.__masks, key, mask, mask.sizeInBytes())
+
+    def clear(self):
+        self.__masks.clear()
+        self.__tinted.clear()
+        self.__sizes.clear()
+        self.__total_bytes = 0
+
+    def __key(self, function_str: str, fontsize: int, device_pixel_ratio: float):
+        # même forme que les anciennes clés (fonction, couleur, taille, dpr) : les PNG noirs déjà
+        # présents dans le cache disque restent valables
+        return function_str, self.MASK_COLOR, fontsize, float(device_pixel_ratio)
+
+    def __load(self, key) -> QImage:
+        function_str, color, fontsize, dpr = key
+        disk_path = self.__disk_path(key)
+
+        data = None
+        if disk_path and os.path.exists(disk_path):
+            try:
+                with open(disk_path, 'rb') as f:
+                    data = f.read()
+                # la date de modification sert d'ordre LRU pour l'éviction
+                os.utime(disk_path)
+            except OSError:
+                data = None
+
+        if data is None:
+            try:
+                latex = self.__latex_source(function_str) if self.__latex_source else None
+                data = render_latex_png(latex or function_to_latex(function_str), color, fontsize, dpi=100 * dpr)
+            except Exception as e:
+                print(f"Erreur de rendu LaTeX: {e}")
+                return QImage()
+            self.__save_to_disk(disk_path, data)
+
+        return self.__to_mask(data)
+
+    @staticmethod
+    def __to_mask(data: bytes) -> QImage:
+        image = QImage()
+        image.loadFromData(data)
+        if image.isNull():
+            return image
+        return image.convertToFormat(QImage.Format.Format_Alpha8)
+
+    @staticmethod
+    def __tint(mask: QImage, color: str) -> QPixmap:
+        # aplat de la couleur découpé par le masque
+        image = QImage(mask.size(), QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(QColor(color))
+        painter = QPainter(image)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_DestinationIn)
+        painter.drawImage(0, 0, mask)
+        painter.end()
+        return QPixmap.fromImage(image)
+
+    def __store(self, cache: OrderedDict, key, value, size: int):
+        # masques et pixmaps teintées partagent le même budget mémoire
+        cache[key] = value
+        self.__sizes[(id(cache), key)] = size
+        self.__total_bytes += size
+
+        for lru in (self.__tinted, self.__masks):
+            while self.__total_bytes > self.__max_bytes and len(lru) > 1:
+                old_key, _ = lru.popitem(last=False)
+                self.__total_bytes -= self.__sizes.pop((id(lru), old_key))
+
+    def __disk_path(self, key):
+        if not self.__disk_cache_dir:
+            return None
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.__disk_cache_dir, f"{digest}.png")
+
+    def __save_to_disk(self, disk_path, data: bytes):
+        if not disk_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(disk_path), exist_ok=True)
+            tmp_path = disk_path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, disk_path)
+        except OSError as e:
+            print(f"Impossible d'écrire le cache LaTeX: {e}")
+            return
+
+        if self.__disk_bytes is None:
+            self.__disk_bytes = sum(size for _, size, _ in self.__disk_entries())
+        else:
+            self.__disk_bytes += len(data)
+        if self.__disk_bytes > self.__max_disk_bytes:
+            self.__evict_disk()
+
+    def __disk_entries(self):
+        # (date de dernier usage, taille, chemin) des PNG du cache
+        entries = []
+        try:
+            with os.scandir(self.__disk_cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".png"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            pass
+        return entries
+
+    def __evict_disk(self):
+        # on descend aux trois quarts du budget pour ne pas rescanner le dossier à chaque écriture
+        entries = sorted(self.__disk_entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.__max_disk_bytes * 3 // 4
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self.__disk_bytes = total
+
+
+# instance partagée par le ComboBox et la liste des fonctions
+renderer = LatexRenderer(disk_cache_dir=disk_cache_from_environment())
@@ -0,0 +1,34 @@
+# Thèmes clair et sombre : les feuilles de style sont lues une seule fois, au premier usage, et
+# gardées en mémoire ; changer de thème ne relit rien sur le disque.
+# latex_color est la couleur des formules, appliquée au moment de peindre (voir LatexRenderer).
+import os
+
+STYLES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class Theme:
+    def __init__(self, name: str, qss_file: str, bg_color: str, text_color: str, latex_color: str, icon: str):
+        self.name = name
+        self.qss_file = qss_file
+        self.bg_color = bg_color
+        self.text_color = text_color
+        self.latex_color = latex_color
+        self.icon = icon
+        self.__stylesheet = None
+
+    @property
+    def stylesheet(self) -> str:
+        if self.__stylesheet is None:
+            with open(os.path.join(STYLES_DIR, self.qss_file), "r", encoding="utf-8") as f:
+                self.__stylesheet = f.read()
+        return self.__stylesheet
+
+
+DARK = Theme("dark", "dark_theme.qss", '#2b2b2b', '#e0e0e0', 'white', "🌙")
+LIGHT = Theme("light", "light_theme.qss", '#ffffff', '#333333', 'black', "☀️")
+
+
+def preload_stylesheets():
+    # lit les deux feuilles de style d'avance : le premier changement de thème est aussi instantané
+    for theme in (DARK, LIGHT):
+        theme.stylesheet
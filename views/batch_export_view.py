@@ -0,0 +1,130 @@
+from PyQt6.QtCore import Qt, pyqtSlot
+from PyQt6.QtWidgets import (QComboBox, QDockWidget, QFileDialog, QLabel, QLineEdit, QMessageBox, QProgressBar,
+                             QPushButton, QSpinBox)
+from views.ui_loader import load_ui
+
+from models.export_pool import ExportPool
+from models.function_list_model import FunctionListModel
+from models.main_window_model import MainWindowModel
+from styles.themes import DARK
+
+
+class BatchExportView(QDockWidget):
+    formatComboBox: QComboBox
+    infLineEdit: QLineEdit
+    supLineEdit: QLineEdit
+    nombreSpinBox: QSpinBox
+    dossierLineEdit: QLineEdit
+    parcourirButton: QPushButton
+    progressBar: QProgressBar
+    statusLabel: QLabel
+    exporterButton: QPushButton
+    annulerButton: QPushButton
+
+    def __init__(self, model: MainWindowModel, function_list_model: FunctionListModel):
+        super().__init__()
+        load_ui("../ui/batch_export.ui", self)
+
+        self.__model = model
+        self.__function_list_model = function_list_model
+        self.__bg_color = DARK.bg_color
+        self.__text_color = DARK.text_color
+        self.__failures = []
+
+        # le pool n'est créé qu'au premier export
+        self.__pool = ExportPool(parent=self)
+        self.__pool.progress.connect(self.__on_progress)
+        self.__pool.exportFailed.connect(self.__on_failed)
+        self.__pool.finished.connect(self.__on_finished)
+
+        self.parcourirButton.clicked.connect(self.__on_parcourir_clicked)
+        self.exporterButton.clicked.connect(self.__on_exporter_clicked)
+        self.annulerButton.clicked.connect(self.__on_annuler_clicked)
+
+        # valeurs par défaut : celles du graphique principal à l'ouverture du panneau
+        self.visibilityChanged.connect(self.__on_visibility_changed)
+
+        self.setFeatures(
+            QDockWidget.DockWidgetFeature.DockWidgetClosable |
+            QDockWidget.DockWidgetFeature.DockWidgetMovable |
+            QDockWidget.DockWidgetFeature.DockWidgetFloatable
+        )
+        self.setAllowedAreas(
+            Qt.DockWidgetArea.LeftDockWidgetArea |
+            Qt.DockWidgetArea.RightDockWidgetArea
+        )
+
+    def set_theme_colors(self, bg_color, text_color):
+        # appliquées aux prochains exports
+        self.__bg_color = bg_color
+        self.__text_color = text_color
+
+    def shutdown(self):
+        self.__pool.shutdown()
+
+    def __on_visibility_changed(self, visible: bool):
+        if visible and not self.__pool.is_running:
+            self.infLineEdit.setText(f"{self.__model.borne_inf:g}")
+            self.supLineEdit.setText(f"{self.__model.borne_sup:g}")
+            self.nombreSpinBox.setValue(self.__model.nb_rectangles)
+
+    def __on_parcourir_clicked(self):
+        directory = QFileDialog.getExistingDirectory(self, "Dossier d'export", self.dossierLineEdit.text())
+        if directory:
+            self.dossierLineEdit.setText(directory)
+
+    def __on_exporter_clicked(self):
+        try:
+            a = float(self.infLineEdit.text())
+            b = float(self.supLineEdit.text())
+        except ValueError:
+            QMessageBox.warning(self, "Attention", "Bornes invalides")
+            return
+        if a >= b:
+            QMessageBox.warning(self, "Attention", "Borne inférieure >= borne supérieure")
+            return
+
+        directory = self.dossierLineEdit.text()
+        if not directory:
+            QMessageBox.warning(self, "Attention", "Veuillez choisir un dossier d'export")
+            return
+
+        functions = self.__function_list_model.functions
+        if not functions:
+            QMessageBox.warning(self, "Attention", "La liste des fonctions est vide")
+            return
+
+        self.__failures = []
+        self.__set_running(True)
+        self.statusLabel.setText(f"Export de {len(functions)} fonctions...")
+        self.__pool.export_library(functions, directory, self.formatComboBox.currentText(), a, b,
+                                   self.nombreSpinBox.value(), self.__model.orientation,
+                                   self.__bg_color, self.__text_color)
+
+    def __on_annuler_clicked(self):
+        self.__pool.cancel()
+        self.__set_running(False)
+        self.statusLabel.setText("Export annulé")
+
+    @pyqtSlot(int, int)
+    def __on_progress(self, done: int, total: int):
+        self.progressBar.setMaximum(total)
+        self.progressBar.setValue(done)
+
+    @pyqtSlot(str, str)
+    def __on_failed(self, path: str, message: str):
+        self.__failures.append(f"{path} : {message}")
+
+    @pyqtSlot()
+    def __on_finished(self):
+        self.__set_running(False)
+        if self.__failures:
+            self.statusLabel.setText(f"Terminé, {len(self.__failures)} échec(s)")
+            QMessageBox.warning(self, "Export", "Certaines fonctions n'ont pas pu être exportées :\n"
+                                + "\n".join(self.__failures[:20]))
+        else:
+            self.statusLabel.setText("Export terminé")
+
+    def __set_running(self, running: bool):
+        self.exporterButton.setEnabled(not running)
+        self.annulerButton.setEnabled(running)
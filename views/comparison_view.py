@@ -0,0 +1,81 @@
+import numpy as np
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QDockWidget, QMessageBox, QPushButton, QTableWidget, QTableWidgetItem, QVBoxLayout
+from views.ui_loader import load_ui
+
+from canvas.overlay_canvas import OverlayCanvas
+from models.batch_evaluation import BATCH_METHODS
+from models.function_list_model import FunctionListModel
+from models.main_window_model import MainWindowModel
+
+
+class ComparisonView(QDockWidget):
+    plotLayout: QVBoxLayout
+    resultatsTableWidget: QTableWidget
+    comparerButton: QPushButton
+
+    # nombre de points de la grille commune pour la superposition
+    GRID_POINTS = 500
+
+    def __init__(self, model: MainWindowModel, function_list_model: FunctionListModel):
+        super().__init__()
+        load_ui("../ui/comparison.ui", self)
+
+        self.__model = model
+        self.__function_list_model = function_list_model
+
+        self.__canvas = OverlayCanvas()
+        self.plotLayout.addWidget(self.__canvas)
+
+        self.comparerButton.clicked.connect(self.__on_comparer_clicked)
+
+        self.setFeatures(
+            QDockWidget.DockWidgetFeature.DockWidgetClosable |
+            QDockWidget.DockWidgetFeature.DockWidgetMovable |
+            QDockWidget.DockWidgetFeature.DockWidgetFloatable
+        )
+        self.setAllowedAreas(
+            Qt.DockWidgetArea.LeftDockWidgetArea |
+            Qt.DockWidgetArea.RightDockWidgetArea
+        )
+
+    @property
+    def canvas(self):
+        return self.__canvas
+
+    def __on_comparer_clicked(self):
+        a, b = self.__model.borne_inf, self.__model.borne_sup
+        if a >= b:
+            QMessageBox.warning(self, "Attention", "Borne inférieure >= borne supérieure")
+            return
+
+        if self.__function_list_model.count() == 0:
+            QMessageBox.warning(self, "Attention", "La liste des fonctions est vide")
+            return
+
+        method = self.__model.orientation
+        if method not in BATCH_METHODS:
+            QMessageBox.warning(self, "Attention",
+                                "La comparaison est disponible pour : " + ", ".join(BATCH_METHODS))
+            return
+
+        # toutes les fonctions en un seul appel vectorisé, sur la même grille
+        x = np.linspace(a, b, self.GRID_POINTS)
+        y_rows = self.__function_list_model.evaluate_all(x)
+        functions = self.__function_list_model.functions
+        self.__canvas.dessiner(x, y_rows, functions)
+
+        riemann = self.__function_list_model.riemann_all(a, b, self.__model.nb_rectangles, method)
+        integrals = self.__function_list_model.integrate_all(a, b)
+        self.__update_table(functions, riemann.sums, integrals.integrals)
+
+    def __update_table(self, functions, sums, integrals):
+        self.resultatsTableWidget.setRowCount(len(functions))
+        for row, (function, somme, integrale) in enumerate(zip(functions, sums, integrals)):
+            self.resultatsTableWidget.setItem(row, 0, QTableWidgetItem(function))
+            self.resultatsTableWidget.setItem(row, 1, QTableWidgetItem(self.__format(somme)))
+            self.resultatsTableWidget.setItem(row, 2, QTableWidgetItem(self.__format(integrale)))
+
+    @staticmethod
+    def __format(value):
+        return f"{value:.6f}" if np.isfinite(value) else "-"
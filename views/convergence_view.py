@@ -0,0 +1,60 @@
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QDockWidget, QLabel, QMessageBox, QPushButton, QSpinBox, QVBoxLayout
+from views.ui_loader import load_ui
+
+from canvas.convergence_canvas import ConvergenceCanvas
+from models.convergence import NESTED_METHODS
+from models.main_window_model import MainWindowModel
+
+
+class ConvergenceView(QDockWidget):
+    plotLayout: QVBoxLayout
+    n0SpinBox: QSpinBox
+    niveauxSpinBox: QSpinBox
+    ordreLabel: QLabel
+    etudierButton: QPushButton
+
+    def __init__(self, model: MainWindowModel):
+        super().__init__()
+        load_ui("../ui/convergence.ui", self)
+
+        self.__model = model
+        self.__canvas = ConvergenceCanvas(self.__model)
+        self.plotLayout.addWidget(self.__canvas)
+
+        self.etudierButton.clicked.connect(self.__on_etudier_clicked)
+        self.__model.convergenceChanged.connect(self.update_ordre)
+
+        self.setFeatures(
+            QDockWidget.DockWidgetFeature.DockWidgetClosable |
+            QDockWidget.DockWidgetFeature.DockWidgetMovable |
+            QDockWidget.DockWidgetFeature.DockWidgetFloatable
+        )
+        self.setAllowedAreas(
+            Qt.DockWidgetArea.LeftDockWidgetArea |
+            Qt.DockWidgetArea.RightDockWidgetArea
+        )
+
+    @property
+    def canvas(self):
+        return self.__canvas
+
+    def __on_etudier_clicked(self):
+        if not self.__model.is_valid_for_calculation():
+            QMessageBox.warning(self, "Attention", "Veuillez sélectionner une fonction et des bornes valides")
+            return
+
+        if self.__model.orientation not in NESTED_METHODS:
+            QMessageBox.warning(self, "Attention",
+                                "L'étude de convergence est disponible pour : " + ", ".join(NESTED_METHODS))
+            return
+
+        self.__model.calculer_convergence(self.n0SpinBox.value(), self.niveauxSpinBox.value())
+
+    def update_ordre(self):
+        result = self.__model.convergence
+        if result is None or result.order is None:
+            self.ordreLabel.setText("Ordre estimé : -")
+        else:
+            self.ordreLabel.setText(f"Ordre estimé : {result.order:.2f} "
+                                    f"({result.evaluations} évaluations)")
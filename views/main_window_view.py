@@ -1,15 +1,26 @@
 from PyQt6.QtWidgets import (QMainWindow, QVBoxLayout, QLineEdit, QSlider, QComboBox,
                              QPushButton, QMessageBox, QLabel, QFileDialog, QHBoxLayout, QWidget)
-from PyQt6.QtCore import Qt, pyqtSlot
+from PyQt6.QtCore import Qt, QTimer, pyqtSlot
 from PyQt6.QtGui import QIcon, QPixmap
-from PyQt6.uic import loadUi
+from views.ui_loader import load_ui
 from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
 
 from canvas.matplotlib_canvas import PlotCanvas
 from models.main_window_model import MainWindowModel
 from models.function_list_model import FunctionListModel
+from models.function_item_model import FunctionItemModel
 from views.function_list_view import FunctionListView
+from views.convergence_view import ConvergenceView
+from views.comparison_view import ComparisonView
+from views.stats_view import StatsView
+from views.batch_export_view import BatchExportView
+from models.export_pool import ExportPool
+from models.library_warmup import LibraryWarmup
+from models.antiderivative_cache import antiderivatives
+from models.precision import format_value, format_error
+from styles.latex_renderer import renderer
 from styles.latex_delegate import LatexDelegate
+from styles.themes import DARK, LIGHT
 
 
 class MainWindowView(QMainWindow):
@@ -18,18 +29,21 @@ class MainWindowView(QMainWindow):
     supLineEdit: QLineEdit
     nombreSlider: QSlider
     orientationComboBox: QComboBox
+    precisionComboBox: QComboBox
     calculerButton: QPushButton
     exportButton: QPushButton
     sommeLineEdit: QLineEdit
     integraleLineEdit: QLineEdit
     functionLayout: QVBoxLayout
 
+    WARMUP_DELAY_MS = 300
+
     def __init__(self, app):
         super().__init__()
-        loadUi("../ui/mainWindow.ui", self)
+        load_ui("../ui/mainWindow.ui", self)
 
         self.__app = app
-        self.__is_dark_mode = True
+        self.__theme = DARK
 
         self.resize(1400, 900)
         self.setMinimumSize(1000, 700)
@@ -40,39 +54,118 @@ class MainWindowView(QMainWindow):
         self.__toolbar = NavigationToolbar(self.__canvas, self)
 
         self.__original_toolbar_icons = {}
+        self.__inverted_toolbar_icons = {}
         self.__save_original_toolbar_icons()
 
         self.functionLayout.insertWidget(0, self.__toolbar)
         self.functionLayout.insertWidget(1, self.__canvas)
 
         self.__function_list_model = FunctionListModel()
+        renderer.latex_source = self.__function_list_model.latex
         self.__function_list_view = FunctionListView(self.__function_list_model, self)
 
         self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.__function_list_view)
 
+        self.__convergence_view = ConvergenceView(self.__model)
+        self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.__convergence_view)
+
+        self.__comparison_view = ComparisonView(self.__model, self.__function_list_model)
+        self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.__comparison_view)
+        self.tabifyDockWidget(self.__convergence_view, self.__comparison_view)
+
+        self.__batch_export_view = BatchExportView(self.__model, self.__function_list_model)
+        self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.__batch_export_view)
+        self.tabifyDockWidget(self.__comparison_view, self.__batch_export_view)
+        self.__convergence_view.raise_()
+
+        # panneau des mesures de performance, masqué par défaut
+        self.__stats_view = StatsView()
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.__stats_view)
+        self.__stats_view.hide()
+
         self.__setup_menu()
         self.__setup_theme_toggle()
         self.__create_rectangle_count_label()
 
-        # Configuration du délégué LaTeX pour le ComboBox
+        # Configuration du délégué LaTeX pour le ComboBox ; ses lignes suivent la librairie une à une
+        self.__function_items = FunctionItemModel(self.__function_list_model, blank_row=True, parent=self)
+        self.functionComboBox.setModel(self.__function_items)
         self.__latex_delegate = LatexDelegate(self.functionComboBox, self)
         self.functionComboBox.setItemDelegate(self.__latex_delegate)
-
-        self.update_function_combobox()
+        self.__function_items.modelAboutToBeReset.connect(self.__remember_function)
+        self.__function_items.modelReset.connect(self.__restore_function)
+        self.__remembered_function = ""
 
         self.functionComboBox.currentTextChanged.connect(self.on_function_changed)
         self.infLineEdit.textChanged.connect(self.on_borne_inf_edited)
         self.supLineEdit.textChanged.connect(self.on_borne_sup_edited)
         self.nombreSlider.valueChanged.connect(self.on_nb_rectangles_changed)
         self.orientationComboBox.currentIndexChanged.connect(self.on_orientation_changed)
+        self.precisionComboBox.currentIndexChanged.connect(self.on_precision_changed)
         self.calculerButton.clicked.connect(self.on_calculer_clicked)
         self.exportButton.clicked.connect(self.on_export_clicked)
 
-        self.__function_list_model.functionsChanged.connect(self.update_function_combobox)
         self.__model.modelChanged.connect(self.__validate_buttons)
+        self.__model.integraleChanged.connect(self.update_integrale)
+
+        # export du graphique affiché dans un processus séparé, un seul à la fois
+        self.__export_pool = ExportPool(processes=1, parent=self)
+        self.__export_pool.fileExported.connect(self.__on_file_exported)
+        self.__export_pool.exportFailed.connect(self.__on_export_failed)
+        self.__export_pool.finished.connect(self.__validate_buttons)
 
         self.__validate_buttons()
 
+        # préchargement de la librairie en arrière-plan, relancé à chaque lecture du JSON
+        self.__warmup = LibraryWarmup(parent=self)
+        self.__warmup.entryReady.connect(self.__on_warmup_entry)
+        self.__function_list_model.functionsLoaded.connect(self.__start_warmup)
+        # lancer le pool après le premier affichage pour ne pas retarder l'ouverture de la fenêtre
+        QTimer.singleShot(self.WARMUP_DELAY_MS, self.__start_warmup)
+
+    @property
+    def theme(self):
+        # thème courant (styles/themes.py), lu par LatexDelegate pour la couleur des formules
+        return self.__theme
+
+    def __start_warmup(self):
+        dpr = self.devicePixelRatioF()
+
+        # tailles utilisées par LatexDelegate (18) et FunctionListView (32) ; un seul rendu par formule,
+        # en masque, valable pour les deux thèmes
+        renders = [(renderer.MASK_COLOR, fontsize, dpr) for fontsize in (18, 32)]
+        missing = [f for f in self.__function_list_model.functions
+                   if not all(renderer.is_cached(f, size, r) for _, size, r in renders)]
+        # les fonctions dont les données dérivées sont à jour dans le fichier sont sautées
+        functions = [f for f in self.__function_list_model.functions if self.__function_list_model.needs_warmup(f)]
+        functions += [f for f in missing if not self.__function_list_model.needs_warmup(f)]
+        if not missing:
+            renders = []
+        self.__warmup.start(functions, self.__model.borne_inf, self.__model.borne_sup, renders)
+
+    def __on_warmup_entry(self, entry):
+        function_str = entry["function"]
+        self.__function_list_model.update_metadata(function_str, valid=entry["valid"], latex=entry["latex"],
+                                                   antiderivative=entry["antiderivative"])
+
+        for _, fontsize, dpr, data in entry["pngs"]:
+            renderer.insert_png(function_str, fontsize, dpr, data)
+
+        if entry["antiderivative"] is not None:
+            antiderivatives.put(*entry["antiderivative"])
+
+        if entry["integrale"] is not None:
+            self.__model.memoriser_integrale(function_str, entry["a"], entry["b"],
+                                             entry["integrale"], entry["methode"], entry["erreur"])
+
+    def closeEvent(self, event):
+        self.__warmup.shutdown()
+        self.__export_pool.shutdown()
+        self.__batch_export_view.shutdown()
+        self.__model.shutdown()
+        self.__function_list_model.save_pending()
+        super().closeEvent(event)
+
     def __save_original_toolbar_icons(self):
         for action in self.__toolbar.actions():
             if not action.isSeparator():
@@ -81,13 +174,14 @@ class MainWindowView(QMainWindow):
                     self.__original_toolbar_icons[action] = icon.pixmap(24, 24).copy()
 
     def __update_toolbar_icons(self, invert=False):
-        for action, original_pixmap in self.__original_toolbar_icons.items():
-            if invert:
+        # les icônes inversées sont calculées au premier passage en thème clair, puis réutilisées
+        if invert and not self.__inverted_toolbar_icons:
+            for action, original_pixmap in self.__original_toolbar_icons.items():
                 image = original_pixmap.toImage()
                 image.invertPixels()
-                action.setIcon(QIcon(QPixmap.fromImage(image)))
-            else:
-                action.setIcon(QIcon(original_pixmap))
+                self.__inverted_toolbar_icons[action] = QIcon(QPixmap.fromImage(image))
+        for action, original_pixmap in self.__original_toolbar_icons.items():
+            action.setIcon(self.__inverted_toolbar_icons[action] if invert else QIcon(original_pixmap))
 
     def __setup_theme_toggle(self):
         self.__theme_toggle_button = QPushButton("🌙")
@@ -113,32 +207,26 @@ class MainWindowView(QMainWindow):
             slider_layout.addWidget(self.__rectangle_count_label)
 
     def __toggle_theme(self):
-        self.__is_dark_mode = not self.__is_dark_mode
-
-        if self.__is_dark_mode:
-            theme_file = "../styles/dark_theme.qss"
-            self.__theme_toggle_button.setText("🌙")
-            bg_color = '#2b2b2b'
-            text_color = '#e0e0e0'
-            self.__update_toolbar_icons(invert=False)
-        else:
-            theme_file = "../styles/light_theme.qss"
-            self.__theme_toggle_button.setText("☀️")
-            bg_color = '#ffffff'
-            text_color = '#333333'
-            self.__update_toolbar_icons(invert=True)
+        # feuilles de style déjà en mémoire, formules reteintes à la peinture, courbes non recalculées
+        theme = self.__theme = LIGHT if self.__theme is DARK else DARK
 
-        self.__canvas.set_theme_colors(bg_color, text_color)
+        self.__theme_toggle_button.setText(theme.icon)
+        self.__update_toolbar_icons(invert=theme is LIGHT)
+
+        self.__canvas.set_theme_colors(theme.bg_color, theme.text_color)
+        self.__convergence_view.canvas.set_theme_colors(theme.bg_color, theme.text_color)
+        self.__comparison_view.canvas.set_theme_colors(theme.bg_color, theme.text_color)
+        self.__batch_export_view.set_theme_colors(theme.bg_color, theme.text_color)
 
         try:
-            with open(theme_file, "r", encoding="utf-8") as f:
-                self.__app.setStyleSheet(f.read())
+            self.__app.setStyleSheet(theme.stylesheet)
 
             # Notifier la liste de fonctions pour mettre à jour la couleur LaTeX
             self.__function_list_view.update_latex_color()
 
             # Rafraîchir le ComboBox pour le nouveau thème
-            self.update_function_combobox()
+            self.functionComboBox.view().viewport().update()
+            self.functionComboBox.update()
 
         except Exception as e:
             QMessageBox.warning(self, "Erreur", f"Impossible de charger le thème: {e}")
@@ -148,19 +236,32 @@ class MainWindowView(QMainWindow):
         toggle_action.setText("Afficher/Masquer liste des fonctions")
         self.menufonction.addAction(toggle_action)
 
-    @pyqtSlot()
-    def update_function_combobox(self):
-        current_text = self.functionComboBox.currentText()
+        convergence_action = self.__convergence_view.toggleViewAction()
+        convergence_action.setText("Afficher/Masquer étude de convergence")
+        self.menufonction.addAction(convergence_action)
 
-        self.functionComboBox.clear()
-        self.functionComboBox.addItem("")
+        comparison_action = self.__comparison_view.toggleViewAction()
+        comparison_action.setText("Afficher/Masquer comparaison des fonctions")
+        self.menufonction.addAction(comparison_action)
 
-        for function in self.__function_list_model.functions:
-            self.functionComboBox.addItem(function)
+        batch_export_action = self.__batch_export_view.toggleViewAction()
+        batch_export_action.setText("Afficher/Masquer export de la librairie")
+        self.menufonction.addAction(batch_export_action)
 
-        index = self.functionComboBox.findText(current_text)
-        if index >= 0:
-            self.functionComboBox.setCurrentIndex(index)
+        stats_action = self.__stats_view.toggleViewAction()
+        stats_action.setText("Afficher/Masquer performances")
+        self.menufonction.addAction(stats_action)
+
+    @pyqtSlot()
+    def __remember_function(self):
+        self.__remembered_function = self.functionComboBox.currentText()
+
+    @pyqtSlot()
+    def __restore_function(self):
+        # librairie rechargée : on garde la fonction sélectionnée si elle y est encore
+        row = self.__function_items.row_of(self.__remembered_function) if self.__remembered_function else -1
+        if row >= 0:
+            self.functionComboBox.setCurrentIndex(row)
 
     def on_function_changed(self, text):
         if text and text.strip():
@@ -193,25 +294,35 @@ class MainWindowView(QMainWindow):
     def on_nb_rectangles_changed(self):
         slider_value = self.nombreSlider.value()
 
+        with self.__model.batch_update():
+            if slider_value == 0:
+                self.__model.rectangles_active = False
+                self.__model.nb_rectangles = 0
+            else:
+                self.__model.rectangles_active = True
+                self.__model.nb_rectangles = slider_value * 5
+
         if slider_value == 0:
-            self.__model.rectangles_active = False
-            self.__model.nb_rectangles = 0
             if hasattr(self, '_MainWindowView__rectangle_count_label'):
                 self.__rectangle_count_label.setText("0")
         else:
-            self.__model.rectangles_active = True
-            self.__model.nb_rectangles = slider_value * 5
             if hasattr(self, '_MainWindowView__rectangle_count_label'):
                 self.__rectangle_count_label.setText(f"{self.__model.nb_rectangles}")
 
     def on_orientation_changed(self):
         self.__model.orientation = self.orientationComboBox.currentText()
 
+    def on_precision_changed(self):
+        self.__model.precision = self.precisionComboBox.currentText()
+        self.precisionComboBox.setToolTip(f"{self.__model.mp_dps} chiffres significatifs"
+                                          if self.__model.precision == "mpmath" else "")
+
     @pyqtSlot()
     def __validate_buttons(self):
         is_valid = self.__model.is_valid_for_calculation()
         self.calculerButton.setEnabled(is_valid)
-        self.exportButton.setEnabled(is_valid and self.__model.function is not None)
+        self.exportButton.setEnabled(is_valid and self.__model.function is not None
+                                     and not self.__export_pool.is_running)
 
     def on_calculer_clicked(self):
         if not self.__model.function:
@@ -223,18 +334,48 @@ class MainWindowView(QMainWindow):
             QMessageBox.warning(self, "Attention", "Borne inférieure >= borne supérieure")
             return
 
-        riemann, integrale = self.__model.calculer()
+        riemann, _ = self.__model.calculer()
 
-        if riemann is None or integrale is None:
-            QMessageBox.critical(self, "Erreur", "Impossible de calculer la somme ou l'intégrale")
+        if riemann is None:
+            QMessageBox.critical(self, "Erreur", "Impossible de calculer la somme de Riemann")
             self.sommeLineEdit.clear()
             self.integraleLineEdit.clear()
             return
 
-        self.sommeLineEdit.setText(f"{riemann:.6f}")
-        self.integraleLineEdit.setText(f"{integrale:.6f}")
+        # la somme s'affiche tout de suite, l'intégrale exacte arrive plus tard
+        precision = self.__model.precision
+        erreur = self.__model.erreur_riemann
+        if erreur is not None and erreur > 0:
+            self.sommeLineEdit.setText(f"{format_value(riemann, precision)} ± {format_error(erreur)}")
+        else:
+            self.sommeLineEdit.setText(format_value(riemann, precision))
+        if self.__model.riemann_forme_fermee:
+            tooltip = "Formule exacte en n (forme fermée symbolique)"
+        else:
+            tooltip = f"{self.__model.evaluations_riemann} évaluations de f"
+        if self.__model.n_effectif != self.__model.nb_rectangles:
+            tooltip += f"\nn arrondi à {self.__model.n_effectif} ({self.__model.orientation})"
+        self.sommeLineEdit.setToolTip(tooltip)
+        self.update_integrale()
 
-        self.__model.modelChanged.emit()
+    @pyqtSlot()
+    def update_integrale(self):
+        status = self.__model.integrale_status
+        if status == "pending":
+            self.integraleLineEdit.setText("Calcul en cours...")
+        elif status == "ok":
+            methode = self.__model.integrale_methode
+            valeur = format_value(self.__model.valeur_integrale, self.__model.precision)
+            if methode == "numérique":
+                self.integraleLineEdit.setText(f"{valeur} (numérique ± {format_error(self.__model.erreur_integrale)})")
+            else:
+                self.integraleLineEdit.setText(f"{valeur} ({methode})")
+        elif status == "timeout":
+            self.integraleLineEdit.setText("Délai dépassé")
+        elif status == "failed":
+            self.integraleLineEdit.setText("Non disponible")
+        else:
+            self.integraleLineEdit.clear()
 
     def on_export_clicked(self):
         if not self.__model.function:
@@ -245,12 +386,19 @@ class MainWindowView(QMainWindow):
             self,
             "Exporter le graphique",
             "",
-            "Images PNG (*.png);;Images JPEG (*.jpg);;Images SVG (*.svg);;Tous les fichiers (*.*)"
+            "Images PNG (*.png);;Images JPEG (*.jpg);;Images SVG (*.svg);;Documents PDF (*.pdf);;"
+            "Tous les fichiers (*.*)"
         )
 
         if file_path:
-            try:
-                self.__canvas.fig.savefig(file_path, dpi=300, bbox_inches='tight')
-                QMessageBox.information(self, "Succès", f"Graphique exporté avec succès :\n{file_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "Erreur", f"Impossible d'exporter le graphique :\n{str(e)}")
\ No newline at end of file
+            # copie figée du graphique : on peut continuer à le modifier pendant le rendu
+            self.__export_pool.export_snapshot(self.__canvas.snapshot(), file_path, 300)
+            self.exportButton.setEnabled(False)
+
+    @pyqtSlot(str)
+    def __on_file_exported(self, file_path):
+        QMessageBox.information(self, "Succès", f"Graphique exporté avec succès :\n{file_path}")
+
+    @pyqtSlot(str, str)
+    def __on_export_failed(self, file_path, message):
+        QMessageBox.critical(self, "Erreur", f"Impossible d'exporter le graphique :\n{message}")
\ No newline at end of file
@@ -0,0 +1,127 @@
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import (QCheckBox, QDockWidget, QFileDialog, QLabel, QMessageBox, QPlainTextEdit,
+                             QPushButton, QTableWidget, QTableWidgetItem)
+from views.ui_loader import load_ui
+
+from models.perf_stats import perf, BUCKETS_MS
+
+
+class StatsView(QDockWidget):
+    activerCheckBox: QCheckBox
+    statsTable: QTableWidget
+    histogrammeLabel: QLabel
+    reinitialiserButton: QPushButton
+    exporterButton: QPushButton
+    profilerButton: QPushButton
+    profilText: QPlainTextEdit
+
+    COLUMNS = ("Opération", "Appels", "Moyenne (ms)", "p50 (ms)", "p95 (ms)", "Max (ms)")
+    # le tableau est relu périodiquement plutôt qu'à chaque mesure, pour ne pas fausser les temps
+    REFRESH_INTERVAL_MS = 500
+
+    def __init__(self):
+        super().__init__()
+        load_ui("../ui/stats.ui", self)
+
+        self.statsTable.setColumnCount(len(self.COLUMNS))
+        self.statsTable.setHorizontalHeaderLabels(self.COLUMNS)
+        self.statsTable.horizontalHeader().setStretchLastSection(True)
+        self.statsTable.verticalHeader().setVisible(False)
+
+        self.activerCheckBox.setChecked(perf.enabled)
+        self.activerCheckBox.toggled.connect(self.__on_activer_toggled)
+        self.reinitialiserButton.clicked.connect(self.__on_reinitialiser_clicked)
+        self.exporterButton.clicked.connect(self.__on_exporter_clicked)
+        self.profilerButton.toggled.connect(self.__on_profiler_toggled)
+        self.statsTable.itemSelectionChanged.connect(self.update_histogramme)
+
+        self.__timer = QTimer(self)
+        self.__timer.setInterval(self.REFRESH_INTERVAL_MS)
+        self.__timer.timeout.connect(self.update_table)
+        self.visibilityChanged.connect(self.__on_visibility_changed)
+
+        self.setFeatures(
+            QDockWidget.DockWidgetFeature.DockWidgetClosable |
+            QDockWidget.DockWidgetFeature.DockWidgetMovable |
+            QDockWidget.DockWidgetFeature.DockWidgetFloatable
+        )
+        self.setAllowedAreas(
+            Qt.DockWidgetArea.LeftDockWidgetArea |
+            Qt.DockWidgetArea.RightDockWidgetArea
+        )
+
+    def update_table(self):
+        operations = perf.operations()
+        selected = self.__selected_operation()
+        self.statsTable.setRowCount(len(operations))
+        for row, name in enumerate(operations):
+            stats = perf.stats(name)
+            values = (name, str(stats.count), self.__format(stats.total_ms / stats.count),
+                      self.__format(stats.percentile(50)), self.__format(stats.percentile(95)),
+                      self.__format(stats.max_ms))
+            for column, value in enumerate(values):
+                self.statsTable.setItem(row, column, QTableWidgetItem(value))
+            if name == selected:
+                self.statsTable.selectRow(row)
+        self.update_histogramme()
+
+    def update_histogramme(self):
+        name = self.__selected_operation()
+        stats = perf.stats(name) if name else None
+        if stats is None:
+            self.histogrammeLabel.setText("Histogramme : sélectionner une opération")
+            return
+
+        labels = [f"≤{edge}" for edge in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+        parts = [f"{label} ms : {count}" for label, count in zip(labels, stats.histogram) if count]
+        self.histogrammeLabel.setText(f"{name} — " + ", ".join(parts))
+
+    def __selected_operation(self):
+        items = self.statsTable.selectedItems()
+        if not items:
+            return None
+        item = self.statsTable.item(items[0].row(), 0)
+        return item.text() if item else None
+
+    def __on_visibility_changed(self, visible):
+        if visible:
+            self.update_table()
+            self.__timer.start()
+        else:
+            self.__timer.stop()
+
+    def __on_activer_toggled(self, checked):
+        perf.enabled = checked
+
+    def __on_reinitialiser_clicked(self):
+        perf.reset()
+        self.update_table()
+
+    def __on_exporter_clicked(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Exporter les mesures", "perf_stats.json",
+                                                   "JSON (*.json)")
+        if not file_path:
+            return
+        try:
+            perf.export_json(file_path)
+        except OSError as e:
+            QMessageBox.critical(self, "Erreur", f"Impossible d'exporter les mesures : {e}")
+
+    def __on_profiler_toggled(self, checked):
+        # profil d'une interaction : on démarre, on fait l'action lente dans l'interface, on arrête
+        if checked:
+            self.profilerButton.setText("Arrêter le profilage")
+            perf.start_profile()
+            return
+
+        self.profilerButton.setText("Démarrer le profilage")
+        file_path, _ = QFileDialog.getSaveFileName(self, "Enregistrer le profil (optionnel)", "interaction.prof",
+                                                   "Profils cProfile (*.prof)")
+        try:
+            self.profilText.setPlainText(perf.stop_profile(file_path or None))
+        except OSError as e:
+            QMessageBox.critical(self, "Erreur", f"Impossible d'enregistrer le profil : {e}")
+
+    @staticmethod
+    def __format(value):
+        return "-" if value is None else f"{value:.2f}"
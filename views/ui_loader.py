@@ -0,0 +1,56 @@
+# Chargement des fichiers .ui : si une version précompilée en Python existe et est à jour,
+# on l'utilise (pas de parsing XML au démarrage), sinon on retombe sur PyQt6.uic.loadUi.
+#
+# Précompiler :  python -m views.ui_loader   (depuis la racine du projet)
+import importlib.util
+import os
+import sys
+
+
+def compiled_path(ui_file: str) -> str:
+    root, _ = os.path.splitext(ui_file)
+    return root + "_ui.py"
+
+
+def load_ui(ui_file: str, widget):
+    module_file = compiled_path(ui_file)
+    if os.path.exists(module_file) and os.path.getmtime(module_file) >= os.path.getmtime(ui_file):
+        try:
+            _setup_compiled(module_file, widget)
+            return widget
+        except Exception as e:
+            print(f"UI précompilée ignorée ({module_file}): {e}")
+
+    from PyQt6.uic import loadUi
+    return loadUi(ui_file, widget)
+
+
+def _setup_compiled(module_file: str, widget):
+    name = os.path.splitext(os.path.basename(module_file))[0]
+    spec = importlib.util.spec_from_file_location(name, module_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    ui_class = next(value for key, value in vars(module).items() if key.startswith("Ui_"))
+    ui = ui_class()
+    ui.setupUi(widget)
+    # loadUi met les widgets nommés directement sur le widget, on fait pareil
+    for attribute, value in vars(ui).items():
+        setattr(widget, attribute, value)
+
+
+def compile_all(ui_dir: str):
+    from PyQt6 import uic
+
+    for file_name in sorted(os.listdir(ui_dir)):
+        if not file_name.endswith(".ui"):
+            continue
+        ui_file = os.path.join(ui_dir, file_name)
+        with open(ui_file, "r", encoding="utf-8") as source, \
+                open(compiled_path(ui_file), "w", encoding="utf-8") as target:
+            uic.compileUi(source, target)
+        print(f"{ui_file} -> {compiled_path(ui_file)}")
+
+
+if __name__ == "__main__":
+    compile_all(sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "..", "ui"))